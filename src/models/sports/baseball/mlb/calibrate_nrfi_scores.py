@@ -32,9 +32,12 @@ import os
 import glob
 import json
 import argparse
+import fnmatch
 import math
 import pandas as pd
 
+from utils.artifact_catalog import get_catalog, AUGMENTED_GAME_SUMMARY, CALIBRATED_GAME_SUMMARY
+
 # Try sklearn; fallback to numpy-based logistic fit
 try:
     from sklearn.linear_model import LogisticRegression
@@ -138,20 +141,19 @@ USAGE EXAMPLES:
     if not args.input_dir or not args.output_dir:
         parser.error('Both -i/--input-dir and -d/--output-dir are required.')
 
-    # Date filtering logic
-    def parse_date_from_filename(filename):
-        # Expects format: mlb_daily_game_summary_YYYYMMDD_*.json
-        import re
-        m = re.search(r'(\d{8})', filename)
-        return m.group(1) if m else None
-
     today_str = datetime.datetime.today().strftime('%Y%m%d')
     start_date = args.start_date or today_str
     end_date = args.end_date or today_str
 
-    # Find files matching pattern and filter by date
-    input_files = [f for f in glob.glob(os.path.join(args.input_dir, args.pattern))
-                  if start_date <= (parse_date_from_filename(os.path.basename(f)) or '') <= end_date]
+    # Resolve input files through the artifact catalog, filtered by date and pattern
+    catalog = get_catalog()
+    catalog.ensure_backfilled(AUGMENTED_GAME_SUMMARY, args.input_dir, args.pattern)
+    input_records = [
+        rec for rec in catalog.in_directory(
+            catalog.between(AUGMENTED_GAME_SUMMARY, start_date, end_date), args.input_dir)
+        if fnmatch.fnmatch(os.path.basename(rec.path), args.pattern)
+    ]
+    input_files = [str(catalog.path_of(rec)) for rec in input_records]
     if not input_files:
         raise FileNotFoundError(f"No files found in {args.input_dir} matching {args.pattern} for date(s) {start_date} to {end_date}")
 
@@ -185,7 +187,7 @@ USAGE EXAMPLES:
     print(f"Saved calibration params to {params_path}")
 
     # Apply calibrated probabilities and write outputs
-    for inp in input_files:
+    for rec, inp in zip(input_records, input_files):
         with open(inp) as f:
             games = json.load(f)
         for game in games:
@@ -196,6 +198,7 @@ USAGE EXAMPLES:
         out_path = os.path.join(args.output_dir, os.path.basename(inp))
         with open(out_path, 'w') as f:
             json.dump(games, f, indent=2)
+        catalog.register(CALIBRATED_GAME_SUMMARY, out_path, rec.as_of, season=rec.season)
         print(f"Wrote updated file: {out_path}")
 
 
@@ -3,6 +3,8 @@ import requests
 import logging
 from datetime import datetime
 
+from utils.mlb.slate_lineups import fetch_people_stats, top_of_order
+
 # Configure basic logging
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
@@ -17,28 +19,33 @@ def fetch_player_stats(player_id, season):
     return splits[0].get("stat", {}) if splits else {}
 
 
-def get_first_three_projected_batters(game_id, date_str=None):
+def get_first_three_projected_batters(game_id, date_str=None, games=None):
     """
     Fetch the first three projected batters for both away and home teams pre-game,
     using the schedule endpoint with previewPlayers hydration.
+
+    Pass the already-fetched schedule as `games` to skip the schedule request;
+    for a whole slate use utils.mlb.slate_lineups.slate_lineups, which hydrates
+    every game's batters in one or two requests.
     """
     # Determine date and season
     if not date_str:
         date_str = datetime.now().strftime("%Y-%m-%d")
     season = int(date_str.split('-')[0])
 
-    # Fetch schedule with previewPlayers and team codes
-    url = (
-        f"https://statsapi.mlb.com/api/v1/schedule?"
-        f"sportId=1&date={date_str}&hydrate=teams(team,previewPlayers)"
-    )
-    logging.info(f"Fetching schedule: {url}")
-    r = requests.get(url)
-    r.raise_for_status()
-    dates = r.json().get("dates", [])
-    if not dates:
-        raise RuntimeError(f"No games found for date {date_str}")
-    games = dates[0].get("games", [])
+    if games is None:
+        # Fetch schedule with previewPlayers and team codes
+        url = (
+            f"https://statsapi.mlb.com/api/v1/schedule?"
+            f"sportId=1&date={date_str}&hydrate=teams(team,previewPlayers)"
+        )
+        logging.info(f"Fetching schedule: {url}")
+        r = requests.get(url)
+        r.raise_for_status()
+        dates = r.json().get("dates", [])
+        if not dates:
+            raise RuntimeError(f"No games found for date {date_str}")
+        games = dates[0].get("games", [])
 
     # Locate target game
     game = next((g for g in games if str(
@@ -46,31 +53,20 @@ def get_first_three_projected_batters(game_id, date_str=None):
     if not game:
         raise RuntimeError(f"Game {game_id} not found on {date_str}")
 
+    lineup = top_of_order(game)
+    # Season lines for all six batters in one people?personIds= request
+    stats = fetch_people_stats((b["id"] for side in lineup.values() for b in side), season)
     result = {}
-    teams = game.get("teams", {})
-    for side in ["away", "home"]:
-        team_info = teams.get(side, {})
-        preview = team_info.get("previewPlayers", [])
-        # Sort by battingOrder and take first three
-        top3 = sorted((p for p in preview if p.get("battingOrder") is not None),
-                      key=lambda p: p["battingOrder"])[:3]
-        batters = []
-        for entry in top3:
-            pid = entry.get("person", {}).get("id")
-            name = entry.get("person", {}).get("fullName")
-            position = entry.get("position", {}).get("abbreviation")
-            order = entry.get("battingOrder")
-            stats = fetch_player_stats(pid, season) if pid else {}
-            batters.append({
-                "order": order,
-                "id": pid,
-                "name": name,
-                "position": position,
-                "avg": stats.get("avg"),
-                "homeRuns": stats.get("homeRuns"),
-                "ops": stats.get("ops")
+    for side, batters in lineup.items():
+        result[side] = []
+        for b in batters:
+            season_stats = stats.get(b["id"], {}).get("season", {})
+            result[side].append({
+                **b,
+                "avg": season_stats.get("avg"),
+                "homeRuns": season_stats.get("homeRuns"),
+                "ops": season_stats.get("ops")
             })
-        result[side] = batters
     return result
 
 
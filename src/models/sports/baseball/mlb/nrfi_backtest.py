@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Walk-forward backtest of the NRFI score calibration.
+
+For every game day d in the season, a logistic calibration P(NRFI | game_nrfi_score)
+is fit on games played before d (optionally only the last N days) and used to
+score day d. All day-folds are fit at once: the per-fold Newton updates are
+computed over a (fold x game) training mask, so a season is a handful of array
+operations rather than one fit per day. Independent parameter sets (training
+window, ridge strength, warm-up length) run in parallel processes.
+
+Reported per parameter set:
+  - Brier score and log-loss of the walk-forward probabilities
+  - per-grade counts, mean predicted P(NRFI), realized NRFI rate and the
+    break-even American odds implied by that realized rate
+
+Inputs come from the data lake (src/sql/mlb_data_lake.py): model_scores joined
+with first_inning_outcomes. Pass --ingest to load the summary history first.
+
+USAGE EXAMPLES:
+  # Expanding-window backtest for 2025
+  python -m src.models.sports.baseball.mlb.nrfi_backtest --season 2025
+
+  # Compare expanding vs 14/30-day training windows on 4 cores
+  python -m src.models.sports.baseball.mlb.nrfi_backtest --season 2025 --window-days 0 14 30 --workers 4
+"""
+import argparse
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from sql.mlb_data_lake import connect, ingest_history
+from utils.mlb.nrfi_grading import GRADE_ORDER, assign_grades
+
+logger = logging.getLogger(__name__)
+
+# Raw scores are on a 0–100 scale; a fixed affine map keeps Newton well conditioned
+# without leaking season-level statistics into early folds.
+SCORE_CENTER = 50.0
+SCORE_SCALE = 10.0
+EPS = 1e-6
+
+
+def load_backtest_frame(conn=None, season: int = None) -> pd.DataFrame:
+    """
+    One row per scored game with a known first-inning outcome:
+    game_id, game_date, score (game_nrfi_score as of the game date), nrfi (1 = no run).
+    """
+    conn = conn or connect()
+    sql = """
+        SELECT g.game_id, g.game_date, ms.game_nrfi_score AS score, 1 - fo.run_scored AS nrfi
+        FROM games g
+        JOIN first_inning_outcomes fo ON fo.game_id = g.game_id
+        JOIN model_scores ms ON ms.game_id = g.game_id
+         AND ms.as_of = (SELECT MAX(as_of) FROM model_scores m2
+                         WHERE m2.game_id = g.game_id AND m2.as_of <= g.game_date)
+        WHERE ms.game_nrfi_score IS NOT NULL
+    """
+    params = []
+    if season is not None:
+        sql += " AND g.season = ?"
+        params.append(int(season))
+    df = pd.read_sql_query(sql + " ORDER BY g.game_date, g.game_id", conn, params=params)
+    df["game_date"] = pd.to_datetime(df["game_date"]).values.astype("datetime64[D]")
+    return df
+
+
+def walk_forward_probs(dates: np.ndarray, scores: np.ndarray, nrfi: np.ndarray,
+                       min_train_days: int = 7, window_days: int = 0,
+                       l2: float = 1e-2, iters: int = 25) -> np.ndarray:
+    """
+    Out-of-sample P(NRFI) per game: each day's games are scored by a logistic fit on
+    earlier days only (all of them, or the last window_days when window_days > 0).
+    Games in the first min_train_days days get NaN.
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    x = (np.asarray(scores, dtype=float) - SCORE_CENTER) / SCORE_SCALE
+    y = np.asarray(nrfi, dtype=float)
+    out = np.full(len(x), np.nan)
+
+    days = np.unique(dates)
+    eval_days = days[min_train_days:]
+    if len(eval_days) == 0:
+        return out
+
+    # (fold x game) training mask: strictly earlier days, optionally within the window
+    mask = dates[None, :] < eval_days[:, None]
+    if window_days:
+        mask &= dates[None, :] >= (eval_days - np.timedelta64(window_days, "D"))[:, None]
+    mask = mask.astype(float)
+
+    w = np.zeros((len(eval_days), 2))
+    for _ in range(iters):
+        p = 1.0 / (1.0 + np.exp(-(w[:, :1] + w[:, 1:] * x[None, :])))
+        r = mask * (y[None, :] - p)
+        h = mask * p * (1.0 - p)
+        g0 = r.sum(axis=1) - l2 * w[:, 0]
+        g1 = (r * x).sum(axis=1) - l2 * w[:, 1]
+        h00 = h.sum(axis=1) + l2
+        h01 = (h * x).sum(axis=1)
+        h11 = (h * x * x).sum(axis=1) + l2
+        det = h00 * h11 - h01 ** 2
+        w[:, 0] += (h11 * g0 - h01 * g1) / det
+        w[:, 1] += (h00 * g1 - h01 * g0) / det
+
+    fold = np.searchsorted(eval_days, dates)
+    scored = (fold < len(eval_days)) & (eval_days[np.minimum(fold, len(eval_days) - 1)] == dates)
+    wf = w[fold[scored]]
+    out[scored] = 1.0 / (1.0 + np.exp(-(wf[:, 0] + wf[:, 1] * x[scored])))
+    return out
+
+
+def breakeven_american(p) -> np.ndarray:
+    """American odds at which a bet that wins with probability p has zero EV (NaN for p of 0 or 1)."""
+    p = np.asarray(p, dtype=float)
+    valid = (p > 0) & (p < 1)
+    q = np.where(valid, p, 0.5)
+    odds = np.where(q >= 0.5, -100.0 * q / (1 - q), 100.0 * (1 - q) / q).round()
+    return np.where(valid, odds, np.nan)
+
+
+def evaluate(p: np.ndarray, nrfi: np.ndarray) -> Dict:
+    """Brier, log-loss and per-grade realized NRFI rates for scored games (NaN p are skipped)."""
+    keep = ~np.isnan(p)
+    p, y = p[keep], np.asarray(nrfi, dtype=float)[keep]
+    if len(p) == 0:
+        return {"games": 0}
+    pc = np.clip(p, EPS, 1 - EPS)
+    grades = pd.DataFrame({"grade": assign_grades(p * 100)[0], "p": p, "y": y})
+    by_grade = (grades.groupby("grade")
+                .agg(games=("y", "size"), mean_p=("p", "mean"), nrfi_rate=("y", "mean"))
+                .reindex([g for g in GRADE_ORDER if g in set(grades["grade"])]))
+    by_grade["breakeven_odds"] = breakeven_american(by_grade["nrfi_rate"])
+    return {
+        "games": int(len(p)),
+        "nrfi_rate": float(y.mean()),
+        "brier": float(np.mean((p - y) ** 2)),
+        "log_loss": float(-np.mean(y * np.log(pc) + (1 - y) * np.log(1 - pc))),
+        "breakeven_odds": float(breakeven_american(y.mean())),
+        "by_grade": by_grade,
+    }
+
+
+def _run_param_set(args) -> Dict:
+    dates, scores, nrfi, params = args
+    p = walk_forward_probs(dates, scores, nrfi, **params)
+    return {"params": params, **evaluate(p, nrfi)}
+
+
+def run_backtest(df: pd.DataFrame, param_sets: Sequence[Dict], max_workers: int = 1) -> List[Dict]:
+    """Evaluate each parameter set over the frame; sets run in parallel when max_workers > 1."""
+    arrays = (df["game_date"].values.astype("datetime64[D]"), df["score"].to_numpy(float),
+              df["nrfi"].to_numpy(float))
+    jobs = [(*arrays, dict(params)) for params in param_sets]
+    if max_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(_run_param_set, jobs))
+    return [_run_param_set(job) for job in jobs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward NRFI calibration backtest.")
+    parser.add_argument("--season", type=int, default=None, help="Season to backtest (default: all)")
+    parser.add_argument("--min-train-days", type=int, nargs="+", default=[7])
+    parser.add_argument("--window-days", type=int, nargs="+", default=[0],
+                        help="Training window in days; 0 = expanding")
+    parser.add_argument("--l2", type=float, nargs="+", default=[1e-2], help="Ridge strength")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel parameter sets")
+    parser.add_argument("--ingest", action="store_true", help="Load summary history into the data lake first")
+    args = parser.parse_args()
+
+    conn = connect()
+    if args.ingest:
+        ingest_history(conn)
+    df = load_backtest_frame(conn, args.season)
+    logger.info("Backtesting %d games over %d days", len(df), df["game_date"].nunique())
+
+    param_sets = [
+        {"min_train_days": m, "window_days": w, "l2": l2}
+        for m, w, l2 in itertools.product(args.min_train_days, args.window_days, args.l2)
+    ]
+    for result in run_backtest(df, param_sets, max_workers=args.workers):
+        print(f"\n=== {result['params']} ===")
+        if not result["games"]:
+            print("No scored games (not enough training days)")
+            continue
+        print(f"Games: {result['games']}  NRFI rate: {result['nrfi_rate']:.3f}  "
+              f"Brier: {result['brier']:.4f}  Log-loss: {result['log_loss']:.4f}  "
+              f"Break-even: {result['breakeven_odds']:+.0f}")
+        print(result["by_grade"].round(3).to_string())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Daily league-wide NBA snapshot with locally derived sheet stats.
+
+Three requests per day cover everything the sheets need: every team game
+log, every player game log and every team first-quarter game log for the
+season (pulled concurrently through nba_stats_client). The raw logs are
+stored per day as CSV tables under nba_data.snapshot_dir, and everything
+else is derived from them with grouped, vectorized windows instead of
+per-player or per-opponent requests:
+
+  - opponent-allowed stats (self-join of team logs on GAME_ID)
+  - season / last-N scoring and shooting (eFG%, TS%) for teams and players
+  - first-quarter scoring and first-quarter points allowed
+  - hot flags: last-3 scoring or eFG% at least HOT_RATIO times the baseline
+
+USAGE EXAMPLES:
+  # Pull today's snapshot and write the derived team/player sheets
+  python -m src.models.sports.basketball.nba.sheets.nba_league_snapshot --season 2024-25
+
+  # Re-derive from an existing snapshot without any requests
+  python -m src.models.sports.basketball.nba.sheets.nba_league_snapshot --date 20250310 --offline
+"""
+import argparse
+import logging
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from models.sports.basketball.nba.sheets.nba_stats_client import NbaStatsClient, get_nba_stats_client
+from utils.config_loader import load_config
+
+logger = logging.getLogger(__name__)
+
+BOX_COLUMNS = ["FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "REB", "AST", "TOV", "PTS", "PLUS_MINUS"]
+HOT_RATIO = 1.2
+HOT_MIN_GAMES = 5
+
+
+def snapshot_jobs(season: str, season_type: str = "Regular Season") -> Dict[str, tuple]:
+    base = {"Season": season, "SeasonType": season_type, "LeagueID": "00"}
+    return {
+        "team_logs": ("teamgamelogs", {**base, "Period": ""}),
+        "player_logs": ("playergamelogs", {**base, "Period": ""}),
+        "team_q1_logs": ("teamgamelogs", {**base, "Period": "1"}),
+    }
+
+
+def snapshot_dir(as_of: date) -> Path:
+    cfg = load_config()
+    root = Path(cfg.get("nba_data", {}).get("snapshot_dir", "data/basketball/nba/snapshots"))
+    if not root.is_absolute():
+        root = Path(cfg["root_path"]) / root
+    return root / as_of.strftime("%Y%m%d")
+
+
+def pull_snapshot(season: str, as_of: date = None, client: NbaStatsClient = None,
+                  out_dir: Path = None) -> Dict[str, pd.DataFrame]:
+    """Fetch the league-wide logs (3 requests) and store each as <out_dir>/<name>.csv."""
+    as_of = as_of or date.today()
+    client = client or get_nba_stats_client()
+    out_dir = Path(out_dir or snapshot_dir(as_of))
+    tables = client.fetch_many(snapshot_jobs(season), as_of=as_of)
+    failed = [name for name, df in tables.items() if df is None]
+    if failed:
+        raise RuntimeError(f"NBA snapshot pulls failed: {failed}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, df in tables.items():
+        df.to_csv(out_dir / f"{name}.csv", index=False)
+    logger.info("Stored NBA snapshot (%s) in %s", {k: len(v) for k, v in tables.items()}, out_dir)
+    return tables
+
+
+def load_snapshot(out_dir: Path) -> Dict[str, pd.DataFrame]:
+    return {name: pd.read_csv(Path(out_dir) / f"{name}.csv") for name in snapshot_jobs("").keys()}
+
+
+def _prepare(logs: pd.DataFrame, key: str) -> pd.DataFrame:
+    df = logs.copy()
+    df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"])
+    return df.sort_values([key, "GAME_DATE"], kind="mergesort")
+
+
+def _window_sums(df: pd.DataFrame, key: str, cols: Sequence[str], last_n: int = None) -> pd.DataFrame:
+    """Per-key sums over the last_n most recent games (all games when last_n is None), plus GP."""
+    recent = df.groupby(key, sort=False).tail(last_n) if last_n else df
+    sums = recent.groupby(key)[list(cols)].sum()
+    sums["GP"] = recent.groupby(key).size()
+    return sums
+
+
+def _shooting(sums: pd.DataFrame, prefix: str) -> pd.DataFrame:
+    gp = sums["GP"].replace(0, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pd.DataFrame({
+            f"{prefix}PTS": sums["PTS"] / gp,
+            f"{prefix}EFG_PCT": (sums["FGM"] + 0.5 * sums["FG3M"]) / sums["FGA"],
+            f"{prefix}TS_PCT": sums["PTS"] / (2 * (sums["FGA"] + 0.44 * sums["FTA"])),
+            f"{prefix}FG3A": sums["FG3A"] / gp,
+            f"{prefix}FTA_RATE": sums["FTA"] / sums["FGA"],
+        })
+
+
+def _with_opponent(team_logs: pd.DataFrame) -> pd.DataFrame:
+    """Each team-game row joined with its opponent's box score (OPP_ columns)."""
+    opp = team_logs[["GAME_ID", "TEAM_ID"] + [c for c in BOX_COLUMNS if c in team_logs]]
+    opp = opp.rename(columns={c: f"OPP_{c}" for c in opp.columns if c != "GAME_ID"})
+    joined = team_logs.merge(opp, on="GAME_ID")
+    return joined[joined["TEAM_ID"] != joined["OPP_TEAM_ID"]]
+
+
+def _hot(l3: pd.DataFrame, base: pd.DataFrame, gp: pd.Series) -> pd.Series:
+    scoring = l3["L3_PTS"] >= HOT_RATIO * base.iloc[:, 0]
+    shooting = l3["L3_EFG_PCT"] >= HOT_RATIO * base.iloc[:, 1]
+    return (scoring | shooting) & (gp >= HOT_MIN_GAMES)
+
+
+def derive_team_sheet(team_logs: pd.DataFrame, team_q1_logs: pd.DataFrame, last_n: int = 10) -> pd.DataFrame:
+    """One row per team: season and last-N scoring/shooting, points allowed, 1Q scoring, hot flag."""
+    games = _prepare(_with_opponent(team_logs), "TEAM_ID")
+    cols = BOX_COLUMNS + ["OPP_PTS", "OPP_FGM", "OPP_FGA", "OPP_FG3M"]
+    season = _window_sums(games, "TEAM_ID", cols)
+    recent = _window_sums(games, "TEAM_ID", cols, last_n)
+    l3 = _shooting(_window_sums(games, "TEAM_ID", cols, 3), "L3_")
+
+    out = pd.concat([_shooting(season, ""), _shooting(recent, f"L{last_n}_")], axis=1)
+    out.insert(0, "GP", season["GP"])
+    out["OPP_PTS"] = season["OPP_PTS"] / season["GP"]
+    out[f"L{last_n}_OPP_PTS"] = recent["OPP_PTS"] / recent["GP"]
+    out["OPP_EFG_PCT"] = (season["OPP_FGM"] + 0.5 * season["OPP_FG3M"]) / season["OPP_FGA"]
+    out["PLUS_MINUS"] = season["PLUS_MINUS"] / season["GP"]
+    out[f"L{last_n}_PLUS_MINUS"] = recent["PLUS_MINUS"] / recent["GP"]
+
+    q1 = _prepare(_with_opponent(team_q1_logs), "TEAM_ID")
+    q1_season = _window_sums(q1, "TEAM_ID", ["PTS", "OPP_PTS"])
+    q1_recent = _window_sums(q1, "TEAM_ID", ["PTS", "OPP_PTS"], last_n)
+    out["Q1_PTS"] = q1_season["PTS"] / q1_season["GP"]
+    out["Q1_OPP_PTS"] = q1_season["OPP_PTS"] / q1_season["GP"]
+    out[f"L{last_n}_Q1_PTS"] = q1_recent["PTS"] / q1_recent["GP"]
+
+    out["HOT"] = _hot(l3, out[[f"L{last_n}_PTS", f"L{last_n}_EFG_PCT"]], out["GP"])
+    names = team_logs.drop_duplicates("TEAM_ID").set_index("TEAM_ID")["TEAM_ABBREVIATION"]
+    out.insert(0, "TEAM_ABBREVIATION", names.reindex(out.index))
+    return out
+
+
+def derive_player_sheet(player_logs: pd.DataFrame, last_n: int = 10, min_games: int = HOT_MIN_GAMES) -> pd.DataFrame:
+    """One row per player with at least min_games: season, last-N and last-3 shooting plus hot flag."""
+    logs = _prepare(player_logs, "PLAYER_ID")
+    cols = [c for c in BOX_COLUMNS + ["MIN"] if c in logs]
+    season = _window_sums(logs, "PLAYER_ID", cols)
+    recent = _window_sums(logs, "PLAYER_ID", cols, last_n)
+    l3 = _shooting(_window_sums(logs, "PLAYER_ID", cols, 3), "L3_")
+
+    out = pd.concat([_shooting(season, ""), _shooting(recent, f"L{last_n}_"), l3], axis=1)
+    out.insert(0, "GP", season["GP"])
+    if "MIN" in season:
+        out["MIN"] = season["MIN"] / season["GP"]
+    out["HOT"] = _hot(l3, out[[f"L{last_n}_PTS", f"L{last_n}_EFG_PCT"]], out["GP"])
+    latest = logs.groupby("PLAYER_ID").tail(1).set_index("PLAYER_ID")
+    out.insert(0, "TEAM_ABBREVIATION", latest["TEAM_ABBREVIATION"].reindex(out.index))
+    out.insert(0, "PLAYER_NAME", latest["PLAYER_NAME"].reindex(out.index))
+    return out[out["GP"] >= min_games]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pull a league-wide NBA snapshot and derive sheet stats.")
+    parser.add_argument("--season", default="2024-25")
+    parser.add_argument("--date", default=datetime.today().strftime("%Y%m%d"), help="Snapshot date YYYYMMDD")
+    parser.add_argument("--last-n", type=int, default=10, help="Trend window in games")
+    parser.add_argument("--offline", action="store_true", help="Derive from the stored snapshot only")
+    args = parser.parse_args()
+
+    as_of = datetime.strptime(args.date, "%Y%m%d").date()
+    out_dir = snapshot_dir(as_of)
+    tables = load_snapshot(out_dir) if args.offline else pull_snapshot(args.season, as_of, out_dir=out_dir)
+    teams = derive_team_sheet(tables["team_logs"], tables["team_q1_logs"], args.last_n)
+    players = derive_player_sheet(tables["player_logs"], args.last_n)
+    teams.to_csv(out_dir / "team_sheet.csv")
+    players.to_csv(out_dir / "player_sheet.csv")
+    print(f"{len(teams)} teams, {len(players)} players ({int(players['HOT'].sum())} hot) -> {out_dir}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
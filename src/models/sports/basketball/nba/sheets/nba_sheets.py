@@ -2,6 +2,10 @@ import requests
 from datetime import date
 import pandas as pd
 
+from models.sports.basketball.nba.sheets.nba_stats_client import (
+    BASE_URL, NBA_STATS_HEADERS, PLAYER_STATS_PARAMS, TEAM_STATS_PARAMS,
+    get_nba_stats_client, league_dash_jobs)
+
 # IMPORTANT: Figure out how to trim data for players - may need to factor in games played as % and/or usage; this is why there's value in doing Last X games
 #     Min. 5 games played?
 # Add notes at the bottom for a type of glossary, depending if PDF can do it?
@@ -9,116 +13,27 @@ import pandas as pd
 # for output, name the file nogames.pdf
 
 #make sure to mask headers
-nba_stats_headers = {
-    'Accept': 'application/json, text/plain, */*',
-    'Accept-Encoding': 'gzip, deflate, br',
-    'Accept-Language': 'en-US,en;q=0.5',
-    'Cache-Control': 'no-cache',
-    'Connection': 'keep-alive',
-    'Host': 'stats.nba.com',
-    'Referer': 'https://stats.nba.com/',
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:72.0) Gecko/20100101 Firefox/72.0',
-    'x-nba-stats-origin': 'stats',
-    'x-nba-stats-token': 'true',
-}
-player_stats_params = {
-    'ActiveRoster': '',
-    'College': '',
-    'Conference': '',
-    'Country': '',
-    'DateFrom': '',
-    'DateTo': '',
-    'Division': '',
-    'DraftPick': '',
-    'DraftYear': '',
-    'GameScope': '',
-    'GameSegment': '',
-    'GameSubtype': '',
-    'Height': '',
-    'ISTRound': '',
-    'LastNGames': '0',
-    'LeagueID': '00',
-    'Location': '',
-    'MeasureType': 'Base',
-    'Month': '0',
-    'OpponentTeamID': '0',
-    'Outcome': '',
-    'PaceAdjust': 'N',
-    'Period': '0',
-    'PerMode': 'PerGame',
-    'PlayerExperience': '',
-    'PlayerPosition': '',
-    'PlusMinus': 'N',
-    'PORound': '0',
-    'Rank': 'N',
-    'Season': '2024-25',
-    'SeasonSegment': '',
-    'SeasonType': 'Regular Season',
-    'ShotClockRange': '',
-    'StarterBench': '',
-    'TeamID': '0',
-    'TwoWay': '',
-    'VsConference': '',
-    'VsDivision': '',
-    'Weight': ''
-}
-team_stats_params = {
-    'Conference': '',
-    'DateFrom': '',
-    'DateTo': '',
-    'Division': '',
-    'GameScope': '',
-    'GameSegment': '',
-    'GameSubtype': '',
-    'ISTRound': '',
-    'LastNGames': '0',
-    'LeagueID': '00',
-    'Location': '',
-    'MeasureType': 'Base',
-    'Month': '0',
-    'OpponentTeamID': '0',
-    'Outcome': '',
-    'PaceAdjust': 'N',
-    'Period': '0',
-    'PerMode': 'PerGame',
-    'PlayerExperience': '',
-    'PlayerPosition': '',
-    'PlusMinus': 'N',
-    'PORound': '0',
-    'Rank': 'N',
-    'Season': '2024-25',
-    'SeasonSegment': '',
-    'SeasonType': 'Regular Season',
-    'ShotClockRange': '',
-    'StarterBench': '',
-    'TeamID': '0',
-    'TwoWay': '',
-    'VsConference': '',
-    'VsDivision': ''
-}
+nba_stats_headers = NBA_STATS_HEADERS
+player_stats_params = PLAYER_STATS_PARAMS
+team_stats_params = TEAM_STATS_PARAMS
 
 # global variable assignment
 endpoints = ['leaguedashplayerstats', 'leaguedashteamstats', 'scheduleleaguev2']
-session = requests.Session()
-session.headers = nba_stats_headers
-base_url = 'https://stats.nba.com/stats/'
+# pooled session + per-day disk cache; see nba_stats_client
+client = get_nba_stats_client()
+session = client.session
+base_url = BASE_URL
 schedule = None
 injuries = None
 data_dict = {}
 
-# function here for gathering data - might not even need pandas
-def get_data(url, query_dict={}, req_headers=api_header_dict):
-    # add in req_headers = {}; will auto-use api_header_dict for any that match url.startswith(base_url)
-    ####################################################
-    # if url in endpoints, use base_url
-    ####################################################
-    if url.startswith(base_url):
-        response = session.get(base_url + endpoint, params=query_dict, headers=req_headers)
-    else:
-        response = requests.get(url, params=query_dict, headers=req_headers)
-    response.raise_for_status()
-    # possibly add a comparison here to do json.loads and compare them before returning response.json()
-    return response.json()
+def get_data(url, query_dict=None):
+    # url is an endpoint name under base_url (e.g. 'leaguedashteamstats') or a full URL
+    return client.fetch(url, query_dict)
+
+def get_league_tables(season='2024-25', last_n_games=0):
+    # player/team base, advanced, opponent and defense tables pulled concurrently
+    return client.fetch_many(league_dash_jobs(season, last_n_games))
 
 def get_schedule():
     date_str = date.today().strftime('%m/%d/%Y %H:%M:%S')
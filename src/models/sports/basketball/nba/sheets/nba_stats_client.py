@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Cached, concurrent fetch layer for stats.nba.com.
+
+  - one pooled requests.Session (keep-alive, retries on 429/5xx) shared by
+    every call
+  - responses cached on disk per (endpoint, params, date), so re-running a
+    day's sheet costs no requests
+  - fetch_many() fans the league dash pulls (player/team x base/advanced/
+    opponent/defense) out over a thread pool
+  - resultSets are normalized into DataFrames once per payload
+
+USAGE EXAMPLES:
+  # Warm today's cache for the standard league dash pulls
+  python -m src.models.sports.basketball.nba.sheets.nba_stats_client --season 2024-25
+"""
+import argparse
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Mapping, Tuple
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.config_loader import load_config
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://stats.nba.com/stats/"
+MAX_WORKERS = 6
+
+NBA_STATS_HEADERS = {
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Cache-Control': 'no-cache',
+    'Connection': 'keep-alive',
+    'Host': 'stats.nba.com',
+    'Referer': 'https://stats.nba.com/',
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:72.0) Gecko/20100101 Firefox/72.0',
+    'x-nba-stats-origin': 'stats',
+    'x-nba-stats-token': 'true',
+}
+
+TEAM_STATS_PARAMS = {
+    'Conference': '', 'DateFrom': '', 'DateTo': '', 'Division': '', 'GameScope': '',
+    'GameSegment': '', 'GameSubtype': '', 'ISTRound': '', 'LastNGames': '0', 'LeagueID': '00',
+    'Location': '', 'MeasureType': 'Base', 'Month': '0', 'OpponentTeamID': '0', 'Outcome': '',
+    'PaceAdjust': 'N', 'Period': '0', 'PerMode': 'PerGame', 'PlayerExperience': '',
+    'PlayerPosition': '', 'PlusMinus': 'N', 'PORound': '0', 'Rank': 'N', 'Season': '2024-25',
+    'SeasonSegment': '', 'SeasonType': 'Regular Season', 'ShotClockRange': '', 'StarterBench': '',
+    'TeamID': '0', 'TwoWay': '', 'VsConference': '', 'VsDivision': '',
+}
+PLAYER_STATS_PARAMS = {
+    **TEAM_STATS_PARAMS,
+    'ActiveRoster': '', 'College': '', 'Country': '', 'DraftPick': '', 'DraftYear': '',
+    'Height': '', 'Weight': '',
+}
+
+
+def _session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    session = requests.Session()
+    session.headers.update(NBA_STATS_HEADERS)
+    retry = Retry(total=3, backoff_factor=1.0, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+
+def result_sets_to_frames(payload: Mapping) -> Dict[str, pd.DataFrame]:
+    """{name: DataFrame} for a stats.nba.com payload ('resultSets' list or single 'resultSet')."""
+    sets = payload.get("resultSets", payload.get("resultSet", []))
+    if isinstance(sets, Mapping):
+        sets = [sets]
+    return {rs.get("name", str(i)): pd.DataFrame(rs.get("rowSet", []), columns=rs.get("headers"))
+            for i, rs in enumerate(sets)}
+
+
+class NbaStatsClient:
+    def __init__(self, cache_dir=None, timeout: float = 30.0, max_workers: int = MAX_WORKERS):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.session = _session(max_workers)
+
+    def _cache_path(self, endpoint: str, params: Mapping, as_of: date) -> Path:
+        key = hashlib.sha1(json.dumps([endpoint, dict(params)], sort_keys=True).encode()).hexdigest()[:16]
+        folder = "external" if endpoint.startswith("http") else endpoint
+        return self.cache_dir / folder / as_of.strftime("%Y%m%d") / f"{key}.json"
+
+    def fetch(self, endpoint: str, params: Mapping = None, as_of: date = None,
+              use_cache: bool = True) -> dict:
+        """JSON for an endpoint (name under BASE_URL or a full URL), cached per date."""
+        params = dict(params or {})
+        as_of = as_of or date.today()
+        path = self._cache_path(endpoint, params, as_of) if self.cache_dir else None
+        if use_cache and path is not None and path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        url = endpoint if endpoint.startswith("http") else BASE_URL + endpoint
+        headers = None if url.startswith(BASE_URL) else {"Host": None}
+        resp = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        resp.raise_for_status()
+        payload = resp.json()
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            tmp.replace(path)
+        return payload
+
+    def fetch_frames(self, endpoint: str, params: Mapping = None, **kwargs) -> Dict[str, pd.DataFrame]:
+        return result_sets_to_frames(self.fetch(endpoint, params, **kwargs))
+
+    def fetch_many(self, jobs: Mapping[str, Tuple[str, Mapping]], frames: bool = True,
+                   **kwargs) -> Dict[str, object]:
+        """
+        Run {name: (endpoint, params)} concurrently. Returns {name: first result
+        set as a DataFrame} (or the raw payload when frames=False). A failed pull
+        is logged and maps to None so one slow endpoint doesn't sink the sheet.
+        """
+        def run(item):
+            name, (endpoint, params) = item
+            try:
+                payload = self.fetch(endpoint, params, **kwargs)
+            except requests.RequestException as e:
+                logger.error("NBA stats pull %s failed: %s", name, e)
+                return name, None
+            if not frames:
+                return name, payload
+            sets = result_sets_to_frames(payload)
+            return name, next(iter(sets.values())) if sets else pd.DataFrame()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return dict(pool.map(run, jobs.items()))
+
+
+def league_dash_jobs(season: str, last_n_games: int = 0, **overrides) -> Dict[str, Tuple[str, dict]]:
+    """The standard player/team league dash pulls for a season."""
+    common = {"Season": season, "LastNGames": str(last_n_games), **overrides}
+    jobs = {}
+    for measure in ("Base", "Advanced"):
+        jobs[f"player_{measure.lower()}"] = (
+            "leaguedashplayerstats", {**PLAYER_STATS_PARAMS, **common, "MeasureType": measure})
+    for measure in ("Base", "Advanced", "Opponent", "Defense"):
+        jobs[f"team_{measure.lower()}"] = (
+            "leaguedashteamstats", {**TEAM_STATS_PARAMS, **common, "MeasureType": measure})
+    return jobs
+
+
+@lru_cache(maxsize=1)
+def get_nba_stats_client() -> NbaStatsClient:
+    """Process-wide client caching under nba_data.cache_dir."""
+    cfg = load_config()
+    cache_dir = Path(cfg.get("nba_data", {}).get("cache_dir", ".cache/nba_stats"))
+    if not cache_dir.is_absolute():
+        cache_dir = Path(cfg["root_path"]) / cache_dir
+    return NbaStatsClient(cache_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pull and cache the standard NBA league dash tables.")
+    parser.add_argument("--season", default="2024-25")
+    parser.add_argument("--last-n-games", type=int, default=0)
+    args = parser.parse_args()
+    tables = get_nba_stats_client().fetch_many(league_dash_jobs(args.season, args.last_n_games))
+    for name, df in tables.items():
+        print(f"{name}: {'failed' if df is None else f'{len(df)} rows'}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
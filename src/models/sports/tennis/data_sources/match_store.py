@@ -0,0 +1,89 @@
+# match_store.py
+"""
+Tennis match history indexed by (player, surface).
+
+Match data is one row per player per match (player's perspective):
+player, opponent, surface, date, result ('W'/'L'), opponent_rank, plus any
+extra columns. The store sorts it once by player, surface and date (newest
+first) and records where each (player, surface) group starts and ends, so a
+player's recent matches on a surface are a slice, and batch features are a
+single groupby over the pre-sorted frame.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+REQUIRED_COLUMNS = ["player", "surface", "date", "result"]
+
+
+def matches_from_player_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per match (date, surface, winner, loser) from player-perspective rows
+    (player, opponent, surface, date, result), whether the data holds one or
+    both perspectives of each match.
+    """
+    won = df["result"] == "W"
+    matches = pd.DataFrame({
+        "date": pd.to_datetime(df["date"]),
+        "surface": df["surface"],
+        "winner": np.where(won, df["player"], df["opponent"]),
+        "loser": np.where(won, df["opponent"], df["player"]),
+    })
+    return (matches.drop_duplicates(["date", "surface", "winner", "loser"])
+            .sort_values("date", kind="mergesort").reset_index(drop=True))
+
+
+class TennisMatchStore:
+    def __init__(self, match_data: pd.DataFrame):
+        missing = set(REQUIRED_COLUMNS) - set(match_data.columns)
+        if missing:
+            raise KeyError(f"match data missing columns: {sorted(missing)}")
+        df = match_data.copy()
+        df["date"] = pd.to_datetime(df["date"])
+        df = df.sort_values(["player", "surface", "date"], ascending=[True, True, False],
+                            kind="mergesort").reset_index(drop=True)
+        # 0 = most recent match of the player on that surface
+        df["recency"] = df.groupby(["player", "surface"], sort=False).cumcount()
+        df["win"] = (df["result"] == "W").astype(np.int8)
+        self.df = df
+
+        keys = list(zip(df["player"], df["surface"]))
+        starts = np.flatnonzero(df["recency"].to_numpy() == 0)
+        ends = np.append(starts[1:], len(df))
+        self._slices: Dict[Tuple[str, str], Tuple[int, int]] = {
+            keys[s]: (int(s), int(e)) for s, e in zip(starts, ends)
+        }
+
+    @classmethod
+    def from_csv(cls, path, **read_kwargs) -> "TennisMatchStore":
+        return cls(pd.read_csv(path, **read_kwargs))
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def players(self):
+        return self.df["player"].unique()
+
+    def recent(self, player: str, surface: str, n: Optional[int] = None) -> pd.DataFrame:
+        """The player's matches on a surface, newest first (at most n)."""
+        start, end = self._slices.get((player, surface), (0, 0))
+        if n is not None:
+            end = min(end, start + n)
+        return self.df.iloc[start:end]
+
+    def before(self, as_of) -> "TennisMatchStore":
+        """A store holding only matches played strictly before as_of (for backtests)."""
+        return TennisMatchStore(self.df[self.df["date"] < pd.Timestamp(as_of)]
+                                .drop(columns=["recency", "win"]))
+
+    def matches(self) -> pd.DataFrame:
+        """One row per match (date, surface, winner, loser), oldest first."""
+        return matches_from_player_rows(self.df)
+
+    def window(self, players: Iterable[str], surface: str, last_n: int) -> pd.DataFrame:
+        """Each listed player's last_n matches on a surface, as one frame."""
+        mask = (self.df["surface"].to_numpy() == surface) & (self.df["recency"].to_numpy() < last_n)
+        sub = self.df[mask]
+        return sub[sub["player"].isin(set(players))]
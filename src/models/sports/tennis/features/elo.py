@@ -0,0 +1,166 @@
+# elo.py
+"""
+Streaming Elo ratings for tennis, overall and per surface.
+
+Match history is processed once in date order; later results are applied
+incrementally with update(). Results for the last applied date may be passed
+again (a re-run of that day); matches already applied are skipped. The K-factor shrinks with experience
+(250 / (matches + 5) ** 0.4), tracked separately for the overall and each
+surface rating.
+
+Lookups:
+  - rating(player) / surface_rating(player, surface): current values, O(1)
+  - rating(player, as_of=...): rating entering as_of, by bisecting that
+    player's own rating history (O(log matches-of-player))
+  - update() returns every match's pre-match ratings, which is what feature
+    generation for historical matches needs (no lookup at all)
+
+save()/load() persist a snapshot (current ratings, match counts, last date
+and the matches applied on it) plus the rating history, so a new day's results only cost that day's matches.
+"""
+import json
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+INITIAL_RATING = 1500.0
+OVERALL = ""  # surface key of the overall rating track
+
+
+class EloEngine:
+    def __init__(self, k_scale: float = 250.0, k_offset: float = 5.0, k_shape: float = 0.4):
+        self.k_scale = k_scale
+        self.k_offset = k_offset
+        self.k_shape = k_shape
+        self.last_date: Optional[pd.Timestamp] = None
+        # (winner, loser) pairs already applied on last_date
+        self._last_day_matches: Set[Tuple[str, str]] = set()
+        # (player, surface) -> current rating / matches played; surface OVERALL = overall
+        self._rating: Dict[Tuple[str, str], float] = {}
+        self._played: Dict[Tuple[str, str], int] = defaultdict(int)
+        # (player, surface) -> parallel lists of match dates (ns) and post-match ratings
+        self._hist_dates: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._hist_ratings: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+
+    def _k(self, key) -> float:
+        return self.k_scale / (self._played[key] + self.k_offset) ** self.k_shape
+
+    def _play(self, winner_key, loser_key, date_ns: int) -> Tuple[float, float]:
+        rw = self._rating.get(winner_key, INITIAL_RATING)
+        rl = self._rating.get(loser_key, INITIAL_RATING)
+        surprise = 1.0 - 1.0 / (1.0 + 10 ** ((rl - rw) / 400.0))
+        for key, new in ((winner_key, rw + self._k(winner_key) * surprise),
+                         (loser_key, rl - self._k(loser_key) * surprise)):
+            self._rating[key] = new
+            self._played[key] += 1
+            self._hist_dates[key].append(date_ns)
+            self._hist_ratings[key].append(new)
+        return rw, rl
+
+    def update(self, matches: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply matches (date, surface, winner, loser) in date order. Dates must not
+        precede results already applied; a (date, winner, loser) that was already
+        applied is skipped. Returns the applied matches with pre-match
+        winner/loser overall and surface ratings.
+        """
+        matches = matches.sort_values("date", kind="mergesort").reset_index(drop=True)
+        dates = pd.to_datetime(matches["date"])
+        if len(matches) and self.last_date is not None and dates.iloc[0] < self.last_date:
+            raise ValueError(f"Match dated {dates.iloc[0].date()} precedes last applied "
+                             f"result {self.last_date.date()}; rebuild the ratings instead")
+
+        pre = np.empty((len(matches), 4))
+        applied = np.ones(len(matches), dtype=bool)
+        last_ns = self.last_date.value if self.last_date is not None else None
+        for i, (d, surface, winner, loser) in enumerate(zip(
+                dates.values.astype("datetime64[ns]").astype("int64"), matches["surface"], matches["winner"], matches["loser"])):
+            if d != last_ns:
+                last_ns, self._last_day_matches = d, set()
+            elif (winner, loser) in self._last_day_matches:
+                applied[i] = False
+                continue
+            self._last_day_matches.add((winner, loser))
+            pre[i, 0:2] = self._play((winner, OVERALL), (loser, OVERALL), d)
+            pre[i, 2:4] = self._play((winner, surface), (loser, surface), d)
+        if len(matches):
+            self.last_date = dates.iloc[-1]
+
+        out = matches.copy()
+        out[["winner_elo", "loser_elo", "winner_surface_elo", "loser_surface_elo"]] = pre
+        return out[applied].reset_index(drop=True)
+
+    def rating(self, player: str, as_of=None) -> float:
+        return self._lookup((player, OVERALL), as_of)
+
+    def surface_rating(self, player: str, surface: str, as_of=None) -> float:
+        return self._lookup((player, surface), as_of)
+
+    def _lookup(self, key, as_of) -> float:
+        if as_of is None:
+            return self._rating.get(key, INITIAL_RATING)
+        dates = self._hist_dates.get(key)
+        if not dates:
+            return INITIAL_RATING
+        i = bisect_left(dates, pd.Timestamp(as_of).value)
+        return self._hist_ratings[key][i - 1] if i else INITIAL_RATING
+
+    def ratings_for(self, players, surface: str = None, as_of=None) -> pd.DataFrame:
+        """Overall (and surface) rating for each player, e.g. a whole draw."""
+        players = list(players)
+        out = pd.DataFrame({"elo": [self.rating(p, as_of) for p in players]}, index=players)
+        if surface is not None:
+            out["surface_elo"] = [self.surface_rating(p, surface, as_of) for p in players]
+        out.index.name = "player"
+        return out
+
+    def save(self, directory):
+        """Write elo_snapshot.json (params, last date, current state) and elo_history.csv."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        snapshot = {
+            "params": {"k_scale": self.k_scale, "k_offset": self.k_offset, "k_shape": self.k_shape},
+            "last_date": self.last_date.isoformat() if self.last_date is not None else None,
+            "last_day_matches": sorted(self._last_day_matches),
+            "ratings": [[p, s, r, self._played[(p, s)]] for (p, s), r in self._rating.items()],
+        }
+        with open(directory / "elo_snapshot.json", "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        rows = [(p, s, d, r) for (p, s), dates in self._hist_dates.items()
+                for d, r in zip(dates, self._hist_ratings[(p, s)])]
+        hist = pd.DataFrame(rows, columns=["player", "surface", "date_ns", "rating"])
+        hist.to_csv(directory / "elo_history.csv", index=False)
+
+    @classmethod
+    def load(cls, directory) -> "EloEngine":
+        directory = Path(directory)
+        with open(directory / "elo_snapshot.json", "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        engine = cls(**snapshot["params"])
+        if snapshot["last_date"]:
+            engine.last_date = pd.Timestamp(snapshot["last_date"])
+        engine._last_day_matches = {tuple(m) for m in snapshot.get("last_day_matches", [])}
+        for player, surface, rating, played in snapshot["ratings"]:
+            engine._rating[(player, surface)] = rating
+            engine._played[(player, surface)] = played
+        hist = pd.read_csv(directory / "elo_history.csv", keep_default_na=False,
+                           dtype={"player": str, "surface": str})
+        for (player, surface), grp in hist.groupby(["player", "surface"], sort=False):
+            engine._hist_dates[(player, surface)] = grp["date_ns"].astype("int64").tolist()
+            engine._hist_ratings[(player, surface)] = grp["rating"].astype(float).tolist()
+        return engine
+
+
+def win_quality_last_n(rated_matches: pd.DataFrame, players, as_of, n: int = 5) -> pd.Series:
+    """
+    win_quality_last_5: mean pre-match Elo of the last n opponents each player
+    beat before as_of, from the frame returned by EloEngine.update.
+    """
+    wins = rated_matches[(rated_matches["date"] < pd.Timestamp(as_of))
+                         & rated_matches["winner"].isin(set(players))]
+    last = wins.sort_values("date", kind="mergesort").groupby("winner").tail(n)
+    return last.groupby("winner")["loser_elo"].mean().reindex(list(players)).rename("win_quality_last_5")
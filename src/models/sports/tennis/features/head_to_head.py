@@ -0,0 +1,105 @@
+# head_to_head.py
+"""
+Head-to-head index for tennis matchups (the h2h_record feature).
+
+Built once from the match store: every unordered player pair maps to an
+H2HRecord holding the record from the alphabetically-first player's side,
+per-surface splits and the last meeting date. Lookups orient the record to
+the requested player, so an H2H feature is a dictionary hit. For backtests,
+build the index from store.before(match_date).
+"""
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from models.sports.tennis.data_sources.match_store import TennisMatchStore
+
+
+@dataclass(frozen=True)
+class H2HRecord:
+    wins: int                     # for the pair's first (alphabetical) player
+    losses: int
+    surfaces: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # surface -> (wins, losses)
+    last_meeting: Optional[pd.Timestamp] = None
+
+    def oriented(self, flip: bool) -> "H2HRecord":
+        if not flip:
+            return self
+        return H2HRecord(self.losses, self.wins,
+                         {s: (l, w) for s, (w, l) in self.surfaces.items()}, self.last_meeting)
+
+
+class HeadToHeadIndex:
+    def __init__(self, records: Dict[Tuple[str, str], H2HRecord]):
+        self.records = records
+
+    @classmethod
+    def from_store(cls, store: TennisMatchStore) -> "HeadToHeadIndex":
+        return cls.from_matches(store.matches())
+
+    @classmethod
+    def from_matches(cls, matches: pd.DataFrame) -> "HeadToHeadIndex":
+        """Build from one-row-per-match data (date, surface, winner, loser)."""
+        winner = matches["winner"].to_numpy(dtype=object)
+        loser = matches["loser"].to_numpy(dtype=object)
+        first_won = winner < loser
+        frame = pd.DataFrame({
+            "p1": np.where(first_won, winner, loser),
+            "p2": np.where(first_won, loser, winner),
+            "surface": matches["surface"].to_numpy(),
+            "p1_won": first_won.astype(int),
+            "date": pd.to_datetime(matches["date"]).to_numpy(),
+        })
+        by_surface = frame.groupby(["p1", "p2", "surface"]).agg(
+            wins=("p1_won", "sum"), played=("p1_won", "size"), last=("date", "max"))
+
+        records = {}
+        for (p1, p2), grp in by_surface.groupby(level=["p1", "p2"]):
+            wins = grp["wins"].to_numpy()
+            losses = grp["played"].to_numpy() - wins
+            surfaces = grp.index.get_level_values("surface")
+            records[(p1, p2)] = H2HRecord(
+                int(wins.sum()), int(losses.sum()),
+                {s: (int(w), int(l)) for s, w, l in zip(surfaces, wins, losses)},
+                grp["last"].max())
+        return cls(records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def record(self, player: str, opponent: str) -> Optional[H2HRecord]:
+        """The pair's record from `player`'s side, or None if they never met."""
+        flip = opponent < player
+        rec = self.records.get((opponent, player) if flip else (player, opponent))
+        return rec.oriented(flip) if rec is not None else None
+
+    def lookup(self, pairs: Iterable[Tuple[str, str]], surface: str = None) -> pd.DataFrame:
+        """
+        H2H features for each (player, opponent): h2h_wins, h2h_losses,
+        h2h_win_pct (NaN if they never met), last_meeting and, when a surface
+        is given, h2h_surface_wins / h2h_surface_losses.
+        """
+        rows = []
+        for player, opponent in pairs:
+            rec = self.record(player, opponent)
+            wins, losses = (rec.wins, rec.losses) if rec else (0, 0)
+            row = {
+                "player": player,
+                "opponent": opponent,
+                "h2h_wins": wins,
+                "h2h_losses": losses,
+                "h2h_win_pct": wins / (wins + losses) if wins + losses else np.nan,
+                "last_meeting": rec.last_meeting if rec else pd.NaT,
+            }
+            if surface is not None:
+                row["h2h_surface_wins"], row["h2h_surface_losses"] = (
+                    rec.surfaces.get(surface, (0, 0)) if rec else (0, 0))
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def lookup_draw(self, players: Iterable[str], surface: str = None) -> pd.DataFrame:
+        """lookup over every pairing of a draw's players."""
+        return self.lookup(combinations(list(players), 2), surface)
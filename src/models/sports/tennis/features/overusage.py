@@ -0,0 +1,76 @@
+# overusage.py
+"""
+Fatigue / overusage features for every player at once.
+
+Input is player-perspective match rows (player, date, games_played; any
+extra columns are kept). Features describe the player's load *before* each
+match, via time-windowed rolling sums over the table sorted by player and
+date, so refreshing a full tour calendar is a few grouped operations:
+
+  days_rest_since_last_match   days since the player's previous match
+  games_last_{N}d              games played in the N days before the match
+  matches_last_{N}d            matches played in the N days before the match
+  overusage_flag               load above OVERUSE_GAMES or OVERUSE_MATCHES
+"""
+import numpy as np
+import pandas as pd
+
+FATIGUE_WINDOW_DAYS = 10
+OVERUSE_GAMES = 100
+OVERUSE_MATCHES = 5
+
+
+def _sorted(matches: pd.DataFrame) -> pd.DataFrame:
+    df = matches.copy()
+    df["date"] = pd.to_datetime(df["date"])
+    return df.sort_values(["player", "date"], kind="mergesort")
+
+
+def fatigue_features(matches: pd.DataFrame, window_days: int = FATIGUE_WINDOW_DAYS) -> pd.DataFrame:
+    """Pre-match fatigue columns appended to every match row (original index kept)."""
+    df = _sorted(matches)
+    rest = df["date"] - df.groupby("player", sort=False)["date"].shift(1)
+    df["days_rest_since_last_match"] = rest.dt.days
+
+    # df is sorted by player then date, so the grouped rolling output lines up row for row
+    load = df[["player", "date", "games_played"]].assign(matches=1.0)
+    rolled = (load.groupby("player", sort=False)
+              .rolling(f"{window_days}D", on="date", closed="left")[["games_played", "matches"]]
+              .sum())
+    games = pd.Series(rolled["games_played"].to_numpy(), index=df.index).fillna(0.0)
+    played = pd.Series(rolled["matches"].to_numpy(), index=df.index).fillna(0.0)
+    df[f"games_last_{window_days}d"] = games
+    df[f"matches_last_{window_days}d"] = played.astype(int)
+    df["overusage_flag"] = (games >= OVERUSE_GAMES) | (played >= OVERUSE_MATCHES)
+    return df.sort_index()
+
+
+def fatigue_as_of(matches: pd.DataFrame, as_of, players=None,
+                  window_days: int = FATIGUE_WINDOW_DAYS) -> pd.DataFrame:
+    """
+    Fatigue for an upcoming match day: per player, rest days and load over
+    the window ending at as_of (matches on as_of itself are excluded).
+    """
+    df = matches[["player", "date", "games_played"]].copy()
+    df["date"] = pd.to_datetime(df["date"])
+    as_of = pd.Timestamp(as_of)
+    df = df[df["date"] < as_of]
+    if players is not None:
+        df = df[df["player"].isin(set(players))]
+
+    in_window = (df["date"] >= as_of - pd.Timedelta(days=window_days)).to_numpy()
+    grouped = df.assign(win_games=np.where(in_window, df["games_played"], 0.0),
+                        win_matches=in_window.astype(int)).groupby("player")
+    out = pd.DataFrame({
+        "days_rest_since_last_match": (as_of - grouped["date"].max()).dt.days,
+        f"games_last_{window_days}d": grouped["win_games"].sum(),
+        f"matches_last_{window_days}d": grouped["win_matches"].sum(),
+    })
+    if players is not None:
+        out = out.reindex(list(players))
+        out[[f"games_last_{window_days}d", f"matches_last_{window_days}d"]] = (
+            out[[f"games_last_{window_days}d", f"matches_last_{window_days}d"]].fillna(0))
+    out["overusage_flag"] = ((out[f"games_last_{window_days}d"] >= OVERUSE_GAMES)
+                             | (out[f"matches_last_{window_days}d"] >= OVERUSE_MATCHES))
+    out.index.name = "player"
+    return out
@@ -0,0 +1,36 @@
+# recent_form.py
+"""
+Recent-form features over each player's previous matches, for every player
+at once (player-perspective rows: player, date, result, games_played and
+optionally sets_played). Each value uses only matches before the row's own:
+
+  average_games_played_last_5   mean games per match over the last 5
+  sets_last_5                   sets played over the last 5
+  recent_win_pct                win rate over the last 10
+"""
+import pandas as pd
+
+FORM_MATCHES = 5
+WIN_PCT_MATCHES = 10
+
+
+def _prior_rolling(df: pd.DataFrame, column: str, window: int, how: str) -> pd.Series:
+    """Rolling stat over the previous `window` matches of each player (current match excluded)."""
+    prior = df.groupby("player", sort=False)[column].shift(1)
+    rolled = prior.groupby(df["player"], sort=False).rolling(window, min_periods=1)
+    return getattr(rolled, how)().reset_index(level=0, drop=True)
+
+
+def recent_form_features(matches: pd.DataFrame, last_n: int = FORM_MATCHES,
+                         win_pct_n: int = WIN_PCT_MATCHES) -> pd.DataFrame:
+    """Form columns appended to every match row (original index kept)."""
+    df = matches.copy()
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values(["player", "date"], kind="mergesort")
+    df["_win"] = (df["result"] == "W").astype(float)
+
+    df[f"average_games_played_last_{last_n}"] = _prior_rolling(df, "games_played", last_n, "mean")
+    if "sets_played" in df:
+        df[f"sets_last_{last_n}"] = _prior_rolling(df, "sets_played", last_n, "sum")
+    df["recent_win_pct"] = _prior_rolling(df, "_win", win_pct_n, "mean")
+    return df.drop(columns="_win").sort_index()
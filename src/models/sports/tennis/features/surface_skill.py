@@ -1,41 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from models.sports.tennis.data_sources.match_store import TennisMatchStore
+
+SURFACE_WINDOW = 20
+FORM_WEIGHTS = (0.5, 0.3, 0.2)
+
+
+def _opponent_strength(opponent_rank) -> np.ndarray:
+    # Matches against top-100 opponents (and unknown ranks) weigh 25% more
+    return np.where(np.asarray(opponent_rank, dtype=float) > 100, 1.0, 1.25)
+
+
 class SurfaceSkillFeature:
     def __init__(self, match_data, player_name, surface):
-        self.match_data = match_data
+        self.store = match_data if isinstance(match_data, TennisMatchStore) else TennisMatchStore(match_data)
+        self.match_data = self.store.df
         self.player = player_name
         self.surface = surface
 
     def surface_win_rate(self, lookback=18):
-        df = self.match_data[
-            (self.match_data['surface'] == self.surface) &
-            (self.match_data['player'] == self.player)
-        ].sort_values(by='date', ascending=False)
-
-        last_matches = df.head(20)
-        wins = last_matches[last_matches['result'] == 'W']
-        opponent_strength = last_matches['opponent_rank'].apply(lambda x: 1 if x > 100 else 1.25)
-        adj_win_rate = (len(wins) / len(last_matches)) * opponent_strength.mean()
+        last_matches = self.store.recent(self.player, self.surface, SURFACE_WINDOW)
+        if last_matches.empty:
+            return float('nan')
+        strength = _opponent_strength(last_matches['opponent_rank'])
+        adj_win_rate = last_matches['win'].mean() * strength.mean()
         return round(adj_win_rate, 3)
 
     def recent_surface_form(self):
-        df = self.match_data[
-            (self.match_data['surface'] == self.surface) &
-            (self.match_data['player'] == self.player)
-        ].sort_values(by='date', ascending=False)
-
-        weights = [0.5, 0.3, 0.2]
-        form_scores = []
-
-        for i, weight in enumerate(weights):
-            try:
-                result = df.iloc[i]['result']
-                form_scores.append(weight * (1 if result == 'W' else 0))
-            except IndexError:
-                form_scores.append(0)
-
-        return round(sum(form_scores), 3)
+        recent = self.store.recent(self.player, self.surface, len(FORM_WEIGHTS))
+        form = np.dot(np.asarray(FORM_WEIGHTS[:len(recent)]), recent['win'].to_numpy())
+        return round(float(form), 3)
 
     def get_features(self):
         return {
             f"{self.player}_{self.surface}_adj_win_rate": self.surface_win_rate(),
             f"{self.player}_{self.surface}_form_score": self.recent_surface_form()
         }
+
+
+def batch_surface_features(store: TennisMatchStore, players, surface: str) -> pd.DataFrame:
+    """
+    adj_win_rate and form_score for every player in a draw in one groupby over
+    the pre-sorted store. Players without matches on the surface get NaN
+    adj_win_rate and a form_score of 0.
+    """
+    players = list(players)
+    window = store.window(players, surface, SURFACE_WINDOW)
+    recency = window['recency'].to_numpy()
+    weights = np.zeros(len(window))
+    near = recency < len(FORM_WEIGHTS)
+    weights[near] = np.asarray(FORM_WEIGHTS)[recency[near]]
+
+    frame = pd.DataFrame({
+        'player': window['player'].to_numpy(),
+        'win': window['win'].to_numpy(dtype=float),
+        'strength': _opponent_strength(window['opponent_rank']),
+        'form': weights * window['win'].to_numpy(),
+    })
+    agg = frame.groupby('player').agg(win_rate=('win', 'mean'), strength=('strength', 'mean'),
+                                      form_score=('form', 'sum'))
+    out = pd.DataFrame({
+        'adj_win_rate': (agg['win_rate'] * agg['strength']).round(3),
+        'form_score': agg['form_score'].round(3),
+    }).reindex(players)
+    out['form_score'] = out['form_score'].fillna(0.0)
+    out.index.name = 'player'
+    return out
@@ -0,0 +1,35 @@
+# inference.py
+"""
+Tournament outlook: per-match win probabilities from Elo ratings turned into
+round-reach probabilities by the Monte Carlo draw simulator.
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from models.sports.tennis.features.elo import EloEngine
+from models.sports.tennis.models.monte_carlo_sim import simulate_draw
+
+
+def elo_win_probability(rating_a, rating_b) -> np.ndarray:
+    return 1.0 / (1.0 + 10 ** ((np.asarray(rating_b, dtype=float) - np.asarray(rating_a, dtype=float)) / 400.0))
+
+
+def tournament_outlook(bracket: Sequence[Optional[str]], engine: EloEngine, surface: str = None,
+                       surface_weight: float = 0.5, as_of=None, n_sims: int = 100_000,
+                       seed: int = None, workers: int = 1) -> pd.DataFrame:
+    """
+    Round-reach probabilities for a draw. Each player's strength is their
+    overall Elo, blended with their surface Elo by surface_weight when a
+    surface is given; ratings are taken as of `as_of` (default: current).
+    """
+    players = [p for p in bracket if p is not None]
+    ratings = engine.ratings_for(players, surface, as_of)
+    strength = ratings["elo"].to_numpy()
+    if surface is not None:
+        strength = (1 - surface_weight) * strength + surface_weight * ratings["surface_elo"].to_numpy()
+    P = elo_win_probability(strength[:, None], strength[None, :])
+    outlook = simulate_draw(bracket, P, n_sims=n_sims, seed=seed, workers=workers)
+    outlook.insert(0, "rating", strength)
+    return outlook.sort_values(outlook.columns[-1], ascending=False)
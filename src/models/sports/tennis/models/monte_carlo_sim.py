@@ -0,0 +1,106 @@
+# monte_carlo_sim.py
+"""
+Monte Carlo simulation of single-elimination tennis draws.
+
+The bracket is the draw in order (slot 0 plays slot 1, 2 plays 3, ...),
+with None for byes; its length must be a power of two. Win probabilities
+come as an n x n matrix P (P[i, j] = P(i beats j)) or a vectorized pairwise
+function prob_fn(players_a, players_b) -> array, evaluated once for every
+pair of entrants.
+
+All simulations advance together: each round is an (n_sims x matches)
+array of fancy-indexed probabilities compared against uniform draws, so
+100k+ tournaments cost a handful of array operations per round. Large runs
+are split into seeded shards, optionally across processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+CHUNK_SIMS = 50_000
+ROUND_NAMES = {8: "QF", 4: "SF", 2: "F", 1: "W"}
+
+
+def round_labels(draw_size: int) -> List[str]:
+    """Column per round reached: R{field} for early rounds, then QF/SF/F and W (title)."""
+    labels, field = [], draw_size
+    while field >= 1:
+        labels.append(ROUND_NAMES.get(field, f"R{field}"))
+        field //= 2
+    return labels
+
+
+def probability_matrix(players: Sequence[str], prob_fn: Callable) -> np.ndarray:
+    """P[i, j] = prob_fn(players[i], players[j]) for all pairs, in one vectorized call."""
+    names = np.asarray(players, dtype=object)
+    ii, jj = np.meshgrid(np.arange(len(names)), np.arange(len(names)), indexing="ij")
+    P = np.asarray(prob_fn(names[ii.ravel()], names[jj.ravel()]), dtype=float).reshape(len(names), -1)
+    np.fill_diagonal(P, 0.5)
+    return P
+
+
+def _simulate_counts(P: np.ndarray, slots: np.ndarray, n_sims: int, seed) -> np.ndarray:
+    """(rounds x entrants) counts of simulations in which each entrant reached each round."""
+    rng = np.random.default_rng(seed)
+    n_entrants = P.shape[0]
+    n_rounds = int(np.log2(len(slots)))
+    counts = np.zeros((n_rounds, n_entrants), dtype=np.int64)
+    dtype = np.int16 if n_entrants < 2 ** 15 else np.int32
+    done = 0
+    while done < n_sims:
+        size = min(CHUNK_SIMS, n_sims - done)
+        alive = np.broadcast_to(slots.astype(dtype), (size, len(slots)))
+        for r in range(n_rounds):
+            a, b = alive[:, 0::2], alive[:, 1::2]
+            alive = np.where(rng.random(a.shape) < P[a, b], a, b)
+            counts[r] += np.bincount(alive.ravel(), minlength=n_entrants)
+        done += size
+    return counts
+
+
+def _shard(args):
+    return _simulate_counts(*args)
+
+
+def simulate_draw(bracket: Sequence[Optional[str]], P: Union[np.ndarray, Callable] = None,
+                  n_sims: int = 100_000, seed: int = None, workers: int = 1,
+                  shards: int = None) -> pd.DataFrame:
+    """
+    Probability that each player reaches each round (first column is the
+    starting round, 1.0 for everyone; last column W is the title).
+    P is indexed by the non-bye players in bracket order, or is a pairwise function.
+    """
+    size = len(bracket)
+    if size < 2 or size & (size - 1):
+        raise ValueError(f"Bracket size must be a power of two, got {size}")
+    players = [p for p in bracket if p is not None]
+    n = len(players)
+    if callable(P):
+        P = probability_matrix(players, P)
+    P = np.asarray(P, dtype=float)
+    if P.shape != (n, n):
+        raise ValueError(f"Probability matrix must be {n}x{n}, got {P.shape}")
+
+    # Byes are an extra entrant that never wins
+    full = np.zeros((n + 1, n + 1))
+    full[:n, :n] = P
+    full[:n, n] = 1.0
+    slot_of = {name: i for i, name in enumerate(players)}
+    slots = np.array([slot_of[p] if p is not None else n for p in bracket])
+
+    shards = shards or max(workers, 1)
+    seeds = np.random.SeedSequence(seed).spawn(shards)
+    per_shard = np.full(shards, n_sims // shards)
+    per_shard[: n_sims % shards] += 1
+    jobs = [(full, slots, int(k), s) for k, s in zip(per_shard, seeds) if k]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = sum(pool.map(_shard, jobs))
+    else:
+        counts = sum(_shard(job) for job in jobs)
+
+    labels = round_labels(size)
+    reach = np.vstack([np.ones(n + 1), counts / n_sims])[:, :n]
+    return pd.DataFrame(reach.T, index=pd.Index(players, name="player"), columns=labels)
@@ -11,7 +11,7 @@ import pandas as pd
 from dotenv import load_dotenv
 
 # Notification utility
-from utils.notify import send_discord_webhook
+from utils.notify import get_outbox, spawn_dispatcher
 
 # Add src directory to Python path
 src_path = Path(__file__).parent.parent
@@ -20,12 +20,17 @@ if str(src_path) not in sys.path:
 
 # Now import local modules
 from utils.mlb.fetch_schedule import fetch_schedule
-from utils.mlb.fetch_game_details import fetch_game_details
-from utils.mlb.fetch_advanced_stats_for_pitcher import PitcherAdvancedStats
+from utils.mlb.fetch_game_details import fetch_slate_details
+from utils.mlb.slate_lineups import lineup_features
+from utils.mlb.request_planner import build_slate_plan, run_prefetch
+from utils.mlb.pitcher_game_aggregates import get_pitcher_game_store
+from utils.mlb.feature_store import FeatureStore
 from utils.config_loader import load_config
 from utils.helpers import FeatureConfigLoader
-from utils.mlb.team_codes import get_team_codes
-from utils.mlb.calculate_nrfi_score import calculate_nrfi_score
+from utils.mlb.team_registry import get_team_registry
+from utils.mlb.calculate_nrfi_score import calculate_nrfi_score, nrfi_feature_values
+from utils.artifact_catalog import (
+    get_catalog, DAILY_GAME_SUMMARY, FANGRAPHS_SPLITS_1ST_INNING)
 
 load_dotenv()  # Load environment variables from .env file
 
@@ -45,33 +50,12 @@ except ImportError:
 
 
 # Determine date to process
-date_str = sys.argv[1] if len(
-    sys.argv) > 1 else datetime.now().strftime('%Y-%m-%d')
+date_str = next((a for a in sys.argv[1:] if not a.startswith('-')),
+                datetime.now().strftime('%Y-%m-%d'))
 SEASON = int(date_str.split('-')[0])
 
-# Get base cache path from config and inject season into filename
-cache_template = cfg["mlb_data"].get(
-    "team_abbrev_cds_cache_path", ".cache/team_codes_{season}.json")
-cache_file = Path(cache_template.format(season=SEASON))
-
-if cache_file.exists():
-    logging.info("📦 Loading team codes from cache: %s", cache_file)
-    with open(cache_file, "r", encoding="utf-8") as f:
-        team_codes = json.load(f)
-else:
-    logging.info("📡 Fetching team codes from MLB API for season %d", SEASON)
-    team_codes = get_team_codes(SEASON)  # Your custom function
-    cache_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(cache_file, "w", encoding="utf-8") as f:
-        json.dump(team_codes, f, indent=2)
-    logging.info("✅ Saved team codes to cache at %s", cache_file)
-
-
-# logging.debug("🔁 Forcing refresh? %s", force_refresh)
-# logging.debug("📦 Cache file exists? %s", cache_file.exists())
-# logging.debug("📦 Cache file path: %s", cache_file)
-
-TEAM_CODES = get_team_codes()
+# One team identity registry for every join (MLB ids, FanGraphs, Statcast, names)
+TEAM_REGISTRY = get_team_registry()
 
 features_path = cfg["models"]["mlb_rfi"]["feature_definitions_path"]
 features_cfg = FeatureConfigLoader.load_features_config(features_path)
@@ -123,20 +107,17 @@ def load_stats():
     return df_pitch  # , df_bat
 
 
-DF_PITCH = load_stats()
 # DF_PITCH = []
 
 
-def normalize_team_name(name):
-    return name.replace(".", "").replace("  ", " ").strip().lower()
-
-
 if __name__ == '__main__':
 
     import argparse
     parser = argparse.ArgumentParser(description="MLB RFI Pipeline")
     parser.add_argument("date", nargs="?", default=datetime.now().strftime('%Y-%m-%d'), help="Date to process (YYYY-MM-DD)")
     parser.add_argument("--force", action="store_true", help="Force re-run even if output exists")
+    parser.add_argument("--plan", action="store_true",
+                        help="Dry run: print the external requests the run would make and exit")
     args = parser.parse_args()
     date_str = args.date
     force = args.force
@@ -150,7 +131,7 @@ if __name__ == '__main__':
     # Check for existing outputs unless --force
     summary_csv = Path(cfg["mlb_data"]["raw"]) / f"mlb_daily_game_summary_{date_str.replace('-','')}.csv"
     summary_json = Path(cfg["mlb_data"]["raw"]) / f"mlb_daily_game_summary_{date_str.replace('-','')}.json"
-    if not force and summary_csv.exists() and summary_json.exists():
+    if not force and not args.plan and summary_csv.exists() and summary_json.exists():
         logging.info(f"Summary files for {date_str} already exist. Use --force to re-run.")
         print(f"Summary files for {date_str} already exist. Use --force to re-run.")
         sys.exit(0)
@@ -162,6 +143,12 @@ if __name__ == '__main__':
     games = fetch_schedule(date_str)
     logging.info("Loaded %d games", len(games))
 
+    if args.plan:
+        print(build_slate_plan(games, dt.date(), SEASON).describe())
+        sys.exit(0)
+
+    DF_PITCH = load_stats()
+
     # Load wOBA split data (portable)
     woba3_path = cfg["mlb_data"].get("woba3_combined_json")
     if not woba3_path:
@@ -173,7 +160,8 @@ if __name__ == '__main__':
         woba3_path = Path(root_path) / woba3_path
     with open(woba3_path, 'r', encoding='utf-8') as wf:
         woba_data = json.load(wf)
-        woba_split = woba_data.get("splits", {}).get("14d", {})
+        woba_split = TEAM_REGISTRY.rekey(
+            woba_data.get("splits", {}).get("14d", {}))
 
     # Load wRC+ 1st inning data from FanGraphs
     #wrclike_path = Path(
@@ -187,59 +175,50 @@ if __name__ == '__main__':
             date=dt.strftime("%Y%m%d")  # e.g. "20250718"
         )
     )
-    if not wrclike_path.exists():
-
-        # Try to find a recent file with the same pattern (7 days old or less)
-        import glob
-        import time
-        from datetime import datetime, timedelta
-        import smtplib
-        # from email.message import EmailMessage
-        # import requests
-
-        pattern = str(wrclike_path).replace(dt.strftime("%Y%m%d"), "*")
-        candidates = glob.glob(pattern)
-        recent_file = None
-        for f in sorted(candidates, reverse=True):
-            try:
-                mtime = Path(f).stat().st_mtime
-                file_dt = datetime.fromtimestamp(mtime)
-                if (datetime.now() - file_dt).days <= 7:
-                    recent_file = Path(f)
-                    break
-            except Exception:
-                continue
-        if recent_file:
-            logging.warning(f"{wrclike_path} not found, using recent file {recent_file} (<=7 days old)")
-            wrclike_path = recent_file
-        else:
-            # Notification scaffolding
-            msg = f"FanGraphs splits CSV missing: {wrclike_path}. No recent file found."
-            logging.error(msg)
-            # --- Email notification (scaffold) ---
-            # send_email_notification(msg)
-            # --- Text/SMS notification (scaffold) ---
-            # send_sms_notification(msg)
-            # --- Discord webhook notification (scaffold) ---
-            # send_discord_webhook(msg)
-            raise FileNotFoundError(f"{wrclike_path} not found—please add the FanGraphs splits CSV. No recent file found.")
+    # Resolve the splits through the artifact catalog: newest file as of the run
+    # date, at most 7 days old. Today's file may have been dropped in by hand.
+    catalog = get_catalog()
+    catalog.ensure_backfilled(
+        FANGRAPHS_SPLITS_1ST_INNING, wrclike_path.parent,
+        wrclike_path.name.replace(dt.strftime("%Y%m%d"), "????????"), season=SEASON)
+    splits_rec = catalog.resolve(
+        FANGRAPHS_SPLITS_1ST_INNING, dt.date(), season=SEASON, max_age_days=7)
+    if wrclike_path.exists() and (splits_rec is None or splits_rec.as_of != dt.date().isoformat()):
+        splits_rec = catalog.register(
+            FANGRAPHS_SPLITS_1ST_INNING, wrclike_path, dt.date(), season=SEASON)
+    if splits_rec is None:
+        # Notification scaffolding
+        msg = f"FanGraphs splits CSV missing: {wrclike_path}. No recent file found."
+        logging.error(msg)
+        # --- Email notification (scaffold) ---
+        # send_email_notification(msg)
+        # --- Text/SMS notification (scaffold) ---
+        # send_sms_notification(msg)
+        # --- Discord webhook notification (scaffold) ---
+        # send_discord_webhook(msg)
+        raise FileNotFoundError(f"{wrclike_path} not found—please add the FanGraphs splits CSV. No recent file found.")
+    if splits_rec.as_of != dt.date().isoformat():
+        logging.warning(f"{wrclike_path} not found, using splits as of {splits_rec.as_of}: {splits_rec.path} (<=7 days old)")
+    wrclike_path = catalog.path_of(splits_rec)
 
     try:
         wrclike_df = pd.read_csv(wrclike_path)
-        wrclike_map = {
-            str(row["Tm"]).strip().upper(): row["wRC+"]
-            for _, row in wrclike_df.iterrows()
-        }
+        wrclike_map = TEAM_REGISTRY.rekey(
+            dict(zip(wrclike_df["Tm"], wrclike_df["wRC+"])))
     except Exception as e:
         logging.error(f"❌ Failed to load w#RC+ 1st inning CSV: {e}")
         wrclike_map = {}
     print("wRC+ keys:", sorted(wrclike_map.keys()))
 
-    # Aggregate pitcher stats for 4th game only (index 3)
+    # Network-bound prefetch for the whole slate: batched lineup hydration runs
+    # alongside one game-log refresh for every probable and the date-level
+    # Statcast pulls, so the per-pitcher analysis below reads local stores
+    lineups = lineup_features(run_prefetch(games, dt.date(), SEASON))
+
+    # Per-game pitcher analysis runs concurrently across the slate; the stores
+    # it writes are locked and identical requests are coalesced
     all_pitchers = []
-    #g = games[3]
-    for g in games:
-        pitchers = fetch_game_details(g, DF_PITCH, features_cfg, SEASON)
+    for pitchers in fetch_slate_details(games, DF_PITCH, features_cfg, SEASON):
         for p in pitchers:
             stats = p.setdefault('stats', {})
             calc = p.setdefault('calculated_stats', {})
@@ -250,17 +229,17 @@ if __name__ == '__main__':
             stats['recent_barrel_pct'] = recent.get('avg_barrel_pct', 'NA')
             stats['recent_barrel_pct_score'] = recent.get(
                 'avg_barrel_pct_score', 'NA')
-            # Compute first-inning metrics via PitcherAdvancedStats
-            pas = PitcherAdvancedStats(
-                p.get('id'),
-                start=(dt - timedelta(days=30)).date(),
-                end=dt.date()
-            )
-            pas.analyze()
-            stats['recent_f1_era'] = pas.f1_era()
-            stats['recent_f1_whip'] = pas.f1_whip()
             all_pitchers.append(p)
 
+    # First-inning ERA/WHIP over the last 30 days for the whole slate in one store query
+    # (fetch_game_details has already added every recent appearance to the store)
+    f1_form = get_pitcher_game_store().rolling(
+        [p['id'] for p in all_pitchers], as_of=dt.date() + timedelta(days=1), days=31)
+    for p in all_pitchers:
+        for stat in ('f1_era', 'f1_whip'):
+            val = f1_form[stat].get(p['id'], float('nan'))
+            p['stats'][f'recent_{stat}'] = f"{val:.2f}" if pd.notna(val) else 'NA'
+
     # Write CSV of combined stats
     csv_path = raw_data_dir / \
         f"mlb_combined_stats_{date_str.replace('-', '')}.csv"
@@ -279,13 +258,14 @@ if __name__ == '__main__':
     logging.info(f"Saved CSV to {csv_path}")
 
     game_summary = []
+    feature_vectors = []
     for g in games:
         away = g['teams']['away']
         home = g['teams']['home']
         away_team = g["teams"]["away"]["team"]["name"]
         home_team = g["teams"]["home"]["team"]["name"]
-        away_abbrev = TEAM_CODES.get(g["teams"]["away"]["team"]["id"], "")
-        home_abbrev = TEAM_CODES.get(g["teams"]["home"]["team"]["id"], "")
+        away_abbrev = TEAM_REGISTRY.abbrev(g["teams"]["away"]["team"]["id"], "")
+        home_abbrev = TEAM_REGISTRY.abbrev(g["teams"]["home"]["team"]["id"], "")
         away_pitch = g["teams"]["away"].get(
             "probablePitcher", {}).get("fullName", "")
         home_pitch = g["teams"]["home"].get(
@@ -302,54 +282,34 @@ if __name__ == '__main__':
             "name") == away_pitch and p.get("side") == "away"), {})
 
         # Lookup opponent wOBA using team abbrev
-        opp_woba_home = woba_split.get(away_abbrev.capitalize(), "NA")
-        opp_woba_away = woba_split.get(home_abbrev.capitalize(), "NA")
-
-        # Lookup wRC+ 1st inning by full team name
-        TEAM_ABBREV_MAP = {
-            "AZ": "ARI", "SF": "SFG", "KC": "KCR", "TB": "TBR", "NY": "NYY",
-            "SD": "SDP", "CWS": "CHW", "WSH": "WSN", "CHC": "CHC", "OAK": "OAK",
-            "LAA": "LAA", "LAD": "LAD", "MIA": "MIA", "BOS": "BOS", "PHI": "PHI",
-            "PIT": "PIT", "CLE": "CLE", "CIN": "CIN", "SEA": "SEA", "BAL": "BAL",
-            "TEX": "TEX", "TOR": "TOR", "MIN": "MIN", "HOU": "HOU", "DET": "DET",
-            "ATL": "ATL", "STL": "STL", "NYM": "NYM", "NYY": "NYY", "SFG": "SFG"
-        }
-        print("Looking up home:", home_abbrev, "→", wrclike_map.get(home_abbrev))
-        print("Looking up away:", away_abbrev, "→", wrclike_map.get(away_abbrev))
-        home_wrclike = wrclike_map.get(TEAM_ABBREV_MAP.get(
-            home_abbrev.upper(), home_abbrev.upper()), "NA")
-        away_wrclike = wrclike_map.get(TEAM_ABBREV_MAP.get(
-            away_abbrev.upper(), away_abbrev.upper()), "NA")
+        opp_woba_home = woba_split.get(away_abbrev, "NA")
+        opp_woba_away = woba_split.get(home_abbrev, "NA")
+
+        # Lookup wRC+ 1st inning by canonical team key
+        home_wrclike = wrclike_map.get(home_abbrev, "NA")
+        away_wrclike = wrclike_map.get(away_abbrev, "NA")
 
         # compute team-level RFI scores
         # away team features
-        away_nrfi_features_vals = {
-            "xFIP": away_stats.get('recent_xfip', 'NA'),
-            "BarrelPct": away_stats.get('recent_barrel_pct', 'NA'),
-            "f1_era": away_stats.get('f1_era', 'NA'),
-            "WHIP": away_stats.get('f1_whip', 'NA'),
-            "wRCp1st": away_wrclike,
-            "wOBA3": opp_woba_away
-        }
+        away_nrfi_features_vals = nrfi_feature_values(away_stats, away_wrclike, opp_woba_away)
         _away_nrfi_score_resp = calculate_nrfi_score(
             away_nrfi_features_vals, features_def)
         away_nrfi_score = _away_nrfi_score_resp[0] if isinstance(
             _away_nrfi_score_resp, tuple) else _away_nrfi_score_resp
 
         # home team features
-        home_nrfi_features_vals = {
-            "xFIP": home_stats.get('recent_xfip', 'NA'),
-            "BarrelPct": home_stats.get('recent_barrel_pct', 'NA'),
-            "f1_era": home_stats.get('f1_era', 'NA'),
-            "WHIP": home_stats.get('f1_whip', 'NA'),
-            "wRCp1st": home_wrclike,
-            "wOBA3": opp_woba_home,
-        }
+        home_nrfi_features_vals = nrfi_feature_values(home_stats, home_wrclike, opp_woba_home)
         _home_nrfi_score_resp = calculate_nrfi_score(
             home_nrfi_features_vals, features_def)
         home_nrfi_score = _home_nrfi_score_resp[0] if isinstance(
             _home_nrfi_score_resp, tuple) else _home_nrfi_score_resp
 
+        feature_vectors.append((g['gamePk'], 'away', away_nrfi_features_vals))
+        feature_vectors.append((g['gamePk'], 'home', home_nrfi_features_vals))
+
+        away_lineup = lineups.get((g['gamePk'], 'away'), {})
+        home_lineup = lineups.get((g['gamePk'], 'home'), {})
+
         # game-level average
         game_nrfi_score = round((away_nrfi_score + home_nrfi_score) / 2, 2)
 
@@ -379,11 +339,21 @@ if __name__ == '__main__':
             "away_team_woba3": opp_woba_away,
             "home_team_wrc_plus_1st_inn": home_wrclike,
             "away_team_wrc_plus_1st_inn": away_wrclike,
+            "away_top3_season_ops": away_lineup.get("top3_season_ops", "NA"),
+            "away_top3_recent_ops": away_lineup.get("top3_recent_ops", "NA"),
+            "home_top3_season_ops": home_lineup.get("top3_season_ops", "NA"),
+            "home_top3_recent_ops": home_lineup.get("top3_recent_ops", "NA"),
             'away_team_score': away_nrfi_score,
             'home_team_score': home_nrfi_score,
             'game_nrfi_score': game_nrfi_score
         })
 
+    # Persist the exact feature vectors behind each score for training/backtests
+    try:
+        FeatureStore(feature_names=list(features_def)).write(feature_vectors)
+    except Exception as e:
+        logging.error(f"❌ Failed to write feature vectors: {e}")
+
     # Write game summary CSV/JSON
     summary_csv = raw_data_dir / f"mlb_daily_game_summary_{date_str.replace('-','')}.csv"
     pd.DataFrame(game_summary).to_csv(summary_csv, index=False)
@@ -392,6 +362,9 @@ if __name__ == '__main__':
     with open(summary_json, 'w', encoding='utf-8') as gj:
         json.dump(game_summary, gj, indent=2)
     logging.info(f"Saved summary JSON to {summary_json}")
+    catalog.ensure_backfilled(
+        DAILY_GAME_SUMMARY, raw_data_dir, "mlb_daily_game_summary_????????.json")
+    catalog.register(DAILY_GAME_SUMMARY, summary_json, dt.date(), season=SEASON)
 
     # --- Post-processing: augment, calibrate, build websheet ---
     import subprocess
@@ -418,23 +391,23 @@ if __name__ == '__main__':
         raise
 
     # --- Notifications ---
-    webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
-    if not webhook_url:
+    # Queued to the durable outbox and delivered by a detached dispatcher, so
+    # a slow or failing webhook never holds up the run.
+    if not os.getenv("DISCORD_WEBHOOK_URL"):
         logging.warning("DISCORD_WEBHOOK_URL not set in environment variables, skipping Discord notification")
-        webhook_url = None
     msg = f"MLB RFI pipeline finished for {date_str}. Games: {len(games)}. Summary: {summary_json.name}"
     try:
-        if webhook_url:
-            send_discord_webhook(msg, webhook_url)
+        if os.getenv("DISCORD_WEBHOOK_URL"):
+            outbox = get_outbox()
+            outbox.enqueue(msg)
             # Send index.html as a file attachment
             html_path = Path("index.html")
             if html_path.exists():
-                send_discord_webhook("MLB RFI index.html attached", webhook_url, file_path=str(html_path), file_label="index.html")
+                outbox.enqueue("MLB RFI index.html attached", file_path=html_path, file_label="index.html")
             else:
                 logging.warning("index.html not found, not sending to Discord webhook.")
-        else:
-            logging.info("Discord webhook URL not configured, skipping notification")
-        
+            spawn_dispatcher()
+
         # --- SMS notification (placeholder) ---
         def send_sms_notification(message, phone_number):
             # TODO: Integrate with Twilio or other SMS provider
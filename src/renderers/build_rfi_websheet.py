@@ -5,10 +5,10 @@ import json
 from shutil import copyfile
 from pathlib import Path
 from datetime import datetime as _dt
-from zoneinfo import ZoneInfo
 
-from pyparsing import col
 from utils.config_loader import load_config
+from utils.artifact_catalog import get_catalog, CALIBRATED_GAME_SUMMARY, RFI_WEBSHEET
+from renderers.rfi_display import prepare_display
 
 cfg = load_config()
 # 🛠️ Ensure the logging directory exists BEFORE using the config
@@ -30,6 +30,14 @@ JSON_FILENAME = cfg.get(
     # "json_filename", "mlb_daily_game_summary_20250703.json"
 )
 JSON_PATH = RAW_DATA_PATH / JSON_FILENAME
+# Unless a filename is pinned in config, take today's calibrated summary from the catalog
+catalog = get_catalog()
+if "json_filename" not in cfg:
+    catalog.ensure_backfilled(
+        CALIBRATED_GAME_SUMMARY, RAW_DATA_PATH, "mlb_daily_game_summary_????????_augmented.json")
+    calibrated_rec = catalog.resolve(CALIBRATED_GAME_SUMMARY, date_str, max_age_days=0)
+    if calibrated_rec is not None:
+        JSON_PATH = catalog.path_of(calibrated_rec)
 RFI_SHEET_HTML_FILENAME = cfg.get(
     # "html_filename", f"mlb_mlh_rfi_websheet_{JSON_PATH.stem.split('_')[-1]}.html"
     "html_filename", f"mlb_mlh_rfi_websheet_{date_str}.html"
@@ -50,46 +58,6 @@ logging.info(f"RFI SHEET filepath: {RFI_SHEET_HTML_FILENAME}")
 logging.info(f"INDEX HTML filepath: {RFI_SHEET_HTML_FILENAME}")
 logging.info(f"Title date: {title_date}")
 
-# Grading thresholds: (minimum pct, letter, icon+action)
-GRADE_THRESHOLDS = [
-    (98, 'A+', '✅ Elite NRFI Spot – Fire 3 Units'),
-    (94, 'A',  '✅ Strong NRFI Play – Confident 2–3 Units'),
-    (90, 'A-', '✅ Lean NRFI – 1–2 Unit Edge'),
-    (85, 'B+', '✅ Above-Average NRFI – Optional Lean'),
-    (80, 'B',  '⚠️ Slight Edge NRFI – Watchlist Only'),
-    (75, 'B-', '⚠️ Marginal NRFI – No Bet'),
-    (70, 'C+', '🚫 Toss-Up Zone – True 50/50, Avoid'),
-    (65, 'C',  '❌ Lean YRFI – Minor Offense/Contact Risk'),
-    (60, 'C-', '❌ Moderate YRFI Threat – Avoid NRFI'),
-]
-
-
-def assign_grade(pct):
-    """Return letter grade and icon/action for a probability pct (0–100 scale)."""
-    for thresh, letter, action in GRADE_THRESHOLDS:
-        if pct >= thresh:
-            return letter, action
-    return 'F', '❌ No Data'
-
-
-def grade_color(letter):
-    """Return Tailwind CSS classes for a letter grade."""
-    mapping = {
-        'A+': 'bg-green-700 text-white',
-        'A':  'bg-green-600 text-white',
-        'A-': 'bg-green-500 text-white',
-        'B+': 'bg-yellow-500 text-black',
-        'B':  'bg-yellow-400 text-black',
-        'B-': 'bg-yellow-300 text-black',
-        'C+': 'bg-orange-500 text-black',
-        'C':  'bg-orange-400 text-black',
-        'C-': 'bg-red-300 text-black',
-        'D+': 'bg-red-400 text-white',
-        'D':  'bg-red-500 text-white',
-        'D-': 'bg-red-600 text-white',
-        'F':  'bg-red-700 text-white',
-    }
-    return mapping.get(letter, '')
 
 # Letter grade helper
 
@@ -134,21 +102,31 @@ icon_map = {
     'F': '❌'
 }
 
-# American odds converter
-
-
-def p_to_american(p: float) -> str:
-    try:
-        if p <= 0 or p >= 1:
-            return 'N/A'
-        if p >= 0.5:
-            odds = -round(p / (1 - p) * 100)
-        else:
-            odds = round((1 - p) / p * 100)
-        sign = '+' if odds > 0 else ''
-        return f"{sign}{odds}"
-    except:
-        return 'N/A'
+# Two table rows per game (away on top, home below); fields come from prepare_display
+GAME_ROWS_TEMPLATE = (
+    "<tr>"
+    "<td class='px-4 py-2 bg-gray-700' rowspan='2'>{away_team_abbrev} @{home_team_abbrev}</td>"
+    "<td class='px-4 py-2 bg-gray-700' rowspan='2'>{start_time}</td>"
+    "<td class='px-4 py-2 bg-gray-700'>{away_pitcher} ({away_team_abbrev})</td>"
+    "<td class='px-4 py-2 bg-gray-700'>{away_pitcher_recent_xfip}</td>"
+    "<td class='px-4 py-2 bg-gray-700'>{away_pitcher_recent_xfip_score}</td>"
+    "<td class='px-4 py-2 bg-gray-700'>{away_pitcher_recent_barrel_pct}%</td>"
+    "<td class='px-4 py-2 bg-gray-700'>{away_team_woba3}</td>"
+    "<td class='px-4 py-2 bg-gray-700'>{away_team_wrc_plus_1st_inn}</td>"
+    "<td class='px-4 py-2 bg-gray-700'>{away_team_score}</td>"
+    "<td class='{grade_color}' rowspan='2'>{nrfi_pct} %</td>"
+    "<td class='{grade_color}' rowspan='2'>{american_odds}</td>"
+    "</tr>\n"
+    "<tr>"
+    "<td class='px-4 py-2 bg-gray-800'>{home_pitcher} ({home_team_abbrev})</td>"
+    "<td class='px-4 py-2 bg-gray-800'>{home_pitcher_recent_xfip}</td>"
+    "<td class='px-4 py-2 bg-gray-800'>{home_pitcher_recent_xfip_score}</td>"
+    "<td class='px-4 py-2 bg-gray-800'>{home_pitcher_recent_barrel_pct}%</td>"
+    "<td class='px-4 py-2 bg-gray-800'>{home_team_woba3}</td>"
+    "<td class='px-4 py-2 bg-gray-800'>{home_team_wrc_plus_1st_inn}</td>"
+    "<td class='px-4 py-2 bg-gray-800'>{home_team_score}</td>"
+    "</tr>\n"
+)
 
 
 class BaseballRfiHtmlGenerator:
@@ -267,144 +245,10 @@ class BaseballRfiHtmlGenerator:
       </thead>
       <tbody>
 """
-        # Render each game summary
-        for game in games:
-            logging.debug(f"Processing record: {game}")
-            # Extract and parse time; JSON uses 'game_datetime' key
-            iso = game.get('game_datetime') or game.get('gameDate')
-            if iso:
-                try:
-                    # 1) turn the trailing “Z” into an explicit UTC offset
-                    if iso.endswith('Z'):
-                        utc_dt = _dt.fromisoformat(iso.replace('Z', '+00:00'))
-                    else:
-                        utc_dt = _dt.fromisoformat(iso)
-                    # 2) convert to Eastern Time
-                    et_dt = utc_dt.astimezone(ZoneInfo('America/New_York'))
-                    # 3) format as h:mm AM/PM ET
-                    game_time = et_dt.strftime(
-                        '%I:%M %p ET').lstrip('0').replace(' 0', ' ')
-                except Exception as e:
-                    logging.error(f"Error parsing timestamp '{iso}': {e}")
-                    game_time = 'TBD'
-
-            else:
-                logging.warning(
-                    f"Missing timestamp for game_id {game.get('game_id')}")
-                game_time = 'TBD'
-
-            away_team = game.get('away_team', 'N/A')
-            home_team = game.get('home_team', 'N/A')
-            away_abbrev = game.get('away_team_abbrev', 'N/A')
-            home_abbrev = game.get('home_team_abbrev', 'N/A')
-            away_pitcher = game.get('away_pitcher', 'N/A')
-            home_pitcher = game.get('home_pitcher', 'N/A')
-
-            # xFIP
-            # Round pitcher xFIP to two decimal places if numeric, else fallback
-            raw_away_xfip = game.get('away_pitcher_recent_xfip')
-            away_pitcher_recent_xfip = f"{raw_away_xfip:.2f}" if isinstance(
-                raw_away_xfip, (int, float)) else 'N/A'
-            raw_home_xfip = game.get('home_pitcher_recent_xfip')
-            home_pitcher_recent_xfip = f"{raw_home_xfip:.2f}" if isinstance(
-                raw_home_xfip, (int, float)) else 'N/A'
-
-            # xFIP Score
-            raw_away_xfip_score = game.get('away_pitcher_recent_xfip_score')
-            away_pitcher_recent_xfip_score = f"{raw_away_xfip_score:.2f}" if isinstance(
-                raw_away_xfip_score, (int, float)) else 'N/A'
-            raw_home_xfip_score = game.get('home_pitcher_recent_xfip_score')
-            home_pitcher_recent_xfip_score = f"{raw_home_xfip_score:.2f}" if isinstance(
-                raw_home_xfip_score, (int, float)) else 'N/A'
-
-            # Barrel %
-            raw_away_barrel_pct = game.get('away_pitcher_recent_barrel_pct')
-            away_pitcher_recent_barrel_pct = f"{raw_away_barrel_pct:.2f}" if isinstance(
-                raw_away_barrel_pct, (int, float)) else 'N/A'
-            raw_home_barrel_pct = game.get('home_pitcher_recent_barrel_pct')
-            home_pitcher_recent_barrel_pct = f"{raw_home_barrel_pct:.2f}" if isinstance(
-                raw_home_barrel_pct, (int, float)) else 'N/A'
-
-            # Barrel % Score
-            raw_away_barrel_pct_score = game.get(
-                'away_pitcher_recent_barrel_pct_score')
-            away_pitcher_recent_barrel_pct_score = f"{raw_away_barrel_pct_score:.2f}" if isinstance(
-                raw_away_barrel_pct_score, (int, float)) else 'N/A'
-            raw_home_barrel_pct_score = game.get(
-                'home_pitcher_recent_barrel_pct')
-            home_pitcher_recent_barrel_pct_score = f"{raw_home_barrel_pct_score:.2f}" if isinstance(
-                raw_home_barrel_pct_score, (int, float)) else 'N/A'
-
-            # wRC+ 1st Inning
-            raw_away_team_wrc_plus_1st_inn = game.get(
-                'away_team_wrc_plus_1st_inn')
-            away_team_season_wrc_plus_1st_inn = f"{raw_away_team_wrc_plus_1st_inn:.2f}" if isinstance(
-                raw_away_team_wrc_plus_1st_inn, (int, float)) else 'N/A'
-            raw_home_team_wrc_plus_1st_inn = game.get(
-                'home_team_wrc_plus_1st_inn')
-            home_team_season_wrc_plus_1st_inn = f"{raw_home_team_wrc_plus_1st_inn:.2f}" if isinstance(
-                raw_home_team_wrc_plus_1st_inn, (int, float)) else 'N/A'
-
-            # wOBA3
-            raw_away_team_woba3 = game.get('away_team_woba3')
-            away_team_recent_woba3 = f"{raw_away_team_woba3:.2f}" if isinstance(
-                raw_away_team_woba3, (int, float)) else 'N/A'
-            raw_home_team_woba3 = game.get('home_team_woba3')
-            home_team_recent_woba3 = f"{raw_home_team_woba3:.2f}" if isinstance(
-                raw_home_team_woba3, (int, float)) else 'N/A'
-
-            # Team RFI
-            raw_away_team_rfi_score = game.get('away_team_score')
-            away_team_nrfi_score = f"{raw_away_team_rfi_score:.2f}" if isinstance(
-                raw_away_team_rfi_score, (int, float)) else 'N/A'
-            raw_home_team_rfi_score = game.get('home_team_score')
-            home_team_nrfi_score = f"{raw_home_team_rfi_score:.2f}" if isinstance(
-                raw_home_team_rfi_score, (int, float)) else 'N/A'
-
-            raw_nrfi_score = game.get('calibrated_p_nrfi', 0.0)
-            nrfi_calibrated_pct = f"{raw_nrfi_score * 100:.2f}" if isinstance(
-                raw_nrfi_score, (int, float)) else 'N/A'
-            # rec = recommendation_from_grade(grade)
-            color_cls = grade_color(nrfi_calibrated_pct)
-            # in your row-building loop
-            # raw = game.get("calibrated_p_nrfi", 0)
-            # e.g. ("A+", "✅ Elite NRFI Spot …")
-            letter, action = assign_grade(raw_nrfi_score)
-            # rec = recommendation_from_grade(letter)    # map "A+" → "NRFI"
-            # icon = icon_map[letter]
-            american_odds = p_to_american(raw_nrfi_score)
-
-            # Away row (lighter gray on left 5 cols, lighter gray on RHS spans)
-            html += (
-                "<tr>"
-                f"<td class='px-4 py-2 bg-gray-700' rowspan='2'>{away_abbrev} @{home_abbrev}</td>"
-                f"<td class='px-4 py-2 bg-gray-700' rowspan='2'>{game_time}</td>"
-                f"<td class='px-4 py-2 bg-gray-700'>{away_pitcher} ({away_abbrev})</td>"
-                f"<td class='px-4 py-2 bg-gray-700'>{away_pitcher_recent_xfip}</td>"
-                f"<td class='px-4 py-2 bg-gray-700'>{away_pitcher_recent_xfip_score}</td>"
-                f"<td class='px-4 py-2 bg-gray-700'>{away_pitcher_recent_barrel_pct}%</td>"
-                # f"<td class='px-4 py-2 bg-gray-700'>{away_pitcher_recent_barrel_pct_score}</td>"
-                f"<td class='px-4 py-2 bg-gray-700'>{away_team_recent_woba3}</td>"
-                f"<td class='px-4 py-2 bg-gray-700'>{away_team_season_wrc_plus_1st_inn}</td>"
-                f"<td class='px-4 py-2 bg-gray-700'>{away_team_nrfi_score}</td>"
-                f"<td class='{color_cls}' rowspan='2'>{nrfi_calibrated_pct} %</td>"
-                f"<td class='{color_cls}' rowspan='2'>{american_odds}</td>"
-                "</tr>\n"
-            )
-
-            # Home row (darker gray on left 5 cols, lighter gray on RHS already spanned)
-            html += (
-                "<tr>"
-                f"<td class='px-4 py-2 bg-gray-800'>{home_pitcher} ({home_abbrev})</td>"
-                f"<td class='px-4 py-2 bg-gray-800'>{home_pitcher_recent_xfip}</td>"
-                f"<td class='px-4 py-2 bg-gray-800'>{home_pitcher_recent_xfip_score}</td>"
-                f"<td class='px-4 py-2 bg-gray-800'>{home_pitcher_recent_barrel_pct}%</td>"
-                # f"<td class='px-4 py-2 bg-gray-800'>{home_pitcher_recent_barrel_pct_score}</td>"
-                f"<td class='px-4 py-2 bg-gray-800'>{home_team_recent_woba3}</td>"
-                f"<td class='px-4 py-2 bg-gray-800'>{home_team_season_wrc_plus_1st_inn}</td>"
-                f"<td class='px-4 py-2 bg-gray-800'>{home_team_nrfi_score}</td>"
-                "</tr>\n"
-            )
+        # Derive every display column for the slate at once, then fill the row template
+        if games:
+            html += "".join(GAME_ROWS_TEMPLATE.format_map(row)
+                            for row in prepare_display(games).to_dict('records'))
 
         # Close HTML
         html += """      </tbody>
@@ -420,6 +264,7 @@ class BaseballRfiHtmlGenerator:
 if __name__ == '__main__':
     generator = BaseballRfiHtmlGenerator(JSON_PATH, RFI_SHEET_FILEPATH)
     generator.generate()
+    catalog.register(RFI_WEBSHEET, RFI_SHEET_FILEPATH, date_str)
 
     # After writing, copy to root as index.html
     root_index_path = Path(cfg["index_html_filepath"])
@@ -0,0 +1,112 @@
+"""
+Presentation prep for the NRFI websheet.
+
+prepare_display turns game summaries (one day's slate or a whole season
+archive) into a frame of display-ready strings in a handful of column
+operations: Eastern start times, pct-scale grades via searchsorted, fair
+American odds and grade colors. Rendering is then a plain template fill
+over the rows.
+"""
+from typing import Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.mlb.nrfi_grading import assign_grades
+
+DISPLAY_TZ = 'America/New_York'
+MISSING = 'N/A'
+
+# Tailwind CSS classes per letter grade
+GRADE_COLORS = {
+    'A+': 'bg-green-700 text-white',
+    'A':  'bg-green-600 text-white',
+    'A-': 'bg-green-500 text-white',
+    'B+': 'bg-yellow-500 text-black',
+    'B':  'bg-yellow-400 text-black',
+    'B-': 'bg-yellow-300 text-black',
+    'C+': 'bg-orange-500 text-black',
+    'C':  'bg-orange-400 text-black',
+    'C-': 'bg-red-300 text-black',
+    'D+': 'bg-red-400 text-white',
+    'D':  'bg-red-500 text-white',
+    'D-': 'bg-red-600 text-white',
+    'F':  'bg-red-700 text-white',
+}
+
+# Summary keys shown with two decimals (same name as display column)
+NUMERIC_FIELDS = tuple(
+    f'{side}_{key}'
+    for side in ('away', 'home')
+    for key in ('pitcher_recent_xfip', 'pitcher_recent_xfip_score', 'pitcher_recent_barrel_pct',
+                'pitcher_recent_barrel_pct_score', 'team_wrc_plus_1st_inn', 'team_woba3', 'team_score')
+)
+TEXT_FIELDS = ('game_id', 'away_team', 'home_team', 'away_team_abbrev', 'home_team_abbrev',
+               'away_pitcher', 'home_pitcher')
+
+
+def _numeric(df: pd.DataFrame, key: str) -> np.ndarray:
+    if key not in df:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[key], errors='coerce').to_numpy(dtype=float)
+
+
+def format_2dp(values) -> np.ndarray:
+    """'%.2f' strings for an array of floats; NaN becomes 'N/A'."""
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return np.array([], dtype=object)
+    return np.where(np.isnan(values), MISSING, np.char.mod('%.2f', values)).astype(object)
+
+
+def fair_american(p) -> np.ndarray:
+    """Fair American odds strings ('-150', '+120') for probabilities; 'N/A' outside (0, 1)."""
+    p = np.asarray(p, dtype=float)
+    valid = (p > 0) & (p < 1)
+    q = np.where(valid, p, 0.5)
+    odds = np.where(q >= 0.5, -np.round(q / (1 - q) * 100), np.round((1 - q) / q * 100)).astype(int)
+    signed = np.char.add(np.where(odds > 0, '+', ''), odds.astype(str))
+    return np.where(valid, signed, MISSING).astype(object)
+
+
+def eastern_start_times(iso_times: pd.Series) -> np.ndarray:
+    """'7:05 PM ET' strings from ISO timestamps ('Z' or offset); unparseable or missing -> 'TBD'."""
+    # One vectorized parse infers a single format from the first value, so first
+    # normalize every string to one shape: drop fractional seconds, 'Z' -> '+00:00'.
+    # (format='ISO8601' would do this but needs pandas >= 2.0.)
+    normalized = (pd.Series(iso_times).astype('string')
+                  .str.replace(r'\.\d+', '', regex=True)
+                  .str.replace(r'Z$', '+00:00', regex=True))
+    utc = pd.to_datetime(normalized, utc=True, errors='coerce')
+    local = utc.dt.tz_convert(DISPLAY_TZ).dt.strftime('%I:%M %p ET').str.lstrip('0')
+    return local.fillna('TBD').to_numpy(dtype=object)
+
+
+def prepare_display(games: Union[pd.DataFrame, Iterable[dict]]) -> pd.DataFrame:
+    """
+    One row per game with every websheet cell pre-formatted: start_time,
+    two-decimal metric strings, nrfi_pct, grade, action, grade_color and
+    american_odds. Grades are assigned on the 0–100 pct scale.
+    """
+    df = games if isinstance(games, pd.DataFrame) else pd.DataFrame(list(games))
+    out = pd.DataFrame(index=df.index)
+
+    for key in TEXT_FIELDS:
+        out[key] = df[key].fillna(MISSING) if key in df else MISSING
+
+    iso = df['game_datetime'] if 'game_datetime' in df else pd.Series(np.nan, index=df.index)
+    if 'gameDate' in df:
+        iso = iso.fillna(df['gameDate'])
+    out['start_time'] = eastern_start_times(iso)
+
+    for key in NUMERIC_FIELDS:
+        out[key] = format_2dp(_numeric(df, key))
+
+    p = _numeric(df, 'calibrated_p_nrfi')
+    letters, actions = assign_grades(p * 100)
+    out['nrfi_pct'] = format_2dp(p * 100)
+    out['grade'] = letters
+    out['action'] = actions
+    out['grade_color'] = pd.Series(letters, index=df.index).map(GRADE_COLORS).fillna('')
+    out['american_odds'] = fair_american(p)
+    return out
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+SQLite data lake for the MLB NRFI models.
+
+Grows the schema from mlb_sqlite_poc into the tables the pipeline actually
+produces and consumes:
+
+  games                    one row per game (canonical team keys)
+  probable_starters        (game_id, side) -> starter id/name and the recent form fed to the model
+  pitcher_game_lines       per-pitcher per-game counting stats (utils.mlb.pitcher_game_aggregates)
+  first_inning_outcomes    first-inning runs per game
+  team_splits              (as_of, team, metric, window) -> value, e.g. woba3 14d, wrc_plus_1st season
+  model_scores             (game_id, as_of) -> team and game NRFI scores
+  calibrated_probabilities (game_id, as_of) -> calibrated P(NRFI)
+  feature_vectors          (game_id, side, as_of, feature) -> value (utils.mlb.feature_store)
+
+The database runs in WAL mode and every loader writes with one batched
+`executemany` upsert per table inside a single transaction, so re-ingesting a
+file is idempotent. The path comes from mlb_data.data_lake_filepath.
+
+USAGE EXAMPLES:
+  # Create or migrate the schema
+  python -m src.sql.mlb_data_lake init
+
+  # Ingest all raw/interim/processed history (safe to re-run)
+  python -m src.sql.mlb_data_lake ingest
+
+  # Row counts per table
+  python -m src.sql.mlb_data_lake stats
+"""
+import argparse
+import csv
+import json
+import logging
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+
+from utils.config_loader import load_config
+from utils.mlb.team_registry import get_team_registry
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 3
+_DATE_RE = re.compile(r"(\d{4})(\d{2})(\d{2})")
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS games (
+        game_id         INTEGER PRIMARY KEY,
+        game_date       TEXT NOT NULL,
+        game_datetime   TEXT,
+        season          INTEGER NOT NULL,
+        away_team       TEXT NOT NULL,
+        home_team       TEXT NOT NULL,
+        away_team_name  TEXT,
+        home_team_name  TEXT
+    )""",
+    """
+    CREATE TABLE IF NOT EXISTS probable_starters (
+        game_id                 INTEGER NOT NULL REFERENCES games(game_id),
+        side                    TEXT NOT NULL CHECK (side IN ('away', 'home')),
+        pitcher_id              INTEGER,
+        pitcher_name            TEXT,
+        team                    TEXT,
+        recent_xfip             REAL,
+        recent_xfip_score       REAL,
+        recent_barrel_pct       REAL,
+        recent_barrel_pct_score REAL,
+        recent_f1_era           REAL,
+        recent_f1_whip          REAL,
+        PRIMARY KEY (game_id, side)
+    )""",
+    """
+    CREATE TABLE IF NOT EXISTS pitcher_game_lines (
+        pitcher_id  INTEGER NOT NULL,
+        game_pk     INTEGER NOT NULL,
+        game_date   TEXT NOT NULL,
+        outs INTEGER, k INTEGER, bb INTEGER, hbp INTEGER, hr INTEGER,
+        fb INTEGER, barrels INTEGER, batted INTEGER,
+        f1_outs INTEGER, f1_r INTEGER, f1_h INTEGER, f1_bb INTEGER,
+        PRIMARY KEY (pitcher_id, game_pk)
+    )""",
+    """
+    CREATE TABLE IF NOT EXISTS first_inning_outcomes (
+        game_id     INTEGER PRIMARY KEY REFERENCES games(game_id),
+        away_runs   INTEGER,
+        home_runs   INTEGER,
+        run_scored  INTEGER NOT NULL
+    )""",
+    """
+    CREATE TABLE IF NOT EXISTS team_splits (
+        as_of   TEXT NOT NULL,
+        team    TEXT NOT NULL,
+        metric  TEXT NOT NULL,
+        window  TEXT NOT NULL,
+        value   REAL,
+        PRIMARY KEY (as_of, team, metric, window)
+    )""",
+    """
+    CREATE TABLE IF NOT EXISTS model_scores (
+        game_id          INTEGER NOT NULL REFERENCES games(game_id),
+        as_of            TEXT NOT NULL,
+        away_team_score  REAL,
+        home_team_score  REAL,
+        game_nrfi_score  REAL,
+        nrfi_grade       TEXT,
+        PRIMARY KEY (game_id, as_of)
+    )""",
+    """
+    CREATE TABLE IF NOT EXISTS calibrated_probabilities (
+        game_id     INTEGER NOT NULL REFERENCES games(game_id),
+        as_of       TEXT NOT NULL,
+        p_nrfi      REAL NOT NULL,
+        PRIMARY KEY (game_id, as_of)
+    )""",
+    """
+    CREATE TABLE IF NOT EXISTS feature_vectors (
+        game_id     INTEGER NOT NULL,
+        side        TEXT NOT NULL CHECK (side IN ('away', 'home')),
+        as_of       TEXT NOT NULL,
+        feature     TEXT NOT NULL,
+        value       REAL,
+        PRIMARY KEY (game_id, side, as_of, feature)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_games_date ON games(game_date)",
+    "CREATE INDEX IF NOT EXISTS idx_games_season ON games(season, game_date)",
+    "CREATE INDEX IF NOT EXISTS idx_starters_pitcher ON probable_starters(pitcher_id)",
+    "CREATE INDEX IF NOT EXISTS idx_lines_date ON pitcher_game_lines(game_date)",
+    "CREATE INDEX IF NOT EXISTS idx_splits_team ON team_splits(team, metric, window, as_of)",
+    "CREATE INDEX IF NOT EXISTS idx_scores_as_of ON model_scores(as_of)",
+    "CREATE INDEX IF NOT EXISTS idx_features_as_of ON feature_vectors(as_of)",
+]
+
+PRIMARY_KEYS = {
+    "games": ("game_id",),
+    "probable_starters": ("game_id", "side"),
+    "pitcher_game_lines": ("pitcher_id", "game_pk"),
+    "first_inning_outcomes": ("game_id",),
+    "team_splits": ("as_of", "team", "metric", "window"),
+    "model_scores": ("game_id", "as_of"),
+    "calibrated_probabilities": ("game_id", "as_of"),
+    "feature_vectors": ("game_id", "side", "as_of", "feature"),
+}
+
+
+# ---------------------------------------------------------------------- connection
+def resolve_db_path(config: dict = None) -> Path:
+    """mlb_data.data_lake_filepath resolved against the project root; never inside src/."""
+    config = config or load_config()
+    root_path = Path(config.get("root_path", "."))
+    mlb_data = config.get("mlb_data", {})
+    db_path = mlb_data.get("data_lake_filepath") or mlb_data.get("data_lake_path")
+    if not db_path:
+        raise ValueError("'mlb_data.data_lake_filepath' must be set in config.yaml")
+    db_path = Path(db_path)
+    if not db_path.is_absolute():
+        db_path = (root_path / db_path).resolve()
+    if (root_path / "src").resolve() in db_path.parents:
+        raise ValueError(f"Database path {db_path} is inside a 'src' directory")
+    return db_path
+
+
+def connect(db_path=None) -> sqlite3.Connection:
+    """Open the data lake in WAL mode and make sure the schema is current."""
+    db_path = Path(db_path) if db_path else resolve_db_path()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    create_schema(conn)
+    return conn
+
+
+def create_schema(conn: sqlite3.Connection):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return
+    games_cols = {row[1] for row in conn.execute("PRAGMA table_info(games)")}
+    if "mlb_game_id" in games_cols:
+        # The proof-of-concept games table only ever held sample rows
+        logger.info("Replacing proof-of-concept games table with data lake schema")
+        conn.execute("DROP TABLE games")
+    with conn:
+        for stmt in SCHEMA:
+            conn.execute(stmt)
+        if 0 < version < 3:
+            # Version 2 stored each woba3 split under the wrong team; re-run `ingest` to reload them
+            removed = conn.execute("DELETE FROM team_splits WHERE metric = 'woba3'").rowcount
+            logger.warning("Dropped %d misattributed woba3 splits; re-run ingest to reload them", removed)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    logger.info("Data lake schema at version %d", SCHEMA_VERSION)
+
+
+def upsert(conn: sqlite3.Connection, table: str, rows: Sequence[Dict]) -> int:
+    """Batched INSERT ... ON CONFLICT DO UPDATE of dict rows (all rows share the first row's keys)."""
+    if not rows:
+        return 0
+    cols = list(rows[0].keys())
+    keys = PRIMARY_KEYS[table]
+    updates = ", ".join(f"{c} = excluded.{c}" for c in cols if c not in keys)
+    sql = (
+        f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) "
+        f"ON CONFLICT ({', '.join(keys)}) DO "
+        + (f"UPDATE SET {updates}" if updates else "NOTHING")
+    )
+    conn.executemany(sql, [tuple(r.get(c) for c in cols) for r in rows])
+    return len(rows)
+
+
+# ---------------------------------------------------------------------- parsing helpers
+def _as_of_from_name(path: Path) -> str:
+    m = _DATE_RE.search(path.name)
+    if not m:
+        raise ValueError(f"No YYYYMMDD date in {path.name}")
+    return "-".join(m.groups())
+
+
+def _num(value):
+    """Floats from JSON/CSV values that may be 'NA', '', None or numeric strings."""
+    try:
+        return float(value) if value not in (None, "", "NA") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def summary_rows(records: Iterable[dict], as_of: str) -> Dict[str, List[dict]]:
+    """Split daily game summary records (raw, augmented or calibrated) into per-table rows."""
+    teams = get_team_registry()
+    out = {table: [] for table in PRIMARY_KEYS}
+    for rec in records:
+        game_id = rec.get("game_id")
+        if game_id is None:
+            continue
+        away = teams.canonical(rec.get("away_team_abbrev") or rec.get("away_team"), rec.get("away_team_abbrev"))
+        home = teams.canonical(rec.get("home_team_abbrev") or rec.get("home_team"), rec.get("home_team_abbrev"))
+        out["games"].append({
+            # The slate date, not the UTC start time (late games roll over to the next day in UTC)
+            "game_id": game_id, "game_date": as_of, "game_datetime": rec.get("game_datetime"),
+            "season": int(as_of[:4]), "away_team": away, "home_team": home,
+            "away_team_name": rec.get("away_team"), "home_team_name": rec.get("home_team"),
+        })
+        for side, team in (("away", away), ("home", home)):
+            prefix = f"{side}_pitcher_recent_"
+            out["probable_starters"].append({
+                "game_id": game_id, "side": side, "pitcher_name": rec.get(f"{side}_pitcher"), "team": team,
+                "recent_xfip": _num(rec.get(prefix + "xfip")),
+                "recent_xfip_score": _num(rec.get(prefix + "xfip_score")),
+                "recent_barrel_pct": _num(rec.get(prefix + "barrel_pct")),
+                "recent_barrel_pct_score": _num(rec.get(prefix + "barrel_pct_score")),
+                "recent_f1_era": _num(rec.get(prefix + "f1_era")),
+                "recent_f1_whip": _num(rec.get(prefix + "f1_whip")),
+            })
+            # {side}_team_woba3 is the wOBA3 of the lineup that side's starter faces,
+            # i.e. the opposing team's own value; wRC+ belongs to the side's team
+            opponent = home if side == "away" else away
+            for metric, field, window, owner in (("woba3", "team_woba3", "14d", opponent),
+                                                 ("wrc_plus_1st", "team_wrc_plus_1st_inn", "season", team)):
+                value = _num(rec.get(f"{side}_{field}"))
+                if owner and value is not None:
+                    out["team_splits"].append(
+                        {"as_of": as_of, "team": owner, "metric": metric, "window": window, "value": value})
+        if rec.get("game_nrfi_score") is not None:
+            out["model_scores"].append({
+                "game_id": game_id, "as_of": as_of,
+                "away_team_score": _num(rec.get("away_team_score")),
+                "home_team_score": _num(rec.get("home_team_score")),
+                "game_nrfi_score": _num(rec.get("game_nrfi_score")),
+                "nrfi_grade": rec.get("nrfi_grade"),
+            })
+        if "first_inning_run" in rec and rec["first_inning_run"] is not None:
+            out["first_inning_outcomes"].append({
+                "game_id": game_id,
+                "away_runs": rec.get("first_inning_away_runs"),
+                "home_runs": rec.get("first_inning_home_runs"),
+                "run_scored": int(bool(rec["first_inning_run"])),
+            })
+        if _num(rec.get("calibrated_p_nrfi")) is not None:
+            out["calibrated_probabilities"].append(
+                {"game_id": game_id, "as_of": as_of, "p_nrfi": _num(rec["calibrated_p_nrfi"])})
+    return out
+
+
+# ---------------------------------------------------------------------- loaders
+def _write(conn: sqlite3.Connection, rows_by_table: Dict[str, List[dict]]) -> Dict[str, int]:
+    """All tables in one transaction; games first so foreign keys resolve."""
+    counts = {}
+    with conn:
+        for table in PRIMARY_KEYS:
+            counts[table] = upsert(conn, table, rows_by_table.get(table, []))
+    return counts
+
+
+def load_game_summaries(conn: sqlite3.Connection, paths: Iterable[Path]) -> Dict[str, int]:
+    """Ingest daily game summary JSON files; the as-of date is taken from each filename."""
+    merged = {table: [] for table in PRIMARY_KEYS}
+    for path in sorted(paths):
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        for table, rows in summary_rows(records, _as_of_from_name(path)).items():
+            merged[table].extend(rows)
+    counts = _write(conn, merged)
+    logger.info("Loaded game summaries: %s", counts)
+    return counts
+
+
+def load_combined_stats(conn: sqlite3.Connection, paths: Iterable[Path]) -> int:
+    """Attach starter ids from mlb_combined_stats_YYYYMMDD.csv to probable_starters."""
+    rows = []
+    for path in sorted(paths):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                if row.get("side") in ("away", "home") and str(row.get("id", "")).isdigit():
+                    rows.append((int(row["id"]), row.get("name"), int(row["game_id"]), row["side"]))
+    with conn:
+        conn.executemany(
+            "UPDATE probable_starters SET pitcher_id = ?, pitcher_name = COALESCE(pitcher_name, ?) "
+            "WHERE game_id = ? AND side = ?", rows)
+    logger.info("Attached %d starter ids from combined stats", len(rows))
+    return len(rows)
+
+
+def load_fangraphs_splits(conn: sqlite3.Connection, paths: Iterable[Path]) -> int:
+    """Team first-inning wRC+ from FanGraphs splits_1st_inning_{season}_{date}.csv files."""
+    teams = get_team_registry()
+    rows = []
+    for path in sorted(paths):
+        as_of = _as_of_from_name(path)
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                team = teams.canonical(row.get("Tm"))
+                value = _num(row.get("wRC+"))
+                if team and value is not None:
+                    rows.append({"as_of": as_of, "team": team, "metric": "wrc_plus_1st",
+                                 "window": "season", "value": value})
+    with conn:
+        upsert(conn, "team_splits", rows)
+    logger.info("Loaded %d FanGraphs split rows", len(rows))
+    return len(rows)
+
+
+def load_pitcher_game_lines(conn: sqlite3.Connection, csv_path: Path) -> int:
+    if not Path(csv_path).exists():
+        return 0
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = [dict(row) for row in csv.DictReader(f)]
+    with conn:
+        upsert(conn, "pitcher_game_lines", rows)
+    logger.info("Loaded %d pitcher game lines", len(rows))
+    return len(rows)
+
+
+def ingest_history(conn: sqlite3.Connection, config: dict = None) -> Dict[str, int]:
+    """Bulk-load every summary, combined-stats, FanGraphs splits and pitcher-lines file on disk."""
+    config = config or load_config()
+    root = Path(config.get("root_path", "."))
+    mlb = root / "data" / "baseball" / "mlb"
+    # Raw first, then augmented, then calibrated so later stages win on conflicts
+    summary_dirs = [mlb / "raw", mlb / "interim" / "game_summaries", mlb / "processed" / "game_summaries"]
+    counts = {}
+    for directory in summary_dirs:
+        for table, n in load_game_summaries(
+                conn, directory.rglob("mlb_daily_game_summary_*.json")).items():
+            counts[table] = counts.get(table, 0) + n
+    counts["starter_ids"] = load_combined_stats(conn, (mlb / "raw").rglob("mlb_combined_stats_*.csv"))
+    counts["fangraphs_splits"] = load_fangraphs_splits(
+        conn, (mlb / "raw" / "fangraphs").glob("splits_1st_inning_*_????????.csv"))
+    pitcher_csv = config.get("mlb_data", {}).get("statcast", {}).get("pitcher_games_csv")
+    if pitcher_csv:
+        counts["pitcher_game_lines"] = load_pitcher_game_lines(conn, root / pitcher_csv)
+    return counts
+
+
+def table_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in PRIMARY_KEYS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the MLB SQLite data lake.")
+    parser.add_argument("command", choices=["init", "ingest", "stats"])
+    parser.add_argument("--db", default=None, help="Override mlb_data.data_lake_filepath")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == "ingest":
+        print(json.dumps(ingest_history(conn), indent=2))
+    elif args.command == "stats":
+        for table, n in table_counts(conn).items():
+            print(f"{table:<26} {n:>7}")
+    else:
+        print(f"Data lake ready at {args.db or resolve_db_path()}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
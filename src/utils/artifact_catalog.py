@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Catalog of data artifacts produced by the pipeline.
+
+Each stage registers what it writes (type, season, as-of date, path, row count,
+checksum) and later stages resolve their inputs with an as-of index lookup
+instead of globbing directories and parsing filenames.
+
+The manifest is a single JSON file (mlb_data.artifact_catalog_path in
+config.yaml). Files that predate the catalog can be pulled in once with
+`backfill`, which is the only place that scans a directory.
+
+USAGE EXAMPLES:
+  # Register existing FanGraphs 1st-inning splits
+  python -m src.utils.artifact_catalog backfill fangraphs_splits_1st_inning data/baseball/mlb/raw/fangraphs "splits_1st_inning_*_????????.csv"
+
+  # Which splits file should a run for 2025-07-26 use?
+  python -m src.utils.artifact_catalog resolve fangraphs_splits_1st_inning 2025-07-26 --season 2025 --max-age-days 7
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.config_loader import load_config
+
+logger = logging.getLogger(__name__)
+
+# Artifact types produced by the MLB RFI pipeline
+FANGRAPHS_SPLITS_1ST_INNING = "fangraphs_splits_1st_inning"
+DAILY_GAME_SUMMARY = "daily_game_summary"
+AUGMENTED_GAME_SUMMARY = "augmented_game_summary"
+CALIBRATED_GAME_SUMMARY = "calibrated_game_summary"
+RFI_WEBSHEET = "rfi_websheet"
+
+DEFAULT_CATALOG_PATH = "data/baseball/mlb/artifact_catalog.json"
+_DATE_RE = re.compile(r"(\d{8})")
+LOCK_TIMEOUT = 30.0
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).replace("-", "")
+    return datetime.strptime(text, "%Y%m%d").date()
+
+
+def _count_rows(path: Path) -> Optional[int]:
+    """Rows in a CSV (excluding header) or records in a JSON list."""
+    try:
+        if path.suffix == ".csv":
+            with open(path, "rb") as f:
+                return max(sum(1 for _ in f) - 1, 0)
+        if path.suffix == ".json":
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return len(data) if isinstance(data, (list, dict)) else None
+    except Exception as e:
+        logger.warning("Could not count rows in %s: %s", path, e)
+    return None
+
+
+def file_checksum(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass
+class ArtifactRecord:
+    artifact_type: str
+    season: Optional[int]
+    as_of: str          # YYYY-MM-DD
+    path: str           # relative to the project root when possible
+    rows: Optional[int]
+    sha256: str
+    registered_at: str
+
+
+class ArtifactCatalog:
+    """
+    JSON-backed manifest with an in-memory (type, season) -> sorted as-of index.
+    """
+
+    def __init__(self, manifest_path, root_path=None):
+        self.manifest_path = Path(manifest_path)
+        self.root_path = Path(root_path) if root_path else self.manifest_path.parent
+        # (type, season) -> parallel lists of sorted as-of keys and records
+        self._keys: Dict[Tuple[str, Optional[int]], List[str]] = {}
+        self._recs: Dict[Tuple[str, Optional[int]], List[ArtifactRecord]] = {}
+        # Records registered by this process; save() merges only these into the file
+        self._pending: Dict[Tuple[str, Optional[int], str], ArtifactRecord] = {}
+        self._load()
+
+    # ------------------------------------------------------------------ storage
+    def _read_manifest(self) -> List[ArtifactRecord]:
+        if not self.manifest_path.exists():
+            return []
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [ArtifactRecord(**rec) for rec in data.get("artifacts", [])]
+
+    def _load(self):
+        if not self.manifest_path.exists():
+            logger.debug("No artifact catalog at %s yet", self.manifest_path)
+            return
+        for rec in self._read_manifest():
+            self._insert(rec)
+        logger.debug("Loaded %d artifacts from %s", len(self), self.manifest_path)
+
+    def _lock(self) -> Path:
+        """Exclusive lock file next to the manifest (stale locks are broken after LOCK_TIMEOUT)."""
+        lock = self.manifest_path.with_suffix(".lock")
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            try:
+                os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return lock
+            except FileExistsError:
+                if time.monotonic() > deadline:
+                    logger.warning("Breaking stale catalog lock %s", lock)
+                    lock.unlink(missing_ok=True)
+                    deadline = time.monotonic() + LOCK_TIMEOUT
+                time.sleep(0.05)
+
+    def save(self):
+        """
+        Merge this process's registrations into the manifest on disk under a lock,
+        so concurrent pipeline stages never drop each other's records.
+        """
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        lock = self._lock()
+        try:
+            self._keys, self._recs = {}, {}
+            for rec in self._read_manifest():
+                self._insert(rec)
+            for rec in self._pending.values():
+                self._insert(rec)
+            payload = {
+                "generated_at": datetime.now().isoformat(),
+                "artifacts": [asdict(rec) for rec in self.records()],
+            }
+            # Write-then-rename so a crashed run never leaves a torn manifest
+            tmp_path = self.manifest_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+            self._pending = {}
+        finally:
+            lock.unlink(missing_ok=True)
+
+    def _insert(self, rec: ArtifactRecord):
+        group = (rec.artifact_type, rec.season)
+        keys = self._keys.setdefault(group, [])
+        recs = self._recs.setdefault(group, [])
+        pos = bisect.bisect_left(keys, rec.as_of)
+        if pos < len(keys) and keys[pos] == rec.as_of:
+            recs[pos] = rec  # re-registration replaces
+        else:
+            keys.insert(pos, rec.as_of)
+            recs.insert(pos, rec)
+
+    def _relative(self, path: Path) -> str:
+        path = Path(path).resolve()
+        try:
+            return path.relative_to(self.root_path.resolve()).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def path_of(self, rec: ArtifactRecord) -> Path:
+        path = Path(rec.path)
+        return path if path.is_absolute() else self.root_path / path
+
+    # ------------------------------------------------------------------ writes
+    def register(self, artifact_type: str, path, as_of, season: int = None,
+                 rows: int = None, save: bool = True) -> ArtifactRecord:
+        """Record an artifact that was just written. Replaces any entry for the same as-of date."""
+        path = Path(path)
+        as_of = _as_date(as_of)
+        rec = ArtifactRecord(
+            artifact_type=artifact_type,
+            season=season if season is not None else as_of.year,
+            as_of=as_of.isoformat(),
+            path=self._relative(path),
+            rows=rows if rows is not None else _count_rows(path),
+            sha256=file_checksum(path),
+            registered_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        self._insert(rec)
+        self._pending[(rec.artifact_type, rec.season, rec.as_of)] = rec
+        if save:
+            self.save()
+        logger.info("Cataloged %s %s -> %s (%s rows)",
+                    artifact_type, rec.as_of, rec.path, rec.rows)
+        return rec
+
+    def backfill(self, artifact_type: str, directory, pattern: str, season: int = None) -> int:
+        """
+        One-time import of files written before the catalog existed. The as-of date is
+        the first YYYYMMDD in the filename; files without one are skipped.
+        """
+        count = 0
+        for path in sorted(Path(directory).glob(pattern)):
+            m = _DATE_RE.search(path.name)
+            if not m:
+                continue
+            as_of = _as_date(m.group(1))
+            if season is not None and as_of.year != int(season):
+                continue
+            self.register(artifact_type, path, as_of, season=season, save=False)
+            count += 1
+        if count:
+            self.save()
+        logger.info("Backfilled %d %s artifacts from %s", count, artifact_type, directory)
+        return count
+
+    def ensure_backfilled(self, artifact_type: str, directory, pattern: str,
+                          season: int = None) -> int:
+        """
+        Backfill a directory once: only while the catalog has no record of this type
+        in it. After that, stages keep the catalog current with register() and no
+        directory is scanned. Dates already cataloged from another directory are
+        left alone (with a warning); use `backfill` to repoint them.
+        """
+        rel_dir = self._relative(Path(directory))
+        if any(Path(rec.path).parent.as_posix() == rel_dir
+               for rec in self.records() if rec.artifact_type == artifact_type):
+            return 0
+        count = 0
+        for path in sorted(Path(directory).glob(pattern)):
+            m = _DATE_RE.search(path.name)
+            if not m:
+                continue
+            as_of = _as_date(m.group(1))
+            if season is not None and as_of.year != int(season):
+                continue
+            existing = self.resolve(artifact_type, as_of, season=season if season is not None else as_of.year,
+                                    max_age_days=0)
+            if existing is not None:
+                logger.warning("Not cataloging %s: %s %s is already cataloged as %s",
+                               path, artifact_type, existing.as_of, existing.path)
+                continue
+            self.register(artifact_type, path, as_of, season=season, save=False)
+            count += 1
+        if count:
+            self.save()
+            logger.info("Cataloged %d untracked %s artifacts from %s", count, artifact_type, directory)
+        return count
+
+    def in_directory(self, records: List[ArtifactRecord], directory) -> List[ArtifactRecord]:
+        """The records whose file is in directory; warns about the dates cataloged elsewhere."""
+        rel_dir = self._relative(Path(directory))
+        inside = [rec for rec in records if Path(rec.path).parent.as_posix() == rel_dir]
+        for rec in records:
+            if Path(rec.path).parent.as_posix() != rel_dir:
+                logger.warning("Skipping %s %s: cataloged file %s is not in %s",
+                               rec.artifact_type, rec.as_of, rec.path, directory)
+        return inside
+
+    # ------------------------------------------------------------------ reads
+    def has(self, artifact_type: str) -> bool:
+        return any(t == artifact_type and keys for (t, _), keys in self._keys.items())
+
+    def _group(self, artifact_type: str, season: Optional[int]):
+        if season is not None:
+            group = (artifact_type, int(season))
+            return self._keys.get(group, []), self._recs.get(group, [])
+        merged = sorted(
+            (rec for (t, _), recs in self._recs.items() if t == artifact_type for rec in recs),
+            key=lambda r: r.as_of)
+        return [r.as_of for r in merged], merged
+
+    def resolve(self, artifact_type: str, as_of, season: int = None,
+                max_age_days: int = None) -> Optional[ArtifactRecord]:
+        """Newest artifact with as_of <= the given date, optionally no older than max_age_days."""
+        as_of = _as_date(as_of)
+        keys, recs = self._group(artifact_type, season)
+        pos = bisect.bisect_right(keys, as_of.isoformat())
+        if pos == 0:
+            return None
+        rec = recs[pos - 1]
+        if max_age_days is not None and (as_of - _as_date(rec.as_of)).days > max_age_days:
+            return None
+        return rec
+
+    def between(self, artifact_type: str, start=None, end=None,
+                season: int = None) -> List[ArtifactRecord]:
+        """All artifacts of a type with start <= as_of <= end (either bound optional)."""
+        keys, recs = self._group(artifact_type, season)
+        lo = bisect.bisect_left(keys, _as_date(start).isoformat()) if start else 0
+        hi = bisect.bisect_right(keys, _as_date(end).isoformat()) if end else len(keys)
+        return recs[lo:hi]
+
+    def records(self) -> List[ArtifactRecord]:
+        return [rec for recs in self._recs.values() for rec in recs]
+
+    def __len__(self):
+        return sum(len(recs) for recs in self._recs.values())
+
+
+@lru_cache(maxsize=None)
+def get_catalog(manifest_path: str = None) -> ArtifactCatalog:
+    """Process-wide catalog for the configured manifest path."""
+    cfg = load_config()
+    root_path = Path(cfg.get("root_path", "."))
+    if manifest_path is None:
+        manifest_path = cfg.get("mlb_data", {}).get(
+            "artifact_catalog_path", DEFAULT_CATALOG_PATH)
+    manifest_path = Path(manifest_path)
+    if not manifest_path.is_absolute():
+        manifest_path = root_path / manifest_path
+    return ArtifactCatalog(manifest_path, root_path=root_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or backfill the data artifact catalog.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_back = sub.add_parser("backfill", help="Register existing files matching a glob")
+    p_back.add_argument("artifact_type")
+    p_back.add_argument("directory")
+    p_back.add_argument("pattern")
+    p_back.add_argument("--season", type=int, default=None)
+
+    p_res = sub.add_parser("resolve", help="Show the artifact in effect on a date")
+    p_res.add_argument("artifact_type")
+    p_res.add_argument("as_of", help="YYYY-MM-DD or YYYYMMDD")
+    p_res.add_argument("--season", type=int, default=None)
+    p_res.add_argument("--max-age-days", type=int, default=None)
+
+    p_list = sub.add_parser("list", help="List cataloged artifacts")
+    p_list.add_argument("--type", dest="artifact_type", default=None)
+
+    args = parser.parse_args()
+    catalog = get_catalog()
+    if args.command == "backfill":
+        n = catalog.backfill(args.artifact_type, args.directory, args.pattern, season=args.season)
+        print(f"Registered {n} artifacts")
+    elif args.command == "resolve":
+        rec = catalog.resolve(args.artifact_type, args.as_of,
+                              season=args.season, max_age_days=args.max_age_days)
+        print(json.dumps(asdict(rec), indent=2) if rec else "No matching artifact")
+    else:
+        for rec in sorted(catalog.records(), key=lambda r: (r.artifact_type, r.as_of)):
+            if args.artifact_type and rec.artifact_type != args.artifact_type:
+                continue
+            print(f"{rec.artifact_type:<28} {rec.as_of} {rec.rows!s:>5}  {rec.path}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
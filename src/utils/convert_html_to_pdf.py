@@ -1,9 +1,198 @@
-# convert_html_to_pdf.py
-from weasyprint import HTML
+#!/usr/bin/env python3
+"""
+Batch HTML -> PDF export for RFI websheets.
 
-# read from a file on disk
-HTML(filename="index.html").write_pdf("mlh_rfi_20250718.pdf")
+Websheets are taken from explicit paths or from the artifact catalog for a
+date range. Conversions run in a process pool; each worker builds its
+WeasyPrint font configuration, extra stylesheets and a caching URL fetcher
+once, so the Tailwind CSS and logos referenced by every page are fetched and
+parsed once per worker instead of once per document.
 
-# — or — convert from an HTML string:
-# html_string = "<h1>Hello PDF</h1><p>This is a PDF!</p>"
-# HTML(string=html_string).write_pdf("output.pdf")
+A JSON manifest in the output directory records the sha256 of each HTML
+source; documents whose HTML is unchanged (and whose PDF still exists) are
+skipped. PDFs are named after the HTML file; a source whose name is already
+taken by a different source gets a short hash of its path appended, and the
+manifest keeps that name stable across runs.
+
+USAGE EXAMPLES:
+  # Export one websheet
+  python -m src.utils.convert_html_to_pdf index.html
+
+  # Export every cataloged websheet of August 2025 on 4 workers
+  python -m src.utils.convert_html_to_pdf --start 2025-08-01 --end 2025-08-31 --workers 4
+
+  # Re-render everything, ignoring the checksum manifest
+  python -m src.utils.convert_html_to_pdf --start 2025-03-27 --force
+"""
+import argparse
+import hashlib
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from utils.artifact_catalog import RFI_WEBSHEET, file_checksum, get_catalog
+from utils.config_loader import load_config
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "pdf_manifest.json"
+
+# Per-worker renderer state, filled by _init_worker
+_RENDERER: Dict = {}
+
+
+def _init_worker(css_paths: Sequence[str] = ()):
+    """Build the font config, stylesheets and a memoizing URL fetcher once per process."""
+    from weasyprint import CSS, default_url_fetcher
+    from weasyprint.text.fonts import FontConfiguration
+
+    fetched: Dict[str, dict] = {}
+
+    def cached_fetcher(url, *args, **kwargs):
+        if url not in fetched:
+            result = default_url_fetcher(url, *args, **kwargs)
+            # Drain file objects so the cached result can be served repeatedly
+            if "file_obj" in result:
+                with result.pop("file_obj") as f:
+                    result["string"] = f.read()
+            fetched[url] = result
+        return dict(fetched[url])
+
+    fonts = FontConfiguration()
+    _RENDERER.update(
+        fonts=fonts,
+        fetcher=cached_fetcher,
+        stylesheets=[CSS(filename=p, font_config=fonts) for p in css_paths],
+    )
+
+
+def _render(job: Tuple[str, str]) -> Tuple[str, str, str]:
+    """Render one (html_path, pdf_path) job; returns (html_path, pdf_path, error or '')."""
+    from weasyprint import HTML
+
+    html_path, pdf_path = job
+    if not _RENDERER:
+        _init_worker()
+    try:
+        Path(pdf_path).parent.mkdir(parents=True, exist_ok=True)
+        HTML(filename=html_path, url_fetcher=_RENDERER["fetcher"]).write_pdf(
+            pdf_path, stylesheets=_RENDERER["stylesheets"], font_config=_RENDERER["fonts"])
+        return html_path, pdf_path, ""
+    except Exception as e:
+        return html_path, pdf_path, str(e)
+
+
+def _load_manifest(path: Path) -> Dict[str, dict]:
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable PDF manifest %s: %s", path, e)
+    return {}
+
+
+def _pdf_name(html: Path, key: str, claimed: Dict[str, str]) -> str:
+    """<stem>.pdf, or <stem>-<path hash>.pdf when another source already claims that name."""
+    name = f"{html.stem}.pdf"
+    if claimed.get(name, key) != key:
+        name = f"{html.stem}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]}.pdf"
+    claimed[name] = key
+    return name
+
+
+def plan_exports(html_paths: Iterable, out_dir, manifest: Dict[str, dict],
+                 force: bool = False) -> Tuple[List[Tuple[str, str]], Dict[str, str]]:
+    """
+    Split sources into render jobs and skips. Returns (jobs, checksums) where
+    jobs are (html_path, pdf_path) pairs whose HTML changed since the last
+    export (or whose PDF is missing) and checksums maps every source to its sha256.
+    """
+    out_dir = Path(out_dir)
+    # PDF names already owned by sources from earlier exports
+    claimed = {Path(rec["pdf"]).name: key for key, rec in manifest.items() if rec.get("pdf")}
+    jobs, checksums = [], {}
+    for html in html_paths:
+        html = Path(html)
+        if not html.exists():
+            logger.warning("Websheet not found: %s", html)
+            continue
+        key = str(html.resolve())
+        if key in checksums:
+            continue
+        checksums[key] = file_checksum(html)
+        prev = manifest.get(key)
+        pdf = out_dir / (Path(prev["pdf"]).name if prev and prev.get("pdf") else _pdf_name(html, key, claimed))
+        if not force and prev and prev.get("sha256") == checksums[key] and pdf.exists():
+            continue
+        jobs.append((key, str(pdf)))
+    return jobs, checksums
+
+
+def export_pdfs(html_paths: Iterable, out_dir, css_paths: Sequence[str] = (),
+                max_workers: int = 1, force: bool = False) -> Dict[str, int]:
+    """Convert websheets to PDFs in out_dir, skipping unchanged ones. Returns counts."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    manifest = _load_manifest(manifest_path)
+    jobs, checksums = plan_exports(html_paths, out_dir, manifest, force)
+    skipped = len(checksums) - len(jobs)
+    logger.info("PDF export: %d to render, %d unchanged", len(jobs), skipped)
+
+    if max_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(tuple(css_paths),)) as pool:
+            results = list(pool.map(_render, jobs, chunksize=max(1, len(jobs) // (4 * max_workers))))
+    else:
+        if jobs:
+            _init_worker(tuple(css_paths))
+        results = [_render(job) for job in jobs]
+
+    failed = 0
+    for html, pdf, error in results:
+        if error:
+            failed += 1
+            logger.error("Failed to render %s: %s", html, error)
+            continue
+        manifest[html] = {"sha256": checksums[html], "pdf": pdf}
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return {"rendered": len(results) - failed, "skipped": skipped, "failed": failed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export RFI websheets to PDF.")
+    parser.add_argument("html", nargs="*", help="Websheet HTML files")
+    parser.add_argument("--start", default=None, help="First cataloged websheet date (YYYY-MM-DD or YYYYMMDD)")
+    parser.add_argument("--end", default=None, help="Last cataloged websheet date")
+    parser.add_argument("--out-dir", default=None, help="PDF directory (default: mlb_data.websheet_pdf_dir)")
+    parser.add_argument("--css", nargs="*", default=[], help="Extra stylesheets applied to every page")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel renderer processes")
+    parser.add_argument("--force", action="store_true", help="Re-render even if the HTML is unchanged")
+    args = parser.parse_args()
+
+    cfg = load_config()
+    sources = list(args.html)
+    if args.start or args.end:
+        catalog = get_catalog()
+        websheet_dir = Path(cfg["mlb_data"]["processed_game_summaries_path"])
+        if not websheet_dir.is_absolute():
+            websheet_dir = Path(cfg["root_path"]) / websheet_dir
+        catalog.ensure_backfilled(RFI_WEBSHEET, websheet_dir, "mlb_mlh_rfi_websheet_????????.html")
+        sources += [catalog.path_of(rec) for rec in catalog.between(RFI_WEBSHEET, args.start, args.end)]
+    if not sources:
+        parser.error("No websheets given (pass paths or --start/--end)")
+
+    out_dir = Path(args.out_dir or cfg["mlb_data"]["websheet_pdf_dir"])
+    if not out_dir.is_absolute():
+        out_dir = Path(cfg["root_path"]) / out_dir
+    counts = export_pdfs(sources, out_dir, args.css, args.workers, args.force)
+    print(f"Rendered {counts['rendered']}, skipped {counts['skipped']}, failed {counts['failed']} -> {out_dir}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
@@ -1,26 +1,92 @@
-from sqlalchemy import create_engine, Column, Integer, String, Date, Time
+import logging
+from datetime import date
+from functools import lru_cache
+
+import pandas as pd
+from sqlalchemy import (create_engine, event, select, text, Column, Index, Integer, MetaData, String,
+                        Table, Date, Time)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+logger = logging.getLogger(__name__)
+
 Base = declarative_base()
 
+
 class MLBGame(Base):
     __tablename__ = 'mlb_games'
+    __table_args__ = (Index('ux_mlb_games_game_id', 'game_id', unique=True),)
     id = Column(Integer, primary_key=True)
-    game_date = Column(Date, nullable=False)
+    game_date = Column(Date, nullable=False, index=True)
     game_time = Column(Time, nullable=True)
     home_team = Column(String, nullable=False)
     away_team = Column(String, nullable=False)
     venue = Column(String, nullable=True)
-    game_id = Column(String, nullable=True)  # External/game API id
+    game_id = Column(String, nullable=True)  # External/game API id, unique via ux_mlb_games_game_id
+
+
+def _default_db_url():
+    from sql.mlb_data_lake import resolve_db_path
+    return f"sqlite:///{resolve_db_path()}"
+
 
+@lru_cache(maxsize=None)
+def get_engine(db_url=None):
+    """
+    Process-wide pooled engine per URL. Defaults to the data lake at
+    mlb_data.data_lake_filepath; SQLite connections run in WAL mode.
+    """
+    engine = create_engine(db_url or _default_db_url(), pool_pre_ping=True)
+    if engine.dialect.name == 'sqlite':
+        @event.listens_for(engine, 'connect')
+        def _sqlite_pragmas(dbapi_conn, _):
+            cur = dbapi_conn.cursor()
+            cur.execute('PRAGMA journal_mode = WAL')
+            cur.execute('PRAGMA synchronous = NORMAL')
+            # Same as the data lake's own connections: model_scores rows need their games row
+            cur.execute('PRAGMA foreign_keys = ON')
+            cur.close()
+    return engine
 
-def get_engine(db_url='sqlite:///mlb_schedule.db'):
-    return create_engine(db_url)
+
+def _ensure_data_lake_schema(engine):
+    """Create/migrate the data lake tables (games, model_scores, ...) with the data lake's own DDL."""
+    from sql.mlb_data_lake import create_schema
+    raw = engine.raw_connection()
+    try:
+        create_schema(raw.driver_connection)
+    finally:
+        raw.close()
+
+
+def _migrate_game_id_unique(engine):
+    """
+    Older mlb_games tables were created without the game_id unique index: drop
+    duplicate game_ids (keeping the newest row) and add it.
+    """
+    with engine.begin() as conn:
+        removed = conn.execute(text(
+            "DELETE FROM mlb_games WHERE game_id IS NOT NULL AND id NOT IN "
+            "(SELECT MAX(id) FROM mlb_games WHERE game_id IS NOT NULL GROUP BY game_id)")).rowcount
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_mlb_games_game_id ON mlb_games (game_id)"))
+    if removed:
+        logger.info("Removed %d duplicate mlb_games row(s) before indexing game_id", removed)
 
 
 def create_tables(engine):
     Base.metadata.create_all(engine)
+    _migrate_game_id_unique(engine)
+    if engine.dialect.name == 'sqlite':
+        _ensure_data_lake_schema(engine)
+
+
+@lru_cache(maxsize=None)
+def lake_table(engine, name: str) -> Table:
+    """A data lake table (games, model_scores, ...), reflected: sql.mlb_data_lake owns the schema."""
+    _ensure_data_lake_schema(engine)
+    return Table(name, MetaData(), autoload_with=engine)
 
 
 def get_session(engine):
@@ -37,3 +103,55 @@ def add_game(session, game_info):
 
 def get_games_by_date(session, date):
     return session.query(MLBGame).filter_by(game_date=date).all()
+
+
+def _upsert(engine, table, rows, key_cols):
+    """One batched INSERT ... ON CONFLICT DO UPDATE for all rows, in a single transaction."""
+    rows = list(rows)
+    if not rows:
+        return 0
+    stmt = sqlite_insert(table)
+    update_cols = {c: stmt.excluded[c] for c in rows[0] if c not in key_cols}
+    stmt = stmt.on_conflict_do_update(index_elements=list(key_cols), set_=update_cols) \
+        if update_cols else stmt.on_conflict_do_nothing(index_elements=list(key_cols))
+    with engine.begin() as conn:
+        conn.execute(stmt, rows)
+    return len(rows)
+
+
+def upsert_games(rows, engine=None):
+    """
+    Insert or update schedule rows in the data lake's games table, keyed by
+    game_id (dicts with games columns; dates may be date objects).
+    """
+    rows = [{k: v.isoformat() if isinstance(v, date) else v for k, v in row.items()} for row in rows]
+    engine = engine or get_engine()
+    return _upsert(engine, lake_table(engine, 'games'), rows, ('game_id',))
+
+
+def upsert_scores(rows, engine=None):
+    """Insert or update model scores keyed by (game_id, as_of); each game must be in games."""
+    engine = engine or get_engine()
+    return _upsert(engine, lake_table(engine, 'model_scores'), rows, ('game_id', 'as_of'))
+
+
+def get_games_between(start, end, engine=None) -> pd.DataFrame:
+    """All games with start <= game_date <= end, ordered by date and start time."""
+    engine = engine or get_engine()
+    games = lake_table(engine, 'games')
+    stmt = (select(games)
+            .where(games.c.game_date.between(str(start), str(end)))
+            .order_by(games.c.game_date, games.c.game_datetime))
+    with engine.connect() as conn:
+        return pd.read_sql(stmt, conn)
+
+
+def get_scores_between(start, end, engine=None) -> pd.DataFrame:
+    """Model scores with start <= as_of <= end; dates as YYYY-MM-DD strings or date objects."""
+    engine = engine or get_engine()
+    scores = lake_table(engine, 'model_scores')
+    stmt = (select(scores)
+            .where(scores.c.as_of.between(str(start), str(end)))
+            .order_by(scores.c.as_of, scores.c.game_id))
+    with engine.connect() as conn:
+        return pd.read_sql(stmt, conn)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Expected value and bankroll engine for NRFI/YRFI bets.
+
+Everything operates on whole arrays (one element per game or bet):
+
+  - American odds -> decimal odds / implied probability
+  - vig-free (fair) probabilities from a two-way market
+  - edge, EV per unit staked and fractional-Kelly stakes
+  - bankroll paths over a season of history, replayed from realized outcomes or
+    Monte Carlo simulated from model probabilities, in one pass
+
+Sportsbook odds are read from a local CSV or JSON file with one row per game:
+game_id, nrfi_odds, yrfi_odds (American), optionally book.
+
+USAGE EXAMPLES:
+  # Price today's calibrated slate against an odds file
+  python -m src.utils.ev_calculator --odds data/baseball/mlb/raw/odds/nrfi_odds_20250809.csv --date 20250809
+
+  # Quarter-Kelly, only bets with at least 2% edge
+  python -m src.utils.ev_calculator --odds odds.json --date 20250809 --kelly 0.25 --min-edge 0.02
+"""
+import argparse
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ODDS_COLUMNS = ["game_id", "nrfi_odds", "yrfi_odds"]
+
+
+# ---------------------------------------------------------------------- odds math
+def american_to_decimal(odds) -> np.ndarray:
+    odds = np.asarray(odds, dtype=float)
+    return np.where(odds > 0, 1 + odds / 100.0, 1 + 100.0 / np.abs(odds))
+
+
+def american_to_implied(odds) -> np.ndarray:
+    """Book-implied probability (vig included)."""
+    return 1.0 / american_to_decimal(odds)
+
+
+def decimal_to_american(dec) -> np.ndarray:
+    dec = np.asarray(dec, dtype=float)
+    return np.where(dec >= 2, (dec - 1) * 100.0, -100.0 / (dec - 1)).round()
+
+
+def devig(p_a, p_b, method: str = "multiplicative"):
+    """
+    Fair probabilities for both sides of a two-way market from their implied
+    probabilities. 'multiplicative' scales by the overround; 'additive' removes
+    half of it from each side.
+    """
+    p_a = np.asarray(p_a, dtype=float)
+    p_b = np.asarray(p_b, dtype=float)
+    total = p_a + p_b
+    if method == "multiplicative":
+        return p_a / total, p_b / total
+    if method == "additive":
+        half_vig = (total - 1.0) / 2.0
+        return p_a - half_vig, p_b - half_vig
+    raise ValueError(f"Unknown devig method {method!r}")
+
+
+def expected_value(p, dec) -> np.ndarray:
+    """EV per unit staked for a bet winning with probability p at decimal odds dec."""
+    p = np.asarray(p, dtype=float)
+    return p * (np.asarray(dec, dtype=float) - 1) - (1 - p)
+
+
+def kelly_fraction(p, dec, fraction: float = 1.0, cap: float = None) -> np.ndarray:
+    """Fractional-Kelly bankroll share; zero where the bet has no edge."""
+    b = np.asarray(dec, dtype=float) - 1
+    p = np.asarray(p, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f = (b * p - (1 - p)) / b
+    f = np.clip(np.nan_to_num(f, nan=0.0), 0.0, None) * fraction
+    return np.minimum(f, cap) if cap is not None else f
+
+
+# ---------------------------------------------------------------------- slate pricing
+def load_odds(path) -> pd.DataFrame:
+    """Read a local odds file (CSV or JSON list/records) into game_id, nrfi_odds, yrfi_odds."""
+    path = Path(path)
+    if path.suffix == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        df = pd.DataFrame(data if isinstance(data, list) else data.get("games", []))
+    else:
+        df = pd.read_csv(path)
+    missing = set(ODDS_COLUMNS) - set(df.columns)
+    if missing:
+        raise KeyError(f"Odds file {path} missing columns: {sorted(missing)}")
+    df["game_id"] = df["game_id"].astype(int)
+    logger.info("Loaded odds for %d games from %s", len(df), path)
+    return df
+
+
+def price_slate(games: pd.DataFrame, odds: pd.DataFrame, prob_col: str = "calibrated_p_nrfi",
+                kelly: float = 0.25, kelly_cap: float = 0.05, devig_method: str = "multiplicative") -> pd.DataFrame:
+    """
+    Join model P(NRFI) with book odds and compute, for both sides of every game,
+    the fair probability, edge, EV and fractional-Kelly stake. The `pick` column
+    is the side with the larger EV (or None when neither side is +EV).
+    """
+    df = games[["game_id", prob_col]].merge(odds, on="game_id", how="inner")
+    p_nrfi = df[prob_col].to_numpy(float)
+    dec_nrfi = american_to_decimal(df["nrfi_odds"])
+    dec_yrfi = american_to_decimal(df["yrfi_odds"])
+    fair_nrfi, fair_yrfi = devig(1 / dec_nrfi, 1 / dec_yrfi, devig_method)
+
+    df["fair_p_nrfi"] = fair_nrfi
+    df["edge_nrfi"] = p_nrfi - fair_nrfi
+    df["edge_yrfi"] = (1 - p_nrfi) - fair_yrfi
+    df["ev_nrfi"] = expected_value(p_nrfi, dec_nrfi)
+    df["ev_yrfi"] = expected_value(1 - p_nrfi, dec_yrfi)
+    df["stake_nrfi"] = kelly_fraction(p_nrfi, dec_nrfi, kelly, kelly_cap)
+    df["stake_yrfi"] = kelly_fraction(1 - p_nrfi, dec_yrfi, kelly, kelly_cap)
+
+    best_nrfi = df["ev_nrfi"].to_numpy() >= df["ev_yrfi"].to_numpy()
+    best_ev = np.where(best_nrfi, df["ev_nrfi"], df["ev_yrfi"])
+    df["pick"] = np.where(best_ev > 0, np.where(best_nrfi, "NRFI", "YRFI"), None)
+    df["pick_ev"] = np.where(best_ev > 0, best_ev, 0.0)
+    df["pick_stake"] = np.where(best_ev > 0, np.where(best_nrfi, df["stake_nrfi"], df["stake_yrfi"]), 0.0)
+    return df
+
+
+# ---------------------------------------------------------------------- bankroll
+def simulate_bankroll(stakes, dec, win_prob=None, outcomes=None, days=None,
+                      start: float = 100.0, n_paths: int = 1000, seed: int = None) -> np.ndarray:
+    """
+    Bankroll after each betting day for a season of bets.
+
+    stakes are bankroll fractions and dec decimal odds, one per bet. Bets sharing
+    a `days` label are sized off that day's opening bankroll. With `outcomes`
+    (1 = bet won) the realized history is replayed and a (n_days,) path is
+    returned; otherwise n_paths outcome sets are drawn from win_prob and a
+    (n_paths, n_days) array is returned.
+    """
+    stakes = np.asarray(stakes, dtype=float)
+    profit_if_win = np.asarray(dec, dtype=float) - 1
+    days = np.zeros(len(stakes), dtype=int) if days is None else np.asarray(days)
+    order = np.argsort(days, kind="stable")
+    _, starts = np.unique(days[order], return_index=True)
+
+    if outcomes is not None:
+        wins = np.asarray(outcomes, dtype=float)[order][None, :]
+    else:
+        rng = np.random.default_rng(seed)
+        p = np.asarray(win_prob, dtype=float)[order]
+        wins = (rng.random((n_paths, len(p))) < p).astype(float)
+
+    bet_returns = stakes[order] * np.where(wins > 0, profit_if_win[order], -1.0)
+    day_growth = 1.0 + np.add.reduceat(bet_returns, starts, axis=1)
+    paths = start * np.cumprod(np.clip(day_growth, 0.0, None), axis=1)
+    return paths[0] if outcomes is not None else paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price NRFI/YRFI bets for a slate against local odds.")
+    parser.add_argument("--odds", required=True, help="CSV/JSON odds file: game_id, nrfi_odds, yrfi_odds")
+    parser.add_argument("--date", default=datetime.today().strftime("%Y%m%d"), help="Slate date YYYYMMDD")
+    parser.add_argument("--kelly", type=float, default=0.25, help="Kelly fraction (default: quarter Kelly)")
+    parser.add_argument("--kelly-cap", type=float, default=0.05, help="Max bankroll share per bet")
+    parser.add_argument("--min-edge", type=float, default=0.0, help="Hide picks below this edge")
+    args = parser.parse_args()
+
+    from utils.artifact_catalog import get_catalog, CALIBRATED_GAME_SUMMARY
+    catalog = get_catalog()
+    rec = catalog.resolve(CALIBRATED_GAME_SUMMARY, args.date, max_age_days=0)
+    if rec is None:
+        raise FileNotFoundError(f"No calibrated game summary cataloged for {args.date}")
+    with open(catalog.path_of(rec), "r", encoding="utf-8") as f:
+        games = pd.DataFrame(json.load(f))
+
+    priced = price_slate(games, load_odds(args.odds), kelly=args.kelly, kelly_cap=args.kelly_cap)
+    edge = np.where(priced["pick"] == "NRFI", priced["edge_nrfi"], priced["edge_yrfi"])
+    picks = priced[priced["pick"].notna() & (edge >= args.min_edge)]
+    cols = ["game_id", "calibrated_p_nrfi", "fair_p_nrfi", "nrfi_odds", "yrfi_odds",
+            "pick", "pick_ev", "pick_stake"]
+    print(picks[cols].round(4).to_string(index=False) if not picks.empty else "No +EV picks")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
@@ -12,10 +12,16 @@ import pandas as pd
 from pybaseball import statcast
 
 from utils.config_loader import load_config
+from utils.mlb.team_first_inning_aggregates import get_team_aggregates
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# wOBA3 lookback windows; None means season to date
+SPLIT_WINDOWS = {"7d": 7, "14d": 14, "30d": 30, "season": None}
+# 30d and season are disabled for now; they cost no extra download when enabled
+DEFAULT_SPLIT_WINDOWS = ("7d", "14d")
+
 
 class BaseStats:
     def __init__(self):
@@ -28,12 +34,15 @@ class BaseStats:
 
 
 class AdvancedTeamStats(BaseStats):
-    def __init__(self, lookback_days: int = 7, force: bool = False, quiet: bool = False):
+    def __init__(self, lookback_days: int = 7, force: bool = False, quiet: bool = False,
+                 use_aggregates: bool = True):
         super().__init__()
         self.lookback_days = lookback_days
         self.team_woba_splits = {}
         self.force = force
         self.quiet = quiet
+        # Answer windows from the daily first-inning aggregate table when possible
+        self.use_aggregates = use_aggregates
 
         # Build paths from config
         self.raw_csv_path = self.root_path / self.statcast_cfg.get("raw_csv")
@@ -92,27 +101,60 @@ class AdvancedTeamStats(BaseStats):
                 logger.exception("❌ Retry also failed: %s", e2)
                 return pd.DataFrame()
 
-    def compute_team_woba_split(self, lookback_days: int) -> dict:
+    @staticmethod
+    def window_days(window: str) -> int:
+        """Lookback in days for a SPLIT_WINDOWS key; 'season' runs from March 1."""
+        days = SPLIT_WINDOWS[window]
+        if days is None:
+            today = datetime.today().date()
+            days = (today - datetime(today.year, 3, 1).date()).days
+        return days
+
+    @staticmethod
+    def slice_window(df: pd.DataFrame, lookback_days: int) -> pd.DataFrame:
+        """Rows of a wider Statcast pull that fall inside the last lookback_days."""
+        if df.empty or 'game_date' not in df.columns:
+            return df
+        start = datetime.today().date() - timedelta(days=lookback_days)
+        game_dates = pd.to_datetime(df['game_date']).dt.date
+        return df[game_dates >= start]
+
+    def _cached_split(self, lookback_days: int):
+        """Fresh per-window wOBA split from disk, or None."""
+        cache_path = Path(str(self.woba_split_path).format(lookback=lookback_days))
+        if not cache_path.exists():
+            return None
+        if self.force:
+            logger.info("--force: Deleting cached wOBA split at %s", cache_path)
+            cache_path.unlink(missing_ok=True)
+            return None
+        age = datetime.now() - datetime.fromtimestamp(cache_path.stat().st_mtime)
+        if age.days > 3:
+            logger.info("🩹 Cache %s is %d days old. Deleting...", cache_path, age.days)
+            cache_path.unlink(missing_ok=True)
+            return None
+        logger.info("📦 Using cached wOBA data from %s", cache_path)
+        with cache_path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def compute_team_woba_split(self, lookback_days: int, statcast_df: pd.DataFrame = None) -> dict:
+        """
+        wOBA3 by team over the last lookback_days. When statcast_df (a pull covering
+        at least this window) is given, the window is sliced from it locally.
+        """
         try:
             # This metric represents wOBA in the FIRST INNING ONLY — a proxy for the performance of the top 3 in the batting order.
             # We refer to it as "wOBA3" throughout for consistency, even though it's not literally per-player.
             cache_path = Path(str(self.woba_split_path).format(lookback=lookback_days))
 
-            if cache_path.exists():
-                if self.force:
-                    logger.info("--force: Deleting cached wOBA split at %s", cache_path)
-                    cache_path.unlink(missing_ok=True)
-                else:
-                    age = datetime.now() - datetime.fromtimestamp(cache_path.stat().st_mtime)
-                    if age.days > 3:
-                        logger.info("🩹 Cache %s is %d days old. Deleting...", cache_path, age.days)
-                        cache_path.unlink(missing_ok=True)
-                    else:
-                        logger.info("📦 Using cached wOBA data from %s", cache_path)
-                        with cache_path.open("r", encoding="utf-8") as f:
-                            return json.load(f)
-
-            df = self.fetch_statcast_data(lookback_days)
+            cached = self._cached_split(lookback_days)
+            if cached is not None:
+                return cached
+
+            if statcast_df is None:
+                df = self.fetch_statcast_data(lookback_days)
+            else:
+                df = self.slice_window(statcast_df, lookback_days)
             if df.empty:
                 logger.warning(
                     "Statcast data is empty for %d-day lookback. Returning empty dict.", lookback_days)
@@ -163,7 +205,7 @@ class AdvancedTeamStats(BaseStats):
                 "Error computing %d-day wOBA split: %s", lookback_days, e)
             return {}
 
-    def compute_all_splits(self, force: bool = False):
+    def compute_all_splits(self, force: bool = False, windows=DEFAULT_SPLIT_WINDOWS):
         if (self.force or force) and self.combined_path.exists():
             logger.info("--force: Deleting combined split cache at %s", self.combined_path)
             self.combined_path.unlink(missing_ok=True)
@@ -175,25 +217,44 @@ class AdvancedTeamStats(BaseStats):
                     "🕒 Cached combined split file is recent (%.1f hrs). Loading from cache.", age_hours)
                 return self.load_from_json(self.combined_path)
 
-        from concurrent.futures import ThreadPoolExecutor
+        lookbacks = {window: self.window_days(window) for window in windows}
+        widest = max(lookbacks.values())
         logger.info(
-            "Computing team-level wOBA3 splits (7d, 14d; 30d and season disabled for now)")
+            "Computing team-level wOBA3 splits %s from one %d-day Statcast pull", list(windows), widest)
         results = {}
 
-        results["7d"] = self.compute_team_woba_split(7)
+        if self.use_aggregates:
+            results = self.compute_splits_from_aggregates(lookbacks)
+            if results and all(results.values()):
+                self.team_woba_splits = results
+                return self.team_woba_splits
+            logger.warning("Daily aggregates incomplete; falling back to raw Statcast rows")
+            results = {}
 
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(self.compute_team_woba_split, 14)
-            try:
-                results["14d"] = future.result()
-            except Exception as e:
-                logger.warning("14d wOBA3 computation failed: %s", e)
-                results["14d"] = {}
+        # One league-wide download for the widest window; narrower windows are sliced locally.
+        # Skipped entirely when every window is still cached.
+        statcast_df = None
+        if any(self._cached_split(days) is None for days in lookbacks.values()):
+            statcast_df = self.fetch_statcast_data(widest)
+
+        for window, days in lookbacks.items():
+            results[window] = self.compute_team_woba_split(days, statcast_df=statcast_df)
 
         self.team_woba_splits = results
         logger.debug("Finished computing all wOBA splits")
         return self.team_woba_splits
 
+    def compute_splits_from_aggregates(self, lookbacks: dict) -> dict:
+        """wOBA3 per window from the incremental daily aggregates (only missing dates are fetched)."""
+        try:
+            store = get_team_aggregates()
+            today = datetime.today().date()
+            store.update(today - timedelta(days=max(lookbacks.values())), today)
+            return {window: store.woba3(days, today) for window, days in lookbacks.items()}
+        except Exception as e:
+            logger.exception("Failed to compute wOBA3 from daily aggregates: %s", e)
+            return {}
+
     def save_to_json(self, output_path: Path):
         try:
             if not self.team_woba_splits:
@@ -204,8 +265,8 @@ class AdvancedTeamStats(BaseStats):
             date_range = {
                 'generated_at': datetime.now().isoformat(),
                 'range': {
-                    '7d': (datetime.today() - timedelta(days=7)).strftime('%Y-%m-%d'),
-                    '14d': (datetime.today() - timedelta(days=14)).strftime('%Y-%m-%d')
+                    window: (datetime.today() - timedelta(days=self.window_days(window))).strftime('%Y-%m-%d')
+                    for window in self.team_woba_splits if window in SPLIT_WINDOWS
                 }
             }
             payload = {
@@ -31,8 +31,12 @@ NOTES:
 import os
 import json
 import argparse
+from pathlib import Path
+
 import requests
 
+from utils.artifact_catalog import get_catalog, DAILY_GAME_SUMMARY, AUGMENTED_GAME_SUMMARY
+
 def augment_game_summaries(input_dir, output_dir):
     # Find JSON files in the specified input directory
     json_files = [f for f in os.listdir(input_dir)
@@ -132,25 +136,16 @@ def augment_game_summaries(input_dir, output_dir, start_date=None, end_date=None
         # Augment all files for a season, overwriting existing
         python augment_game_summaries.py -i data/baseball/mlb/raw -o data/baseball/mlb/interim/game_summaries --season 2025 --force
     """
-    # Find JSON files in the specified input directory
-    json_files = [f for f in os.listdir(input_dir)
-                  if f.startswith('mlb_daily_game_summary_') and f.endswith('.json')]
-    if not json_files:
-        print(f"No JSON files found in {input_dir}")
-        return
-
-    # Filter files by date range or season
-    filtered_files = []
-    for f in json_files:
-        file_date = parse_date_from_filename(f)
-        if file_date:
-            if season and not file_date.startswith(str(season)):
-                continue
-            if start_date and file_date < start_date:
-                continue
-            if end_date and file_date > end_date:
-                continue
-        filtered_files.append(f)
+    # Resolve input files through the artifact catalog instead of scanning input_dir
+    catalog = get_catalog()
+    catalog.ensure_backfilled(
+        DAILY_GAME_SUMMARY, input_dir, 'mlb_daily_game_summary_????????.json')
+    records = catalog.in_directory(
+        catalog.between(DAILY_GAME_SUMMARY, start_date, end_date,
+                        season=int(season) if season else None),
+        input_dir)
+    filtered_files = [Path(rec.path).name for rec in records]
+    as_of_by_file = {Path(rec.path).name: rec.as_of for rec in records}
 
     if not filtered_files:
         print("No files match the specified date range or season.")
@@ -202,6 +197,7 @@ def augment_game_summaries(input_dir, output_dir, start_date=None, end_date=None
         # Write augmented JSON
         with open(output_path, 'w') as fp:
             json.dump(games, fp, indent=2)
+        catalog.register(AUGMENTED_GAME_SUMMARY, output_path, as_of_by_file[filename])
         print(f"Processed {filename} -> {output_filename}")
 
     # Summary
@@ -7,6 +7,22 @@ import logging.config
 from utils.config_loader import load_config
 
 
+def nrfi_feature_values(pitcher_stats: dict, wrc_plus_1st, woba3) -> dict:
+    """
+    Model inputs for one team: the starter's flattened recent form (xFIP/Barrel%
+    from his last starts, first-inning ERA/WHIP from the pitcher game store's
+    rolling window) plus the team's 1st-inning wRC+ and the wOBA3 input.
+    """
+    return {
+        "xFIP": pitcher_stats.get('recent_xfip', 'NA'),
+        "BarrelPct": pitcher_stats.get('recent_barrel_pct', 'NA'),
+        "f1_era": pitcher_stats.get('recent_f1_era', 'NA'),
+        "WHIP": pitcher_stats.get('recent_f1_whip', 'NA'),
+        "wRCp1st": wrc_plus_1st,
+        "wOBA3": woba3,
+    }
+
+
 def calculate_nrfi_score(values: dict, features_def: dict):
     """
     Compute weighted RFI score (0–100) from input values and feature definitions.
@@ -3,14 +3,14 @@
 daily_game_summary_scrubber.py
 
 Reads an MLB daily game summary JSON, adds 'home_team_abbrev' and 'away_team_abbrev'
-to each record based on a config file, and writes out a new JSON.
+to each record from the team registry, and writes out a new JSON.
 """
 
 import json
 import logging
 import logging.config
 from utils.config_loader import load_config
-import os
+from utils.mlb.team_registry import get_team_registry
 import sys
 
 # -----------------------------------------------------------------------------
@@ -20,20 +20,9 @@ cfg = load_config()
 logging.config.dictConfig(cfg["logging"])
 
 # -----------------------------------------------------------------------------
-# Load team‐abbrev mapping from external config (JSON)
+# Team abbreviations come from the shared team registry
 # -----------------------------------------------------------------------------
-TEAM_ABBREVS_CONFIG_PATH = os.getenv(
-    "ABBREV_CONFIG", "config/mlb_team_abbrevs.json")
-
-try:
-    with open(TEAM_ABBREVS_CONFIG_PATH) as cfg:
-        cfg_data = json.load(cfg)
-        TEAM_ABBREVS = cfg_data["team_abbreviations"]
-    logging.info(
-        f"Loaded {len(TEAM_ABBREVS)} team abbreviations from {TEAM_ABBREVS_CONFIG_PATH}")
-except Exception as e:
-    logging.error(f"Error loading config '{TEAM_ABBREVS_CONFIG_PATH}': {e}")
-    sys.exit(1)
+TEAM_REGISTRY = get_team_registry()
 
 
 def load_json(path):
@@ -56,8 +45,8 @@ def add_abbrevs(records):
         home = rec.get("home_team", "")
 
         # Lookup abbreviations; default to empty string if missing
-        rec["away_team_abbrev"] = TEAM_ABBREVS.get(away, "")
-        rec["home_team_abbrev"] = TEAM_ABBREVS.get(home, "")
+        rec["away_team_abbrev"] = TEAM_REGISTRY.abbrev(away, "")
+        rec["home_team_abbrev"] = TEAM_REGISTRY.abbrev(home, "")
     return records
 
 
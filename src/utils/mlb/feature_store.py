@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Point-in-time feature store for scored MLB team-games.
+
+Every time the pipeline scores a game it records, per (game_id, side), the
+exact feature vector it fed to calculate_nrfi_score (xFIP, BarrelPct, f1_era,
+WHIP, wRCp1st, wOBA3) with the run timestamp as `as_of`. Rows live in the
+data lake's feature_vectors table in long form, so new features need no
+migration.
+
+Reads are as-of: for each team-game the newest vector recorded at or before
+the requested time, pivoted to a dense matrix in feature-config order.
+Training, calibration and backtests read from here instead of replaying the
+network pipeline.
+
+USAGE EXAMPLES:
+  # Feature matrix as the pipeline saw it at the end of 2025-08-09
+  python -m src.utils.mlb.feature_store 2025-08-09T23:59:59
+"""
+import argparse
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sql.mlb_data_lake import connect, upsert
+from utils.config_loader import load_config
+from utils.helpers import FeatureConfigLoader
+
+logger = logging.getLogger(__name__)
+
+
+def _feature_value(value) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "", "NA") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_of_text(as_of, end_of_day: bool = True) -> str:
+    if isinstance(as_of, datetime):
+        return as_of.isoformat(timespec="seconds")
+    text = str(as_of)
+    # A bare date means the end (or, for lower bounds, the start) of that day
+    if len(text) == 10:
+        return f"{text}T23:59:59" if end_of_day else f"{text}T00:00:00"
+    return text
+
+
+class FeatureStore:
+    """Write and as-of read feature vectors keyed by (game_id, side, as_of)."""
+
+    def __init__(self, conn: sqlite3.Connection = None, feature_names: Sequence[str] = None):
+        self.conn = conn or connect()
+        if feature_names is None:
+            cfg = load_config()
+            features_path = cfg["models"]["mlb_rfi"]["feature_definitions_path"]
+            feature_names = list(FeatureConfigLoader.load_features_config(features_path))
+        self.feature_names = list(feature_names)
+
+    def write(self, vectors: Iterable[Tuple[int, str, dict]], as_of=None) -> int:
+        """
+        Persist (game_id, side, {feature: value}) vectors in one transaction.
+        'NA'/None values are stored as NULL so missing inputs stay visible.
+        """
+        as_of = _as_of_text(as_of or datetime.now())
+        rows = [
+            {"game_id": int(game_id), "side": side, "as_of": as_of,
+             "feature": feature, "value": _feature_value(value)}
+            for game_id, side, values in vectors
+            for feature, value in values.items()
+        ]
+        with self.conn:
+            upsert(self.conn, "feature_vectors", rows)
+        logger.info("Stored %d feature values as of %s", len(rows), as_of)
+        return len(rows)
+
+    def read_as_of(self, as_of, game_ids: Iterable[int] = None, since=None,
+                   features: Sequence[str] = None) -> pd.DataFrame:
+        """
+        Dense (game_id, side) x feature frame holding, per team-game, the newest
+        vector recorded at or before as_of (and at or after `since`, if given).
+        Missing features are NaN; columns follow the feature config order.
+        """
+        params: List = [_as_of_text(as_of)]
+        where = "as_of <= ?"
+        if since is not None:
+            where += " AND as_of >= ?"
+            params.append(_as_of_text(since, end_of_day=False))
+        if game_ids is not None:
+            ids = [int(g) for g in game_ids]
+            if not ids:
+                return pd.DataFrame(columns=list(features or self.feature_names))
+            where += f" AND game_id IN ({', '.join('?' * len(ids))})"
+            params.extend(ids)
+
+        sql = f"""
+            WITH latest AS (
+                SELECT game_id, side, MAX(as_of) AS as_of
+                FROM feature_vectors WHERE {where}
+                GROUP BY game_id, side
+            )
+            SELECT fv.game_id, fv.side, fv.as_of, fv.feature, fv.value
+            FROM feature_vectors fv
+            JOIN latest USING (game_id, side, as_of)
+        """
+        long = pd.read_sql_query(sql, self.conn, params=params)
+        columns = list(features or self.feature_names)
+        if long.empty:
+            return pd.DataFrame(columns=columns)
+        dense = long.set_index(["game_id", "side", "feature"])["value"].unstack("feature")
+        return dense.reindex(columns=columns).astype(float).sort_index()
+
+    def matrix(self, as_of, **kwargs) -> Tuple[np.ndarray, pd.MultiIndex, List[str]]:
+        """read_as_of as a float ndarray plus its (game_id, side) index and column names."""
+        dense = self.read_as_of(as_of, **kwargs)
+        return dense.to_numpy(dtype=float), dense.index, list(dense.columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read point-in-time NRFI feature vectors.")
+    parser.add_argument("as_of", help="YYYY-MM-DD or ISO timestamp")
+    parser.add_argument("--since", default=None, help="Ignore vectors recorded before this date")
+    args = parser.parse_args()
+    store = FeatureStore()
+    print(store.read_as_of(args.as_of, since=args.since).to_string())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
@@ -7,12 +7,14 @@ import argparse
 from datetime import datetime, date, timedelta
 
 import pandas as pd
-from pybaseball import statcast_single_game
 from utils.mlb.fetch_games_by_pitcher import FetchGamesByPitcher
+from utils.mlb.statcast_slate_planner import fetch_statcast_game
 from utils.config_loader import load_config
 from utils.helpers import RatingCalculator, FeatureConfigLoader
 # First-inning utilities
 from utils.mlb.get_f1_stats import compute_first_inning_era, compute_first_inning_whip
+from utils.mlb.pitcher_game_aggregates import (
+    barrel_pct_from_counts, get_pitcher_game_store, summarize_pitcher_game, xfip_from_counts)
 
 # Configure logging
 cfg = load_config()
@@ -57,47 +59,46 @@ class PitcherAdvancedStats:
         self.avg_barrel_pct = float('nan')
         self.avg_barrel_score = float('nan')
 
+    def record_from_counts(self, gp, gd, counts: dict) -> tuple:
+        """(game_pk, game_date, xfip, xfip_score, barrel_pct, barrel_score) from stored counting stats."""
+        xfip = float(xfip_from_counts(counts['fb'], counts['bb'], counts['hbp'], counts['k'], counts['outs']))
+        barrel_pct = float(barrel_pct_from_counts(counts['barrels'], counts['batted']))
+        rc = RatingCalculator(features_cfg)
+        xfip_score = rc.minmax_scale(xfip, "xFIP", reverse=True)
+        barrel_score = rc.minmax_scale(barrel_pct, "BarrelPct", reverse=True)
+        return (gp, gd, xfip, xfip_score, barrel_pct, barrel_score)
+
+    def stored_records(self, start: date = None, last_n: int = None) -> list:
+        """Records for this pitcher straight from the game aggregate store (no downloads)."""
+        games = get_pitcher_game_store().games([self.pitcher_id], before=self.end + timedelta(days=1), start=start)
+        if last_n is not None:
+            games = games.tail(last_n)
+        return [self.record_from_counts(int(row['game_pk']), row['game_date'], row)
+                for _, row in games.iterrows()]
+
     def analyze(self):
+        store = get_pitcher_game_store()
         recs = []
         for gp, gd in self.games:
             try:
-                df = statcast_single_game(gp)
+                # Games already reduced to counting stats are never downloaded again
+                if store.has(self.pitcher_id, gp):
+                    recs.append(self.record_from_counts(gp, gd, store.get(self.pitcher_id, gp)))
+                    continue
+                df = fetch_statcast_game(gp)
                 df_p = df[df['pitcher'] == self.pitcher_id]
                 if self.pitcher_name is None and not df_p.empty:
                     mp = df_p.iloc[0].get('matchup', {})
                     self.pitcher_name = mp.get('pitcher', {}).get(
                         'fullName', f"ID {self.pitcher_id}")
-                # xFIP calculation
-                hr = df_p['events'].eq('home_run').sum()
-                bb = df_p['bb_type'].eq('walk').sum()
-                hbp = df_p['events'].eq('hit_by_pitch').sum()
-                k = df_p['events'].eq('strikeout').sum()
-                fb = df_p[(df_p['launch_speed'].notna()) & (
-                    df_p['launch_angle'] > 15)].shape[0]
-                outs = df_p['outs_when_up'].sum(
-                ) if 'outs_when_up' in df_p.columns else df_p['outs'].sum()
-                ip = outs / 3.0 if outs > 0 else 0
-                xfip = float('nan')
-                if ip > 0:
-                    hr_exp = fb * 0.105
-                    xfip = (13 * hr_exp + 3 * (bb + hbp) - 2 * k) / ip + 3.20
-                # Barrel % calculation
-                barrels = df_p['launch_speed_angle'].eq(
-                    6).sum() if 'launch_speed_angle' in df_p.columns else 0
-                batted = df_p['launch_speed'].notna().sum(
-                ) if 'launch_speed' in df_p.columns else 0
-                barrel_pct = (barrels / batted *
-                              100.0) if batted > 0 else float('nan')
-                # scale scores
-                rc = RatingCalculator(features_cfg)
-                xfip_score = rc.minmax_scale(xfip, "xFIP", reverse=True)
-                barrel_score = rc.minmax_scale(
-                    barrel_pct, "BarrelPct", reverse=True)
-                recs.append((gp, gd, xfip, xfip_score,
-                            barrel_pct, barrel_score))
+                counts = summarize_pitcher_game(df_p)
+                if not df_p.empty:
+                    store.add(self.pitcher_id, gp, gd, counts)
+                recs.append(self.record_from_counts(gp, gd, counts))
             except Exception as e:
                 logging.error("Error analyzing game %s: %s", gp, e)
                 recs.append((gp, gd, float('nan'), 50, float('nan'), 50))
+        store.save()
         self.records = recs
         # compute averages
         xfips = [r[2] for r in recs if pd.notna(r[2])]
@@ -5,12 +5,17 @@ import os
 import sys
 import json
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import date
 from utils.config_loader import load_config
 from utils.helpers import RatingCalculator, FeatureConfigLoader
 from utils.mlb.fetch_advanced_stats_for_pitcher import PitcherAdvancedStats
 
+# Games of a slate analyzed at once; identical game-log/Statcast requests
+# from concurrent games are coalesced by utils.single_flight
+GAME_DETAIL_WORKERS = 4
+
 
 def fetch_game_details(game, df_pitch=None, features_cfg=None, season=None):
     """
@@ -45,7 +50,12 @@ def fetch_game_details(game, df_pitch=None, features_cfg=None, season=None):
         reg_start = date(season_year, 4, 1)
         pas.records = [r for r in pas.records if r[1] >= reg_start]
 
-        # If still no games, fall back to season-to-date
+        # If still no games, use stored season-to-date appearances before re-fetching
+        if not pas.records:
+            pas.records = pas.stored_records(start=reg_start, last_n=5)
+            if pas.records:
+                logging.info(
+                    f"[{game_id}] No recent RS games for {prob['fullName']}, using {len(pas.records)} stored appearances")
         if not pas.records:
             logging.info(
                 f"[{game_id}] No recent RS games for {prob['fullName']}, fetching season-to-date")
@@ -173,6 +183,17 @@ def fetch_game_details(game, df_pitch=None, features_cfg=None, season=None):
     return pitchers
 
 
+def fetch_slate_details(games, df_pitch=None, features_cfg=None, season=None,
+                        max_workers=GAME_DETAIL_WORKERS):
+    """
+    fetch_game_details for every game of a slate on a thread pool.
+    Returns one pitcher list per game, in the order of `games`.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        return list(pool.map(
+            lambda g: fetch_game_details(g, df_pitch, features_cfg, season), games))
+
+
 def main():
     cfg = load_config()
     logging.config.dictConfig(cfg.get("logging", {}))
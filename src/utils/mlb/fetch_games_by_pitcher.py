@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
-from pybaseball import statcast_pitcher
 import pandas as pd
+import requests
 import argparse
 from datetime import datetime, date, timedelta
 import sys
@@ -8,6 +8,8 @@ import logging.config
 
 from utils.config_loader import load_config
 from utils.helpers import FeatureConfigLoader
+from utils.mlb.pitcher_appearances import get_appearance_index
+from utils.single_flight import shared_frame
 
 # 1. Load YAML config
 cfg = load_config()
@@ -46,13 +48,35 @@ class FetchGamesByPitcher:
             self.start = max(self.start, self.today - timedelta(days=35))
 
     def fetch_games(self) -> list[tuple[int, date]]:
+        """
+        Unique (game_pk, game_date) appearances in the window, from the local
+        appearance index (refreshed from the Stats API game log at most once a
+        day). Falls back to the Statcast pitch pull if the Stats API is down.
+        """
+        index = get_appearance_index()
+        try:
+            index.refresh([self.pitcher_id], self.start, self.end)
+        except requests.RequestException as e:
+            logging.warning("Game log lookup failed for %s (%s); falling back to Statcast",
+                            self.pitcher_id, e)
+            return self.fetch_games_statcast()
+        games = index.appearances(self.pitcher_id, self.start, self.end)
+
+        logging.info("Found %d appearances for %s→%s: %s",
+                     len(games), self.start, self.end,
+                     [gd.isoformat() for _, gd in games])
+        return games
+
+    def fetch_games_statcast(self) -> list[tuple[int, date]]:
         """
         Pull every pitch by this pitcher in the window, then return unique (game_pk, game_date).
         """
+        from pybaseball import statcast_pitcher
+
         # pull every pitch for this pitcher in [start,end]
-        df = statcast_pitcher(self.start.strftime("%Y-%m-%d"),
-                              self.end.strftime("%Y-%m-%d"),
-                              self.pitcher_id)
+        start, end = self.start.strftime("%Y-%m-%d"), self.end.strftime("%Y-%m-%d")
+        df = shared_frame(("statcast_pitcher", start, end, self.pitcher_id),
+                          statcast_pitcher, start, end, self.pitcher_id)
 
         if df is None or df.empty:
             logging.info("No Statcast pitches for %s in %s→%s",
@@ -84,7 +108,7 @@ class FetchGamesByPitcher:
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
-        description="Fetch games pitched by an MLB pitcher via Statcast lookup."
+        description="Fetch games pitched by an MLB pitcher via the Stats API game log."
     )
     parser.add_argument("pitcher_id", type=int, help="MLBAM pitcher ID")
     parser.add_argument("--start", type=lambda s: datetime.fromisoformat(s).date(),
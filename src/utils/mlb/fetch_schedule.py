@@ -1,4 +1,4 @@
-import requests
+from utils.single_flight import get_json
 
 
 def fetch_schedule(date_str: str) -> list:
@@ -16,9 +16,8 @@ def fetch_schedule(date_str: str) -> list:
         f"sportId=1&date={date_str}&"
         f"hydrate=teams(team,previewPlayers),probablePitcher"
     )
-    response = requests.get(url)
-    response.raise_for_status()
-    data = response.json()
+    # Coalesced: concurrent callers for the same date share one request
+    data = get_json(url)
     # Navigate to games list safely
     dates = data.get("dates", [])
     if not dates:
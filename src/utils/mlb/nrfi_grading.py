@@ -0,0 +1,44 @@
+"""
+NRFI letter grades shared by the websheet renderer and the backtest engine.
+
+Grades are assigned from the calibrated NRFI probability on a 0–100 scale.
+"""
+import numpy as np
+
+# Grading thresholds: (minimum pct, letter, icon+action), highest first
+GRADE_THRESHOLDS = [
+    (98, 'A+', '✅ Elite NRFI Spot – Fire 3 Units'),
+    (94, 'A',  '✅ Strong NRFI Play – Confident 2–3 Units'),
+    (90, 'A-', '✅ Lean NRFI – 1–2 Unit Edge'),
+    (85, 'B+', '✅ Above-Average NRFI – Optional Lean'),
+    (80, 'B',  '⚠️ Slight Edge NRFI – Watchlist Only'),
+    (75, 'B-', '⚠️ Marginal NRFI – No Bet'),
+    (70, 'C+', '🚫 Toss-Up Zone – True 50/50, Avoid'),
+    (65, 'C',  '❌ Lean YRFI – Minor Offense/Contact Risk'),
+    (60, 'C-', '❌ Moderate YRFI Threat – Avoid NRFI'),
+]
+FALLBACK_GRADE = ('F', '❌ No Data')
+
+# Ascending views of the table for searchsorted
+_CUTS = np.array([t for t, _, _ in reversed(GRADE_THRESHOLDS)], dtype=float)
+_LETTERS = np.array([FALLBACK_GRADE[0]] + [g for _, g, _ in reversed(GRADE_THRESHOLDS)], dtype=object)
+_ACTIONS = np.array([FALLBACK_GRADE[1]] + [a for _, _, a in reversed(GRADE_THRESHOLDS)], dtype=object)
+GRADE_ORDER = [g for _, g, _ in GRADE_THRESHOLDS] + [FALLBACK_GRADE[0]]
+
+
+def assign_grade(pct):
+    """Return letter grade and icon/action for a probability pct (0–100 scale)."""
+    for thresh, letter, action in GRADE_THRESHOLDS:
+        if pct >= thresh:
+            return letter, action
+    return FALLBACK_GRADE
+
+
+def assign_grades(pcts):
+    """
+    Vectorized assign_grade: arrays of letters and actions for an array of pcts
+    (0–100 scale). NaN pcts get the fallback grade.
+    """
+    pcts = np.asarray(pcts, dtype=float)
+    idx = np.searchsorted(_CUTS, np.nan_to_num(pcts, nan=-np.inf), side='right')
+    return _LETTERS[idx], _ACTIONS[idx]
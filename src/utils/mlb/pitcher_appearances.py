@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Local index of pitcher appearances, filled from Stats API game logs.
+
+Finding which games a pitcher appeared in used to mean downloading every
+pitch he threw in the window (statcast_pitcher) and keeping the distinct
+(game_pk, game_date) pairs. The Stats API game log has the same answer in a
+few KB per pitcher, so appearances now come from
+
+  people?personIds=<id,id,...>&hydrate=stats(group=[pitching],type=[gameLog],season=...)
+
+(one request per PEOPLE_CHUNK pitchers per season) or from a schedule
+hydrated with probablePitcher(stats(gameLog)), and are kept in a CSV keyed
+by (pitcher_id, game_pk). A sidecar JSON records, per pitcher and season,
+the date that season's log was last pulled, so a pitcher-season is refreshed
+at most once per day (and a finished season never again once pulled after it
+ended), and pitch-level Statcast is only fetched for games missing from the
+pitcher game aggregate store.
+
+USAGE EXAMPLES:
+  # Refresh and list appearances for two pitchers over the last 30 days
+  python -m src.utils.mlb.pitcher_appearances 657277 669194 --days 30
+"""
+import argparse
+import json
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import pandas as pd
+
+from utils.config_loader import load_config
+from utils.mlb.stats_api import PEOPLE_CHUNK, PEOPLE_URL
+from utils.single_flight import get_json
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_APPEARANCES_PATH = "data/baseball/mlb/processed/pitcher_appearances.csv"
+INDEX_COLUMNS = ["pitcher_id", "game_pk", "game_date", "games_started", "innings_pitched"]
+
+
+def _gamelog_rows(pitcher_id: int, splits: Iterable[Mapping]) -> List[dict]:
+    rows = []
+    for split in splits:
+        game_pk = split.get("game", {}).get("gamePk")
+        if game_pk is None or not split.get("date"):
+            continue
+        stat = split.get("stat", {})
+        rows.append({
+            "pitcher_id": int(pitcher_id),
+            "game_pk": int(game_pk),
+            "game_date": datetime.fromisoformat(split["date"]).date(),
+            "games_started": int(stat.get("gamesStarted", 0) or 0),
+            "innings_pitched": stat.get("inningsPitched"),
+        })
+    return rows
+
+
+def _person_gamelog(person: Mapping) -> List[dict]:
+    rows = []
+    for block in person.get("stats", []):
+        if block.get("type", {}).get("displayName") == "gameLog":
+            rows.extend(_gamelog_rows(person["id"], block.get("splits", [])))
+    return rows
+
+
+def fetch_gamelog_appearances(pitcher_ids: Iterable[int], season: int, session=None,
+                              chunk: int = PEOPLE_CHUNK, timeout: float = 30.0) -> pd.DataFrame:
+    """Every appearance in `season` for the pitchers, ceil(len(ids) / chunk) requests."""
+    ids = sorted({int(pid) for pid in pitcher_ids})
+    rows = []
+    for i in range(0, len(ids), chunk):
+        params = {
+            "personIds": ",".join(map(str, ids[i:i + chunk])),
+            "hydrate": f"stats(group=[pitching],type=[gameLog],season={season})",
+        }
+        for person in get_json(PEOPLE_URL, params, session=session, timeout=timeout).get("people", []):
+            rows.extend(_person_gamelog(person))
+    return pd.DataFrame(rows, columns=INDEX_COLUMNS)
+
+
+def appearances_from_schedule(games: Sequence[Mapping]) -> pd.DataFrame:
+    """Appearances of the probables in a schedule hydrated with probablePitcher(stats(gameLog))."""
+    rows = []
+    for game in games:
+        for side in ("away", "home"):
+            prob = game.get("teams", {}).get(side, {}).get("probablePitcher")
+            if prob:
+                rows.extend(_person_gamelog(prob))
+    return pd.DataFrame(rows, columns=INDEX_COLUMNS)
+
+
+class PitcherAppearanceIndex:
+    """CSV-backed (pitcher_id, game_pk) -> game_date index with per-(pitcher, season) refresh dates."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.refreshed_path = self.path.with_suffix(".refreshed.json")
+        if self.path.exists():
+            self.df = pd.read_csv(self.path, parse_dates=["game_date"])
+            self.df["game_date"] = self.df["game_date"].dt.date
+        else:
+            self.df = pd.DataFrame(columns=INDEX_COLUMNS)
+        # {pitcher_id: {season: date that season's log was pulled}}
+        self.refreshed: Dict[int, Dict[int, date]] = {}
+        if self.refreshed_path.exists():
+            with open(self.refreshed_path, "r", encoding="utf-8") as f:
+                self.refreshed = {int(pid): {int(season): date.fromisoformat(v) for season, v in seasons.items()}
+                                  for pid, seasons in json.load(f).items()
+                                  if isinstance(seasons, dict)}  # older per-pitcher dates are re-pulled
+        self._dirty = False
+        # refresh() runs from the pipeline's per-game worker threads
+        self._lock = threading.RLock()
+
+    def season_covered(self, pitcher_id: int, season: int, end: date) -> bool:
+        """
+        True when the pitcher's `season` log was pulled on or after the last day
+        it can change through `end`: min(end, Dec 31 of season, today).
+        """
+        seen = self.refreshed.get(int(pitcher_id), {}).get(int(season))
+        return seen is not None and seen >= min(end, date(int(season), 12, 31), date.today())
+
+    def covers(self, pitcher_id: int, start: date, end: date) -> bool:
+        """True when every season from start to end is covered for the pitcher."""
+        return all(self.season_covered(pitcher_id, season, end) for season in range(start.year, end.year + 1))
+
+    def stale(self, pitcher_ids: Iterable[int], start: date, end: date) -> List[int]:
+        return sorted({int(p) for p in pitcher_ids if not self.covers(p, start, end)})
+
+    def add(self, appearances: pd.DataFrame, refreshed_ids: Iterable[int] = (),
+            seasons: Iterable[int] = None, as_of: date = None):
+        """
+        Merge appearances (newer rows win) and mark the seasons (default: as_of's)
+        of refreshed_ids as pulled as_of (default today).
+        """
+        as_of = as_of or date.today()
+        seasons = [as_of.year] if seasons is None else list(seasons)
+        with self._lock:
+            if not appearances.empty:
+                merged = pd.concat([self.df, appearances[INDEX_COLUMNS]], ignore_index=True)
+                merged["pitcher_id"] = merged["pitcher_id"].astype(int)
+                merged["game_pk"] = merged["game_pk"].astype(int)
+                self.df = merged.drop_duplicates(["pitcher_id", "game_pk"], keep="last")
+            for pid in refreshed_ids:
+                pulled = self.refreshed.setdefault(int(pid), {})
+                for season in seasons:
+                    pulled[int(season)] = max(as_of, pulled.get(int(season), as_of))
+            self._dirty = True
+
+    def refresh(self, pitcher_ids: Iterable[int], start: date, end: date, session=None) -> List[int]:
+        """
+        Pull each season's game logs from start to end for the pitchers not yet
+        covered in that season; returns every pitcher pulled for any season.
+        """
+        pulled = set()
+        seasons_pulled = 0
+        for season in range(start.year, end.year + 1):
+            stale = sorted({int(p) for p in pitcher_ids if not self.season_covered(p, season, end)})
+            if not stale:
+                continue
+            self.add(fetch_gamelog_appearances(stale, season, session=session), stale, seasons=[season])
+            pulled.update(stale)
+            seasons_pulled += 1
+        if pulled:
+            self.save()
+            logger.info("Refreshed game logs for %d pitcher(s) across %d season(s)", len(pulled), seasons_pulled)
+        return sorted(pulled)
+
+    def appearances(self, pitcher_id: int, start: date, end: date,
+                    starts_only: bool = False) -> List[Tuple[int, date]]:
+        """Sorted (game_pk, game_date) for the pitcher with start <= game_date <= end."""
+        df = self.df[(self.df["pitcher_id"] == int(pitcher_id))
+                     & (self.df["game_date"] >= start) & (self.df["game_date"] <= end)]
+        if starts_only:
+            df = df[df["games_started"] > 0]
+        df = df.sort_values("game_date")
+        return [(int(gp), gd) for gp, gd in zip(df["game_pk"], df["game_date"])]
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.df.sort_values(["pitcher_id", "game_date"]).to_csv(self.path, index=False)
+            with open(self.refreshed_path, "w", encoding="utf-8") as f:
+                json.dump({str(pid): {str(season): d.isoformat() for season, d in sorted(seasons.items())}
+                           for pid, seasons in sorted(self.refreshed.items())}, f, indent=2)
+            self._dirty = False
+
+
+@lru_cache(maxsize=None)
+def get_appearance_index(path: str = None) -> PitcherAppearanceIndex:
+    """Process-wide index at mlb_data.statcast.pitcher_appearances_csv, resolved against the project root."""
+    cfg = load_config()
+    if path is None:
+        path = cfg.get("mlb_data", {}).get("statcast", {}).get(
+            "pitcher_appearances_csv", DEFAULT_APPEARANCES_PATH)
+    path = Path(path)
+    if not path.is_absolute():
+        path = Path(cfg.get("root_path", ".")) / path
+    return PitcherAppearanceIndex(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh and list pitcher appearances from Stats API game logs.")
+    parser.add_argument("pitcher_ids", type=int, nargs="+", help="MLBAM pitcher IDs")
+    parser.add_argument("--days", type=int, default=30, help="Lookback window in days")
+    args = parser.parse_args()
+
+    end = date.today()
+    start = end - timedelta(days=args.days)
+    index = get_appearance_index()
+    index.refresh(args.pitcher_ids, start, end)
+    for pid in args.pitcher_ids:
+        games = index.appearances(pid, start, end)
+        print(f"{pid}: {len(games)} appearance(s) {[gd.isoformat() for _, gd in games]}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Per-pitcher per-game aggregate store.
+
+Each starter appearance is reduced once from Statcast pitch rows to counting
+stats (outs, K, BB, HBP, HR, fly balls, barrels, batted balls and first-inning
+outs/runs/hits/walks) and kept in a CSV keyed by (pitcher_id, game_pk). Games
+already in the store are never downloaded again, and recent-form metrics for a
+whole slate (last 5 starts, last 30 days, season) come from one vectorized
+groupby over the table.
+
+USAGE EXAMPLES:
+  # Recent form for two pitchers as of a date
+  python -m src.utils.mlb.pitcher_game_aggregates 657277 669194 --as-of 2025-07-01
+"""
+import argparse
+import logging
+import threading
+from functools import lru_cache
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from utils.config_loader import load_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PITCHER_GAMES_PATH = "data/baseball/mlb/processed/pitcher_game_aggregates.csv"
+COUNT_COLUMNS = ["outs", "k", "bb", "hbp", "hr", "fb", "barrels", "batted",
+                 "f1_outs", "f1_r", "f1_h", "f1_bb"]
+STORE_COLUMNS = ["pitcher_id", "game_pk", "game_date"] + COUNT_COLUMNS
+
+# Outs recorded on the plate appearance's final pitch
+OUTS_ON_EVENT = {
+    "strikeout": 1, "field_out": 1, "force_out": 1, "fielders_choice_out": 1,
+    "sac_fly": 1, "sac_bunt": 1, "other_out": 1,
+    "grounded_into_double_play": 2, "double_play": 2, "strikeout_double_play": 2,
+    "sac_fly_double_play": 2, "sac_bunt_double_play": 2, "triple_play": 3,
+}
+HIT_EVENTS = {"single", "double", "triple", "home_run"}
+WALK_EVENTS = {"walk", "intent_walk"}
+
+# xFIP constants used throughout the project
+LG_HR_PER_FB = 0.105
+FIP_CONSTANT = 3.20
+
+
+def summarize_pitcher_game(df_p: pd.DataFrame) -> dict:
+    """Counting stats for one pitcher in one game from his Statcast pitch rows."""
+    events = df_p["events"].fillna("") if "events" in df_p.columns else pd.Series("", index=df_p.index)
+    in_play = df_p["type"].eq("X") if "type" in df_p.columns else df_p["launch_speed"].notna()
+    first = df_p["inning"].eq(1) if "inning" in df_p.columns else pd.Series(False, index=df_p.index)
+    outs = events.map(OUTS_ON_EVENT).fillna(0)
+    runs = (df_p["post_bat_score"] - df_p["bat_score"]).clip(lower=0).fillna(0) \
+        if {"post_bat_score", "bat_score"} <= set(df_p.columns) else pd.Series(0, index=df_p.index)
+    bb_type = df_p["bb_type"] if "bb_type" in df_p.columns else pd.Series(None, index=df_p.index)
+    barrel = df_p["launch_speed_angle"].eq(6) if "launch_speed_angle" in df_p.columns \
+        else pd.Series(False, index=df_p.index)
+
+    return {
+        "outs": int(outs.sum()),
+        "k": int(events.isin({"strikeout", "strikeout_double_play"}).sum()),
+        "bb": int(events.isin(WALK_EVENTS).sum()),
+        "hbp": int(events.eq("hit_by_pitch").sum()),
+        "hr": int(events.eq("home_run").sum()),
+        "fb": int((in_play & bb_type.isin({"fly_ball", "popup"})).sum()),
+        "barrels": int((in_play & barrel).sum()),
+        "batted": int(in_play.sum()),
+        "f1_outs": int(outs[first].sum()),
+        "f1_r": int(runs[first].sum()),
+        "f1_h": int(events[first].isin(HIT_EVENTS).sum()),
+        "f1_bb": int(events[first].isin(WALK_EVENTS).sum()),
+    }
+
+
+def xfip_from_counts(fb, bb, hbp, k, outs):
+    """xFIP from counting stats; NaN when no outs were recorded. Works on scalars or Series."""
+    ip = np.asarray(outs, dtype=float) / 3.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xfip = (13 * np.asarray(fb) * LG_HR_PER_FB + 3 * (np.asarray(bb) + np.asarray(hbp))
+                - 2 * np.asarray(k)) / ip + FIP_CONSTANT
+    return np.where(ip > 0, xfip, np.nan)
+
+
+def barrel_pct_from_counts(barrels, batted):
+    batted = np.asarray(batted, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(batted > 0, np.asarray(barrels) / batted * 100.0, np.nan)
+
+
+class PitcherGameAggregates:
+    """CSV-backed (pitcher_id, game_pk) -> counting stats table with rolling-window queries."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        if self.path.exists():
+            self.df = pd.read_csv(self.path, parse_dates=["game_date"])
+            self.df["game_date"] = self.df["game_date"].dt.date
+        else:
+            self.df = pd.DataFrame(columns=STORE_COLUMNS)
+        self._keys = set(zip(self.df["pitcher_id"].astype(int), self.df["game_pk"].astype(int)))
+        self._dirty = False
+        # add()/save() are called from the pipeline's per-game worker threads
+        self._lock = threading.RLock()
+        logger.debug("Loaded %d pitcher games from %s", len(self.df), self.path)
+
+    def has(self, pitcher_id: int, game_pk: int) -> bool:
+        return (int(pitcher_id), int(game_pk)) in self._keys
+
+    def get(self, pitcher_id: int, game_pk: int) -> dict:
+        row = self.df[(self.df["pitcher_id"] == int(pitcher_id)) & (self.df["game_pk"] == int(game_pk))]
+        return row.iloc[0].to_dict() if not row.empty else {}
+
+    def add(self, pitcher_id: int, game_pk: int, game_date: date, counts: dict):
+        """Add one appearance; already-stored games are left untouched."""
+        key = (int(pitcher_id), int(game_pk))
+        row = {"pitcher_id": key[0], "game_pk": key[1], "game_date": game_date, **counts}
+        with self._lock:
+            if key in self._keys:
+                return
+            self.df = pd.concat([self.df, pd.DataFrame([row], columns=STORE_COLUMNS)], ignore_index=True)
+            self._keys.add(key)
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.df.sort_values(["pitcher_id", "game_date"]).to_csv(self.path, index=False)
+            self._dirty = False
+            logger.info("Saved %d pitcher games to %s", len(self.df), self.path)
+
+    # ------------------------------------------------------------------ queries
+    def games(self, pitcher_ids: Iterable[int], before: date = None, start: date = None) -> pd.DataFrame:
+        """Stored appearances for the pitchers, optionally restricted to start <= date < before."""
+        df = self.df[self.df["pitcher_id"].isin([int(p) for p in pitcher_ids])]
+        if start is not None:
+            df = df[df["game_date"] >= start]
+        if before is not None:
+            df = df[df["game_date"] < before]
+        return df.sort_values(["pitcher_id", "game_date"])
+
+    @staticmethod
+    def _metrics(sums: pd.DataFrame) -> pd.DataFrame:
+        ip = sums["outs"] / 3.0
+        f1_ip = sums["f1_outs"] / 3.0
+        out = pd.DataFrame(index=sums.index)
+        out["games"] = sums["games"]
+        out["ip"] = ip.round(1)
+        out["xfip"] = xfip_from_counts(sums["fb"], sums["bb"], sums["hbp"], sums["k"], sums["outs"])
+        out["barrel_pct"] = barrel_pct_from_counts(sums["barrels"], sums["batted"])
+        out["f1_era"] = (9 * sums["f1_r"] / f1_ip).where(f1_ip > 0)
+        out["f1_whip"] = ((sums["f1_h"] + sums["f1_bb"]) / f1_ip).where(f1_ip > 0)
+        return out
+
+    def rolling(self, pitcher_ids: Iterable[int], as_of: date, last_n: int = None,
+                days: int = None, start: date = None) -> pd.DataFrame:
+        """
+        Aggregate metrics per pitcher over games before as_of: the last_n appearances,
+        the last `days` days, and/or games on or after start (e.g. season start).
+        """
+        if days is not None:
+            window_start = as_of - timedelta(days=days)
+            start = max(start, window_start) if start else window_start
+        df = self.games(pitcher_ids, before=as_of, start=start)
+        if last_n is not None:
+            df = df.groupby("pitcher_id").tail(last_n)
+        sums = df.groupby("pitcher_id")[COUNT_COLUMNS].sum()
+        sums["games"] = df.groupby("pitcher_id").size()
+        return self._metrics(sums)
+
+    def recent_form(self, pitcher_ids: Iterable[int], as_of: date, season_start: date = None) -> pd.DataFrame:
+        """L5 starts, L30 days and season-to-date metrics for a slate of pitchers, one row each."""
+        season_start = season_start or date(as_of.year, 4, 1)
+        frames = {
+            "l5": self.rolling(pitcher_ids, as_of, last_n=5, start=season_start),
+            "l30": self.rolling(pitcher_ids, as_of, days=30),
+            "season": self.rolling(pitcher_ids, as_of, start=season_start),
+        }
+        out = pd.concat(frames, axis=1)
+        out.columns = [f"{window}_{metric}" for window, metric in out.columns]
+        return out
+
+
+@lru_cache(maxsize=None)
+def get_pitcher_game_store(path: str = None) -> PitcherGameAggregates:
+    """Process-wide store at mlb_data.statcast.pitcher_games_csv, resolved against the project root."""
+    cfg = load_config()
+    if path is None:
+        path = cfg.get("mlb_data", {}).get("statcast", {}).get(
+            "pitcher_games_csv", DEFAULT_PITCHER_GAMES_PATH)
+    path = Path(path)
+    if not path.is_absolute():
+        path = Path(cfg.get("root_path", ".")) / path
+    return PitcherGameAggregates(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query per-pitcher recent form from the game aggregate store.")
+    parser.add_argument("pitcher_ids", type=int, nargs="+", help="MLBAM pitcher IDs")
+    parser.add_argument("--as-of", type=lambda s: datetime.fromisoformat(s).date(),
+                        default=date.today(), help="YYYY-MM-DD (default: today)")
+    args = parser.parse_args()
+    store = get_pitcher_game_store()
+    print(store.recent_form(args.pitcher_ids, args.as_of).round(2).to_string())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
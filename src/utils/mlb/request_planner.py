@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Pre-execution request planner for the daily MLB RFI run.
+
+Given the day's schedule, lists every external resource the run needs
+before anything is fetched. Each resource is keyed by (kind, key), so the
+same game needed by both starters, or a batter listed twice on a
+doubleheader day, is planned once. Anything already held locally is marked
+cached:
+
+  schedule           the schedule itself (already fetched to build the plan)
+  team_codes         team identities (local registry file)
+  season_pitching    pybaseball pitching_stats for the season fallback
+  fangraphs_splits   1st-inning wRC+ splits (artifact catalog, <= 7 days old)
+  pitcher_game_logs  per-pitcher appearance windows (appearance index)
+  statcast           per-game pitch data (pitcher game aggregate store)
+  lineups            top-of-order batter stats (batched people hydrate)
+
+First-inning linescores are not part of the daily run; the augment step
+fetches them later, after the games are final.
+
+The request estimate follows how each kind is actually fetched: people
+lookups are batched PEOPLE_CHUNK ids per request, and Statcast follows the
+date-level plan from statcast_slate_planner. Statcast for pitchers whose
+game logs are stale can only be planned after those logs are refreshed, so
+it is reported separately.
+
+run_prefetch() executes the network-bound part of the plan: lineups run
+concurrently with the game-log refresh and the Statcast pulls that depend
+on it, and those pulls (date ranges and single games) are fanned out over
+STATCAST_WORKERS threads.
+
+USAGE EXAMPLES:
+  # Print the plan and request estimate for a date
+  python -m src.utils.mlb.request_planner --date 2025-07-01
+"""
+import argparse
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import pandas as pd
+
+from utils.artifact_catalog import FANGRAPHS_SPLITS_1ST_INNING, get_catalog
+from utils.mlb.pitcher_appearances import get_appearance_index
+from utils.mlb.pitcher_game_aggregates import get_pitcher_game_store
+from utils.mlb.slate_lineups import slate_lineups, top_of_order
+from utils.mlb.statcast_slate_planner import (
+    LOOKBACK_DAYS, MIN_GAMES_PER_DATE, STATCAST_WORKERS, date_ranges, prefetch_slate_statcast,
+    slate_appearances)
+from utils.mlb.stats_api import PEOPLE_CHUNK
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE = "schedule"
+TEAM_CODES = "team_codes"
+SEASON_PITCHING = "season_pitching"
+FANGRAPHS_SPLITS = "fangraphs_splits"
+PITCHER_GAME_LOGS = "pitcher_game_logs"
+STATCAST = "statcast"
+LINEUPS = "lineups"
+KIND_ORDER = [SCHEDULE, TEAM_CODES, SEASON_PITCHING, FANGRAPHS_SPLITS, PITCHER_GAME_LOGS,
+              STATCAST, LINEUPS]
+BATCHED_KINDS = {PITCHER_GAME_LOGS: PEOPLE_CHUNK, LINEUPS: PEOPLE_CHUNK}
+
+
+@dataclass
+class PlannedFetch:
+    kind: str
+    key: str
+    cached: bool = False
+    group: Optional[str] = None    # batch group (season) or Statcast game date
+    detail: str = ""
+
+
+class RequestPlan:
+    """Coalesced set of resources for a run, with a per-kind request estimate."""
+
+    def __init__(self):
+        self._items: Dict[tuple, PlannedFetch] = {}
+        self.duplicates = 0
+        self.unplanned_statcast: List[int] = []
+
+    def add(self, kind: str, key, cached: bool = False, group=None, detail: str = "") -> PlannedFetch:
+        ident = (kind, str(key))
+        if ident in self._items:
+            self.duplicates += 1
+            return self._items[ident]
+        item = PlannedFetch(kind, str(key), cached, None if group is None else str(group), detail)
+        self._items[ident] = item
+        return item
+
+    def items(self, kind: str = None) -> List[PlannedFetch]:
+        return [it for it in self._items.values() if kind is None or it.kind == kind]
+
+    def pending(self, kind: str = None) -> List[PlannedFetch]:
+        return [it for it in self.items(kind) if not it.cached]
+
+    def estimated_requests(self, kind: str) -> int:
+        pending = self.pending(kind)
+        if kind in BATCHED_KINDS:
+            groups = defaultdict(int)
+            for it in pending:
+                groups[it.group] += 1
+            return sum(-(-n // BATCHED_KINDS[kind]) for n in groups.values())
+        if kind == STATCAST:
+            per_date = defaultdict(int)
+            for it in pending:
+                per_date[it.group] += 1
+            bulk = [date.fromisoformat(d) for d, n in per_date.items() if n >= MIN_GAMES_PER_DATE]
+            singles = sum(n for n in per_date.values() if n < MIN_GAMES_PER_DATE)
+            return len(date_ranges(bulk)) + singles
+        return len(pending)
+
+    def total_requests(self) -> int:
+        return sum(self.estimated_requests(kind) for kind in KIND_ORDER)
+
+    def summary(self) -> pd.DataFrame:
+        rows = []
+        for kind in KIND_ORDER:
+            items = self.items(kind)
+            if items:
+                rows.append({"kind": kind, "resources": len(items), "cached": len(items) - len(self.pending(kind)),
+                             "requests": self.estimated_requests(kind)})
+        return pd.DataFrame(rows, columns=["kind", "resources", "cached", "requests"]).set_index("kind")
+
+    def describe(self) -> str:
+        lines = [self.summary().to_string(), "",
+                 f"Estimated requests: {self.total_requests()} "
+                 f"({self.duplicates} duplicate resource(s) coalesced)"]
+        if self.unplanned_statcast:
+            lines.append(f"Statcast for {len(self.unplanned_statcast)} pitcher(s) is planned after their "
+                         f"game logs refresh: {self.unplanned_statcast}")
+        return "\n".join(lines)
+
+
+def probable_pitcher_ids(games: Sequence[Mapping]) -> List[int]:
+    return [g["teams"][side]["probablePitcher"]["id"] for g in games
+            for side in ("away", "home") if g.get("teams", {}).get(side, {}).get("probablePitcher")]
+
+
+def build_slate_plan(games: Sequence[Mapping], run_date: date, season: int = None,
+                     index=None, store=None, catalog=None,
+                     lookback_days: int = LOOKBACK_DAYS) -> RequestPlan:
+    """Every external resource the run for run_date needs, minus what is already local."""
+    season = season or run_date.year
+    index = index or get_appearance_index()
+    store = store or get_pitcher_game_store()
+    catalog = catalog or get_catalog()
+    plan = RequestPlan()
+
+    plan.add(SCHEDULE, run_date.isoformat(), cached=True, detail="fetched to build the plan")
+    plan.add(TEAM_CODES, "registry", cached=True, detail="local team registry")
+    plan.add(SEASON_PITCHING, season)
+    splits = catalog.resolve(FANGRAPHS_SPLITS_1ST_INNING, run_date, season=season, max_age_days=7)
+    plan.add(FANGRAPHS_SPLITS, season, cached=splits is not None,
+             detail=splits.path if splits is not None else "")
+
+    start = run_date - timedelta(days=lookback_days)
+    covered = []
+    for pid in probable_pitcher_ids(games):
+        for yr in range(start.year, run_date.year + 1):
+            plan.add(PITCHER_GAME_LOGS, f"{pid}@{yr}", cached=index.season_covered(pid, yr, run_date), group=yr)
+        if index.covers(pid, start, run_date):
+            covered.append(pid)
+        elif pid not in plan.unplanned_statcast:
+            plan.unplanned_statcast.append(pid)
+
+    # Both starters of a game map to the same per-game resource; it is cached
+    # only when every slate pitcher who appeared in it is already stored
+    for pid, game_pk, game_date in slate_appearances(covered, start, run_date, index):
+        item = plan.add(STATCAST, game_pk, cached=True, group=game_date.isoformat())
+        item.cached = item.cached and store.has(pid, game_pk)
+
+    for game in games:
+        for batters in top_of_order(game).values():
+            for b in batters:
+                if b["id"] is not None:
+                    plan.add(LINEUPS, b["id"], group=season)
+    return plan
+
+
+def run_prefetch(games: Sequence[Mapping], run_date: date, season: int = None,
+                 lookback_days: int = LOOKBACK_DAYS, max_workers: int = 2,
+                 statcast_workers: int = STATCAST_WORKERS) -> pd.DataFrame:
+    """
+    Execute the network-bound part of the plan. Lineup hydration runs concurrently with the
+    game-log refresh -> Statcast chain, whose downloads use statcast_workers threads.
+    Returns the slate lineups (empty if that pull failed).
+    """
+    season = season or run_date.year
+    pids = probable_pitcher_ids(games)
+
+    def pitchers():
+        get_appearance_index().refresh(pids, run_date - timedelta(days=lookback_days), run_date)
+        return prefetch_slate_statcast(pids, run_date, lookback_days, max_workers=statcast_workers)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        lineups = pool.submit(slate_lineups, games, season)
+        statcast = pool.submit(pitchers)
+        try:
+            statcast.result()
+        except Exception as e:
+            logger.error("Slate game-log/Statcast prefetch failed, falling back to per-game pulls: %s", e)
+        try:
+            return lineups.result()
+        except Exception as e:
+            logger.error("Failed to load projected lineups: %s", e)
+            return pd.DataFrame()
+
+
+def main():
+    from utils.mlb.fetch_schedule import fetch_schedule
+
+    parser = argparse.ArgumentParser(description="Plan the external requests for a daily MLB RFI run.")
+    parser.add_argument("--date", type=lambda s: datetime.fromisoformat(s).date(), default=date.today(),
+                        help="Run date YYYY-MM-DD (default: today)")
+    args = parser.parse_args()
+    games = fetch_schedule(args.date.isoformat())
+    print(build_slate_plan(games, args.date).describe())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Slate-level projected top-of-order batters with batched stat hydration.
+
+The schedule the pipeline already fetched (hydrated with previewPlayers) has
+every game's projected lineup, so the lineup service never re-reads it: it
+collects the top-3 batter ids of every game on the slate and pulls their
+season and recent hitting lines through batched
+
+  people?personIds=<id,id,...>&hydrate=stats(group=[hitting],type=[season,lastXGames],...)
+
+requests (PEOPLE_CHUNK ids per call), so a full slate costs one or two
+requests instead of six per game.
+
+USAGE EXAMPLES:
+  # Top of the order for today's slate
+  python -m src.utils.mlb.slate_lineups
+
+  # A specific date, recent form over the last 10 games
+  python -m src.utils.mlb.slate_lineups --date 2025-07-01 --recent-games 10
+"""
+import argparse
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+import pandas as pd
+
+from utils.mlb.stats_api import PEOPLE_CHUNK, PEOPLE_URL
+from utils.single_flight import get_json
+
+logger = logging.getLogger(__name__)
+
+TOP_N = 3
+RECENT_GAMES = 14
+STAT_FIELDS = ("avg", "obp", "slg", "ops", "homeRuns", "plateAppearances")
+
+
+def top_of_order(game: Mapping, n: int = TOP_N) -> Dict[str, List[dict]]:
+    """{side: first n projected batters} from a previewPlayers-hydrated schedule game."""
+    lineup = {}
+    for side in ("away", "home"):
+        preview = game.get("teams", {}).get(side, {}).get("previewPlayers", [])
+        ordered = sorted((p for p in preview if p.get("battingOrder") is not None),
+                         key=lambda p: int(p["battingOrder"]))
+        lineup[side] = [{
+            "order": i + 1,
+            "id": p.get("person", {}).get("id"),
+            "name": p.get("person", {}).get("fullName"),
+            "position": p.get("position", {}).get("abbreviation"),
+        } for i, p in enumerate(ordered[:n])]
+    return lineup
+
+
+def _stats_hydrate(season: int, recent_games: int) -> str:
+    return f"stats(group=[hitting],type=[season,lastXGames],limit={recent_games},season={season})"
+
+
+def _split_stats(person: Mapping) -> Dict[str, dict]:
+    """{'season': stat, 'recent': stat} from a hydrated person record."""
+    out = {}
+    for block in person.get("stats", []):
+        kind = block.get("type", {}).get("displayName")
+        splits = block.get("splits", [])
+        if not splits:
+            continue
+        if kind == "season":
+            out["season"] = splits[0].get("stat", {})
+        elif kind == "lastXGames":
+            out["recent"] = splits[0].get("stat", {})
+    return out
+
+
+def fetch_people_stats(person_ids: Iterable[int], season: int, recent_games: int = RECENT_GAMES,
+                       session=None, chunk: int = PEOPLE_CHUNK, timeout: float = 30.0) -> Dict[int, dict]:
+    """{person_id: {'season': stat, 'recent': stat}} in ceil(len(ids) / chunk) requests."""
+    ids = sorted({int(pid) for pid in person_ids if pid is not None})
+    stats = {}
+    for i in range(0, len(ids), chunk):
+        batch = ids[i:i + chunk]
+        params = {"personIds": ",".join(map(str, batch)), "hydrate": _stats_hydrate(season, recent_games)}
+        for person in get_json(PEOPLE_URL, params, session=session, timeout=timeout).get("people", []):
+            stats[person["id"]] = _split_stats(person)
+    logger.info("Hydrated hitting stats for %d batters in %d request(s)",
+                len(ids), -(-len(ids) // chunk) if ids else 0)
+    return stats
+
+
+def slate_lineups(games: Sequence[Mapping], season: int, n: int = TOP_N,
+                  recent_games: int = RECENT_GAMES, session=None) -> pd.DataFrame:
+    """
+    One row per projected top-of-order batter on the slate: game_id, side,
+    order, id, name, position, season_<stat> and recent_<stat> for STAT_FIELDS.
+    """
+    rows = []
+    for game in games:
+        for side, batters in top_of_order(game, n).items():
+            for b in batters:
+                rows.append({"game_id": game.get("gamePk"), "side": side, **b})
+    columns = ["game_id", "side", "order", "id", "name", "position"] + [
+        f"{scope}_{field}" for scope in ("season", "recent") for field in STAT_FIELDS]
+    if not rows:
+        return pd.DataFrame(columns=columns)
+
+    stats = fetch_people_stats((r["id"] for r in rows), season, recent_games, session=session)
+    for r in rows:
+        person = stats.get(r["id"], {})
+        for scope in ("season", "recent"):
+            line = person.get(scope, {})
+            for field in STAT_FIELDS:
+                r[f"{scope}_{field}"] = line.get(field)
+    df = pd.DataFrame(rows, columns=columns)
+    for col in columns[6:]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def lineup_features(lineups: pd.DataFrame) -> Dict[tuple, dict]:
+    """{(game_id, side): top-of-order season/recent OPS averages} for the game summary."""
+    if lineups.empty:
+        return {}
+    means = lineups.groupby(["game_id", "side"])[["season_ops", "recent_ops"]].mean()
+    counts = lineups.groupby(["game_id", "side"]).size()
+
+    def fmt(v):
+        return round(float(v), 3) if pd.notna(v) else "NA"
+
+    return {key: {"top3_season_ops": fmt(row["season_ops"]), "top3_recent_ops": fmt(row["recent_ops"]),
+                  "top3_batters": int(counts[key])}
+            for key, row in means.iterrows()}
+
+
+def main():
+    from utils.mlb.fetch_schedule import fetch_schedule
+
+    parser = argparse.ArgumentParser(description="Projected top-of-order batters for a slate.")
+    parser.add_argument("--date", default=datetime.now().strftime("%Y-%m-%d"), help="Slate date YYYY-MM-DD")
+    parser.add_argument("--recent-games", type=int, default=RECENT_GAMES)
+    args = parser.parse_args()
+
+    games = fetch_schedule(args.date)
+    df = slate_lineups(games, int(args.date[:4]), recent_games=args.recent_games)
+    if df.empty:
+        print(f"No projected lineups for {args.date}")
+        return
+    print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
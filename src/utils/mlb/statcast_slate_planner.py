@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Slate-level Statcast download planner.
+
+PitcherAdvancedStats.analyze downloads each uncached appearance with
+statcast_single_game, one pitcher at a time, so a game both of whose
+starters are on today's slate is pulled twice, and several starters who
+pitched on the same day pull that day game by game. This planner works
+across the whole slate first:
+
+  1. list every (pitcher, game) appearance in the window from the
+     appearance index, and drop the ones already in the pitcher game
+     aggregate store
+  2. group what's left by date, and fetch each date once with a date-range
+     statcast() query (consecutive dates are merged into one range). Dates
+     needing fewer than MIN_GAMES_PER_DATE games use statcast_single_game,
+     which is smaller than a full day of pitches. The ranges and single
+     games are independent and are downloaded on up to STATCAST_WORKERS
+     threads
+  3. split the pitch rows locally by (game_pk, pitcher) and reduce them into
+     the store, so every later analyze() is a store hit
+
+USAGE EXAMPLES:
+  # Warm the store for today's probables (last 35 days)
+  python -m src.utils.mlb.statcast_slate_planner
+
+  # Show the plan for a date without downloading
+  python -m src.utils.mlb.statcast_slate_planner --date 2025-07-01 --dry-run
+"""
+import argparse
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+import pandas as pd
+
+from utils.mlb.pitcher_appearances import PitcherAppearanceIndex, get_appearance_index
+from utils.mlb.pitcher_game_aggregates import (
+    PitcherGameAggregates, get_pitcher_game_store, summarize_pitcher_game)
+from utils.single_flight import shared_frame
+
+logger = logging.getLogger(__name__)
+
+LOOKBACK_DAYS = 35
+MIN_GAMES_PER_DATE = 2
+STATCAST_WORKERS = 4
+
+
+def plan_statcast_dates(appearances: Iterable[Tuple[int, int, date]],
+                        store: PitcherGameAggregates = None) -> Dict[date, Dict[int, Set[int]]]:
+    """{game_date: {game_pk: {pitcher_id, ...}}} for appearances missing from the store."""
+    plan = defaultdict(lambda: defaultdict(set))
+    for pitcher_id, game_pk, game_date in appearances:
+        if store is not None and store.has(pitcher_id, game_pk):
+            continue
+        plan[game_date][int(game_pk)].add(int(pitcher_id))
+    return {d: dict(games) for d, games in sorted(plan.items())}
+
+
+def date_ranges(dates: Iterable[date]) -> List[Tuple[date, date]]:
+    """Collapse dates into inclusive runs of consecutive days."""
+    ranges = []
+    for d in sorted(set(dates)):
+        if ranges and d - ranges[-1][1] == timedelta(days=1):
+            ranges[-1] = (ranges[-1][0], d)
+        else:
+            ranges.append((d, d))
+    return ranges
+
+
+def slate_appearances(pitcher_ids: Iterable[int], start: date, end: date,
+                      index: PitcherAppearanceIndex = None) -> List[Tuple[int, int, date]]:
+    index = index or get_appearance_index()
+    return [(int(pid), gp, gd) for pid in set(pitcher_ids) for gp, gd in index.appearances(pid, start, end)]
+
+
+def fetch_statcast_range(start: date, end: date) -> pd.DataFrame:
+    """League-wide pitches for start..end; concurrent identical pulls share one download."""
+    from pybaseball import statcast
+    return shared_frame(("statcast", start.isoformat(), end.isoformat()),
+                        statcast, start_dt=start.isoformat(), end_dt=end.isoformat())
+
+
+def fetch_statcast_game(game_pk: int) -> pd.DataFrame:
+    """One game's pitches; both starters' workers asking at once share one download."""
+    from pybaseball import statcast_single_game
+    return shared_frame(("statcast_single_game", int(game_pk)), statcast_single_game, int(game_pk))
+
+
+def execute_plan(plan: Dict[date, Dict[int, Set[int]]], store: PitcherGameAggregates,
+                 fetch_range: Callable = fetch_statcast_range, fetch_game: Callable = fetch_statcast_game,
+                 min_games_per_date: int = MIN_GAMES_PER_DATE, max_workers: int = STATCAST_WORKERS) -> dict:
+    """
+    Download the planned dates/games (concurrently, on up to max_workers threads),
+    reduce each needed (pitcher, game) into the store and save it. Returns
+    request and game counts.
+    """
+    bulk = [d for d, games in plan.items() if len(games) >= min_games_per_date]
+    single = [(d, gp) for d, games in plan.items() if len(games) < min_games_per_date for gp in games]
+
+    downloads = []
+    for lo, hi in date_ranges(bulk):
+        logger.info("Statcast %s→%s for %d game(s)", lo, hi,
+                    sum(len(plan[d]) for d in bulk if lo <= d <= hi))
+        downloads.append((fetch_range, (lo, hi)))
+    downloads += [(fetch_game, (gp,)) for _, gp in single]
+    # Store updates stay on this thread; only the downloads run in the pool
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(downloads) or 1))) as pool:
+        frames = list(pool.map(lambda job: job[0](*job[1]), downloads))
+    frames = [f for f in frames if f is not None and not f.empty]
+    pitches = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["game_pk", "pitcher"])
+
+    wanted = {(gp, pid): d for d, games in plan.items() for gp, pids in games.items() for pid in pids}
+    added = 0
+    if not pitches.empty:
+        for (gp, pid), df_p in pitches.groupby(["game_pk", "pitcher"], sort=False):
+            key = (int(gp), int(pid))
+            if key in wanted:
+                store.add(key[1], key[0], wanted[key], summarize_pitcher_game(df_p))
+                added += 1
+    store.save()
+    stats = {"requests": len(date_ranges(bulk)) + len(single), "games": sum(len(g) for g in plan.values()),
+             "pitcher_games": len(wanted), "added": added}
+    logger.info("Statcast slate plan done: %s", stats)
+    return stats
+
+
+def prefetch_slate_statcast(pitcher_ids: Iterable[int], end: date = None, days: int = LOOKBACK_DAYS,
+                            store: PitcherGameAggregates = None, index: PitcherAppearanceIndex = None,
+                            **kwargs) -> dict:
+    """Plan and execute the Statcast downloads for a slate's starters over the last `days` days."""
+    end = end or date.today()
+    start = end - timedelta(days=days)
+    store = store or get_pitcher_game_store()
+    plan = plan_statcast_dates(slate_appearances(pitcher_ids, start, end, index), store)
+    if not plan:
+        logger.info("Statcast slate plan: every appearance already stored")
+        return {"requests": 0, "games": 0, "pitcher_games": 0, "added": 0}
+    return execute_plan(plan, store, **kwargs)
+
+
+def main():
+    from utils.mlb.fetch_schedule import fetch_schedule
+
+    parser = argparse.ArgumentParser(description="Warm the pitcher game store for a slate with date-level Statcast pulls.")
+    parser.add_argument("--date", type=lambda s: datetime.fromisoformat(s).date(), default=date.today(),
+                        help="Slate date YYYY-MM-DD (default: today)")
+    parser.add_argument("--days", type=int, default=LOOKBACK_DAYS)
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without downloading")
+    args = parser.parse_args()
+
+    games = fetch_schedule(args.date.isoformat())
+    pids = [g["teams"][s]["probablePitcher"]["id"] for g in games
+            for s in ("away", "home") if g["teams"][s].get("probablePitcher")]
+    start = args.date - timedelta(days=args.days)
+    index = get_appearance_index()
+    index.refresh(pids, start, args.date)
+    if args.dry_run:
+        plan = plan_statcast_dates(slate_appearances(pids, start, args.date, index), get_pitcher_game_store())
+        for d, planned in plan.items():
+            print(f"{d}: {len(planned)} game(s) {sorted(planned)}")
+        print(f"{len(plan)} date(s) to download")
+        return
+    print(prefetch_slate_statcast(pids, args.date, args.days, index=index))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Shared MLB Stats API endpoints and batching limits.
+
+The people endpoint comes from api.mlb.people in config.yaml (next to the
+other api.mlb URLs); PEOPLE_CHUNK is how many personIds one hydrated people
+request carries.
+"""
+from utils.config_loader import load_config
+
+DEFAULT_PEOPLE_URL = "https://statsapi.mlb.com/api/v1/people"
+PEOPLE_URL = load_config().get("api", {}).get("mlb", {}).get("people", DEFAULT_PEOPLE_URL)
+PEOPLE_CHUNK = 100
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Daily per-team first-inning batting aggregates (the inputs to wOBA3).
+
+Instead of recomputing wOBA3 from raw Statcast pitch rows for every lookback
+window, each finished game date is reduced once to one row per
+(date, batting team, home/away, pitcher hand) holding the sums of woba_value,
+woba_denom and the plate-appearance count. Rows are appended to a CSV and only
+dates not yet fetched are downloaded on later runs.
+
+Any window (7d, 14d, 30d, season, or an as-of value in the past) is then a
+difference of two cumulative-sum rows per team.
+
+USAGE EXAMPLES:
+  # Fetch any missing dates for the season so far and print 14-day wOBA3
+  python -m src.utils.mlb.team_first_inning_aggregates --days 14
+
+  # 7-day wOBA3 against left-handed starters, as of a past date
+  python -m src.utils.mlb.team_first_inning_aggregates --days 7 --as-of 2025-07-01 --p-throws L
+"""
+import argparse
+import json
+import logging
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from utils.config_loader import load_config
+from utils.mlb.team_registry import get_team_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AGGREGATES_PATH = "data/baseball/mlb/processed/team_first_inning_daily.csv"
+AGG_COLUMNS = ["game_date", "team", "side", "p_throws", "woba_sum", "woba_denom", "pa"]
+SUM_COLUMNS = ["woba_sum", "woba_denom", "pa"]
+
+
+def aggregate_first_inning(df: pd.DataFrame, registry=None) -> pd.DataFrame:
+    """
+    Reduce raw Statcast pitch rows to per (game_date, team, side, p_throws) sums.
+    The batting team is the away team in the top half and the home team in the bottom.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=AGG_COLUMNS)
+    registry = registry or get_team_registry()
+
+    first = df[(df["inning"] == 1) & df["woba_denom"].notna()]
+    if first.empty:
+        return pd.DataFrame(columns=AGG_COLUMNS)
+
+    top = first["inning_topbot"].eq("Top")
+    batting = first["away_team"].where(top, first["home_team"])
+    codes = {code: registry.canonical(code) for code in batting.dropna().unique()}
+    out = pd.DataFrame({
+        "game_date": pd.to_datetime(first["game_date"]).dt.strftime("%Y-%m-%d"),
+        "team": batting.map(codes),
+        "side": top.map({True: "away", False: "home"}),
+        "p_throws": first["p_throws"].fillna("R"),
+        "woba_sum": first["woba_value"].fillna(0.0),
+        "woba_denom": first["woba_denom"],
+        "pa": 1,
+    }).dropna(subset=["team"])
+    return out.groupby(AGG_COLUMNS[:4], as_index=False)[SUM_COLUMNS].sum()
+
+
+def _date_runs(dates: List[date]) -> List[tuple]:
+    """Collapse sorted dates into contiguous (start, end) runs."""
+    runs = []
+    for d in dates:
+        if runs and d - runs[-1][1] == timedelta(days=1):
+            runs[-1] = (runs[-1][0], d)
+        else:
+            runs.append((d, d))
+    return runs
+
+
+class TeamFirstInningAggregates:
+    """
+    Append-only daily aggregate table plus prefix-sum window queries.
+
+    The set of dates already fetched (including off days with no games) is kept
+    in a sidecar JSON so those dates are never downloaded again.
+    """
+
+    def __init__(self, path, fetcher=None, registry=None):
+        self.path = Path(path)
+        self.dates_path = self.path.with_suffix(".dates.json")
+        self.registry = registry or get_team_registry()
+        self._fetcher = fetcher
+        self._prefix_cache: Dict[tuple, tuple] = {}
+
+        if self.path.exists():
+            self.df = pd.read_csv(self.path)
+        else:
+            self.df = pd.DataFrame(columns=AGG_COLUMNS)
+        self.fetched = set()
+        if self.dates_path.exists():
+            with open(self.dates_path, "r", encoding="utf-8") as f:
+                self.fetched = set(json.load(f))
+        logger.debug("Loaded %d aggregate rows covering %d dates from %s",
+                     len(self.df), len(self.fetched), self.path)
+
+    # ------------------------------------------------------------------ updates
+    def _fetch(self, start: date, end: date) -> pd.DataFrame:
+        if self._fetcher is None:
+            from pybaseball import statcast
+            self._fetcher = statcast
+        logger.info("📥 Fetching Statcast data from %s to %s", start, end)
+        return self._fetcher(start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+
+    def missing_dates(self, start: date, end: date) -> List[date]:
+        days = (end - start).days + 1
+        return [start + timedelta(days=i) for i in range(days)
+                if (start + timedelta(days=i)).isoformat() not in self.fetched]
+
+    @staticmethod
+    def _complete_dates(agg: pd.DataFrame, run_start: date, run_end: date) -> List[str]:
+        """
+        Dates of a fetched run that can be marked as done: every date with rows,
+        plus empty dates before the last date with rows (off days). Empty dates at
+        the end of the run may just not be published yet, so they are fetched again.
+        """
+        with_rows = set(agg["game_date"]) if not agg.empty else set()
+        if not with_rows:
+            return []
+        last = max(with_rows)
+        return [d for d in (
+            (run_start + timedelta(days=i)).isoformat() for i in range((run_end - run_start).days + 1))
+            if d in with_rows or d < last]
+
+    def update(self, start: date, end: date = None) -> int:
+        """
+        Fetch and append every missing date in [start, end]. end defaults to
+        yesterday; today's games are not final and are never recorded. Dates that
+        came back empty after the last date with data are not marked fetched.
+        Returns the number of aggregate rows added.
+        """
+        yesterday = datetime.today().date() - timedelta(days=1)
+        end = min(end or yesterday, yesterday)
+        missing = self.missing_dates(start, end)
+        if not missing:
+            logger.info("✅ First-inning aggregates already cover %s to %s", start, end)
+            return 0
+
+        added = []
+        for run_start, run_end in _date_runs(missing):
+            try:
+                raw = self._fetch(run_start, run_end)
+            except Exception as e:
+                logger.warning("⚠️ Statcast fetch failed for %s to %s: %s", run_start, run_end, e)
+                continue
+            agg = aggregate_first_inning(raw, self.registry)
+            added.append(agg)
+            self.fetched.update(self._complete_dates(agg, run_start, run_end))
+
+        new_rows = pd.concat(added, ignore_index=True) if added else pd.DataFrame(columns=AGG_COLUMNS)
+        if not new_rows.empty:
+            self.df = pd.concat([self.df, new_rows], ignore_index=True)
+        self._prefix_cache.clear()
+        self.save()
+        logger.info("Appended %d aggregate rows for %d missing dates", len(new_rows), len(missing))
+        return len(new_rows)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.df.to_csv(self.path, index=False)
+        with open(self.dates_path, "w", encoding="utf-8") as f:
+            json.dump(sorted(self.fetched), f)
+
+    # ------------------------------------------------------------------ queries
+    def _prefix(self, side: Optional[str], p_throws: Optional[str]):
+        """Dense date x team cumulative sums for one split, built once per split."""
+        key = (side, p_throws)
+        if key in self._prefix_cache:
+            return self._prefix_cache[key]
+
+        df = self.df
+        if side:
+            df = df[df["side"] == side]
+        if p_throws:
+            df = df[df["p_throws"] == p_throws]
+        if df.empty:
+            self._prefix_cache[key] = None
+            return None
+
+        daily = df.groupby(["game_date", "team"])[["woba_sum", "woba_denom"]].sum()
+        dates = pd.date_range(df["game_date"].min(), df["game_date"].max(), freq="D").strftime("%Y-%m-%d")
+        woba = daily["woba_sum"].unstack(fill_value=0.0).reindex(dates, fill_value=0.0).cumsum()
+        denom = daily["woba_denom"].unstack(fill_value=0.0).reindex(dates, fill_value=0.0).cumsum()
+        self._prefix_cache[key] = (woba, denom)
+        return woba, denom
+
+    def woba3(self, days: int, as_of=None, side: str = None, p_throws: str = None) -> Dict[str, float]:
+        """
+        First-inning wOBA by canonical team over the `days` days before as_of
+        (default today), i.e. [as_of - days, as_of), from two prefix-sum rows.
+        as_of itself is excluded: today's games are never stored.
+        """
+        prefix = self._prefix(side, p_throws)
+        if prefix is None:
+            return {}
+        woba, denom = prefix
+        as_of = pd.Timestamp(as_of or datetime.today().date())
+        end_key = (as_of - pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        start_key = (as_of - pd.Timedelta(days=days + 1)).strftime("%Y-%m-%d")
+
+        # searchsorted: last cumulative row on or before each bound
+        end_pos = woba.index.searchsorted(end_key, side="right") - 1
+        if end_pos < 0:
+            return {}
+        start_pos = woba.index.searchsorted(start_key, side="right") - 1
+
+        w = woba.iloc[end_pos] - (woba.iloc[start_pos] if start_pos >= 0 else 0.0)
+        d = denom.iloc[end_pos] - (denom.iloc[start_pos] if start_pos >= 0 else 0.0)
+        ratio = (w / d.where(d > 0)).dropna()
+        return {team: round(float(v), 4) for team, v in ratio.items()}
+
+
+def get_team_aggregates(path: str = None, fetcher=None) -> TeamFirstInningAggregates:
+    """Aggregate store at mlb_data.statcast.team_daily_csv, resolved against the project root."""
+    cfg = load_config()
+    if path is None:
+        path = cfg.get("mlb_data", {}).get("statcast", {}).get(
+            "team_daily_csv", DEFAULT_AGGREGATES_PATH)
+    path = Path(path)
+    if not path.is_absolute():
+        path = Path(cfg.get("root_path", ".")) / path
+    return TeamFirstInningAggregates(path, fetcher=fetcher)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain and query daily first-inning team aggregates.")
+    parser.add_argument("--days", type=int, default=14, help="Window length in days")
+    parser.add_argument("--as-of", default=None, help="YYYY-MM-DD (default: today)")
+    parser.add_argument("--side", choices=["home", "away"], default=None)
+    parser.add_argument("--p-throws", choices=["L", "R"], default=None)
+    parser.add_argument("--no-update", action="store_true", help="Query without fetching missing dates")
+    args = parser.parse_args()
+
+    store = get_team_aggregates()
+    as_of = datetime.strptime(args.as_of, "%Y-%m-%d").date() if args.as_of else datetime.today().date()
+    if not args.no_update:
+        store.update(date(as_of.year, 3, 1), as_of)
+    for team, value in sorted(store.woba3(args.days, as_of, args.side, args.p_throws).items()):
+        print(f"{team:>4} {value:.3f}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    main()
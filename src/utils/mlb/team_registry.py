@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Central MLB team identity registry.
+
+Every source this project joins on spells teams differently: the Stats API uses
+numeric ids and "AZ"/"KC"/"WSH", FanGraphs uses "ARI"/"KCR"/"WSN", Statcast uses
+"AZ"/"KC"/"WSH" (and ends up title-cased as "Az" in the wOBA3 cache), and the
+summaries carry full names. The registry maps all of them to one canonical key
+(the Stats API abbreviation) with a single dict hit.
+
+The table is loaded from config/mlb_team_registry.json once per process.
+
+Usage:
+    from utils.mlb.team_registry import get_team_registry
+    teams = get_team_registry()
+    teams.canonical("KCR")        # -> "KC"
+    teams.abbrev(109)             # -> "AZ"
+    teams.fangraphs_code("Az")    # -> "ARI"
+"""
+import json
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from utils.config_loader import load_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_PATH = "config/mlb_team_registry.json"
+
+
+@dataclass(frozen=True)
+class TeamIdentity:
+    key: str
+    mlb_id: int
+    name: str
+    fangraphs: str
+    statcast: str
+    aliases: Tuple[str, ...] = field(default_factory=tuple)
+
+
+def normalize_team_key(value) -> str:
+    """Normalize any team spelling for lookup: 'St. Louis  Cardinals' -> 'ST LOUIS CARDINALS'."""
+    return " ".join(str(value).replace(".", "").split()).upper()
+
+
+class TeamRegistry:
+    """
+    O(1) lookup from any known team identifier to a canonical TeamIdentity.
+    """
+
+    def __init__(self, teams: Iterable[TeamIdentity]):
+        self.teams: Dict[str, TeamIdentity] = {}
+        self._by_id: Dict[int, TeamIdentity] = {}
+        self._by_alias: Dict[str, TeamIdentity] = {}
+        self._missed = set()
+
+        for team in teams:
+            self.teams[team.key] = team
+            self._by_id[team.mlb_id] = team
+            for alias in (team.key, team.name, team.fangraphs, team.statcast, *team.aliases):
+                norm = normalize_team_key(alias)
+                other = self._by_alias.get(norm)
+                if other is not None and other.key != team.key:
+                    raise ValueError(
+                        f"Team alias {alias!r} maps to both {other.key} and {team.key}")
+                self._by_alias[norm] = team
+
+    @classmethod
+    def from_json(cls, path) -> "TeamRegistry":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        teams = [
+            TeamIdentity(
+                key=t["key"],
+                mlb_id=int(t["mlb_id"]),
+                name=t["name"],
+                fangraphs=t.get("fangraphs", t["key"]),
+                statcast=t.get("statcast", t["key"]),
+                aliases=tuple(t.get("aliases", [])),
+            )
+            for t in data["teams"]
+        ]
+        logger.info("Loaded %d teams into registry from %s", len(teams), path)
+        return cls(teams)
+
+    def get(self, key) -> Optional[TeamIdentity]:
+        """Resolve an MLB id, abbreviation, FanGraphs/Statcast code or name to a TeamIdentity."""
+        if key is None:
+            return None
+        if isinstance(key, int):
+            team = self._by_id.get(key)
+        else:
+            text = str(key).strip()
+            team = self._by_id.get(int(text)) if text.isdigit() else self._by_alias.get(
+                normalize_team_key(text))
+        if team is None and key not in self._missed:
+            # Warn once per unknown key so joins stop failing silently
+            self._missed.add(key)
+            logger.warning("Unknown team identifier %r", key)
+        return team
+
+    def canonical(self, key, default=None):
+        team = self.get(key)
+        return team.key if team else default
+
+    # The canonical key is the Stats API abbreviation
+    abbrev = canonical
+
+    def name(self, key, default=None):
+        team = self.get(key)
+        return team.name if team else default
+
+    def fangraphs_code(self, key, default=None):
+        team = self.get(key)
+        return team.fangraphs if team else default
+
+    def statcast_code(self, key, default=None):
+        team = self.get(key)
+        return team.statcast if team else default
+
+    def rekey(self, mapping: dict) -> dict:
+        """Return a copy of mapping keyed by canonical team key; unknown keys are dropped."""
+        out = {}
+        for k, v in mapping.items():
+            canon = self.canonical(k)
+            if canon is not None:
+                out[canon] = v
+        return out
+
+    def __len__(self):
+        return len(self.teams)
+
+    def __iter__(self):
+        return iter(self.teams.values())
+
+
+@lru_cache(maxsize=None)
+def get_team_registry(path: str = None) -> TeamRegistry:
+    """
+    Process-wide registry, built on first use. The path defaults to
+    mlb_data.team_registry_path in config.yaml, resolved against the project root.
+    """
+    if path is None:
+        cfg = load_config()
+        path = cfg.get("mlb_data", {}).get(
+            "team_registry_path", DEFAULT_REGISTRY_PATH)
+        if not Path(path).is_absolute():
+            path = Path(cfg.get("root_path", ".")) / path
+    return TeamRegistry.from_json(path)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    registry = get_team_registry()
+    for t in registry:
+        print(f"{t.key:>4} {t.mlb_id:>4} {t.fangraphs:>4} {t.statcast:>4}  {t.name}")
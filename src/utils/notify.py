@@ -1,35 +1,374 @@
-import requests
+#!/usr/bin/env python3
+"""
+Discord notifications with a durable outbox.
+
+Callers enqueue messages (and optional attachments) into an on-disk outbox
+and return immediately; a dispatcher drains it from a background thread or a
+detached process. Attachments are snapshotted into the outbox and streamed
+from disk on upload. Failed sends are retried with exponential backoff,
+Discord rate-limit headers (429 Retry-After, X-RateLimit-Remaining /
+X-RateLimit-Reset-After) are honored, and messages that can never succeed
+are moved to outbox/failed.
+
+Webhook URLs are not written to disk: each message names the environment
+variable holding its URL (DISCORD_WEBHOOK_URL by default).
+
+USAGE EXAMPLES:
+  # Deliver everything pending (e.g. from cron after a failed run)
+  python -m src.utils.notify --drain
+
+  # Show the outbox
+  python -m src.utils.notify --status
+"""
+import argparse
+import io
+import json
 import logging
+import logging.config
+import os
+import random
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from utils.config_loader import load_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEBHOOK_ENV = "DISCORD_WEBHOOK_URL"
+DEFAULT_OUTBOX_DIR = ".cache/notify_outbox"
+LOCK_STALE_SECONDS = 3600
+
+SENT, RETRY, FAILED = "sent", "retry", "failed"
+
+
+class _MultipartFile:
+    """
+    multipart/form-data body that reads the attachment from disk as requests
+    streams it, instead of loading the file into memory. Has a known length
+    so the request carries a Content-Length.
+    """
+
+    def __init__(self, fields: Dict[str, str], file_path, filename: str, file_field: str = "file"):
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        head = "".join(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+            for name, value in fields.items()
+        )
+        head += (f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+                 f'filename="{filename}"\r\nContent-Type: application/octet-stream\r\n\r\n')
+        tail = f"\r\n--{boundary}--\r\n".encode()
+        head = head.encode()
+        self._len = len(head) + os.path.getsize(file_path) + len(tail)
+        self._parts = [io.BytesIO(head), open(file_path, "rb"), io.BytesIO(tail)]
+
+    def __len__(self):
+        return self._len
+
+    def read(self, size: int = -1) -> bytes:
+        out = b""
+        while self._parts and (size < 0 or len(out) < size):
+            chunk = self._parts[0].read(-1 if size < 0 else size - len(out))
+            if chunk:
+                out += chunk
+            else:
+                self._parts.pop(0).close()
+        return out
+
+    def close(self):
+        for part in self._parts:
+            part.close()
+        self._parts = []
+
+
+def _post_webhook(session, webhook_url: str, message: str, file_path=None, file_label=None):
+    """POST one message, streaming the attachment if given. Returns the response."""
+    if not file_path:
+        return session.post(webhook_url, json={"content": message}, timeout=10)
+    body = _MultipartFile({"content": message}, file_path, file_label or Path(file_path).name)
+    try:
+        return session.post(webhook_url, data=body, headers={"Content-Type": body.content_type}, timeout=60)
+    finally:
+        body.close()
+
 
 def send_discord_webhook(message: str, webhook_url: str, file_path: str = None, file_label: str = None):
     """
-    Send a message (and optional file) to a Discord webhook.
+    Send a message (and optional file) to a Discord webhook synchronously.
     Args:
         message (str): The message to send.
         webhook_url (str): The Discord webhook URL.
         file_path (str, optional): Path to a file to send as attachment.
         file_label (str, optional): Label for the file (default: filename).
     """
-    data = {"content": message}
-    files = None
-    if file_path:
-        try:
-            with open(file_path, "rb") as f:
-                files = {"file": (file_label or file_path, f.read())}
-                resp = requests.post(webhook_url, data=data, files=files, timeout=20)
-        except Exception as e:
-            logging.error(f"Failed to send file to Discord webhook: {e}")
-            return False
-    else:
-        try:
-            resp = requests.post(webhook_url, json=data, timeout=10)
-        except Exception as e:
-            logging.error(f"Failed to send Discord webhook: {e}")
-            return False
     try:
+        resp = _post_webhook(requests, webhook_url, message, file_path, file_label)
         resp.raise_for_status()
-        logging.info(f"Sent Discord webhook: {message}{' with file' if file_path else ''}")
     except Exception as e:
-        logging.error(f"Discord webhook returned error: {e}")
+        logging.error(f"Failed to send Discord webhook: {e}")
         return False
+    logging.info(f"Sent Discord webhook: {message}{' with file' if file_path else ''}")
     return True
+
+
+class Outbox:
+    """
+    One JSON file per message under <dir>/pending, named so that a directory
+    listing is FIFO order. Writes go through a temp file + os.replace, so a
+    crash never leaves a half-written message.
+    """
+
+    def __init__(self, directory):
+        self.dir = Path(directory)
+        self.pending_dir = self.dir / "pending"
+        self.files_dir = self.dir / "files"
+        self.failed_dir = self.dir / "failed"
+        for d in (self.pending_dir, self.files_dir, self.failed_dir):
+            d.mkdir(parents=True, exist_ok=True)
+
+    def _write(self, path: Path, msg: dict):
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(msg, f, indent=2)
+        os.replace(tmp, path)
+
+    def enqueue(self, message: str, file_path=None, file_label: str = None,
+                webhook_env: str = DEFAULT_WEBHOOK_ENV) -> str:
+        """Persist a message; the attachment (if any) is copied so later overwrites don't change it."""
+        msg_id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+        attachment = None
+        if file_path:
+            src = Path(file_path)
+            attachment = str(self.files_dir / f"{msg_id}{src.suffix}")
+            shutil.copyfile(src, attachment)
+            file_label = file_label or src.name
+        self._write(self.pending_dir / f"{msg_id}.json", {
+            "id": msg_id,
+            "created_at": time.time(),
+            "webhook_env": webhook_env,
+            "content": message,
+            "file_path": attachment,
+            "file_label": file_label,
+            "attempts": 0,
+            "next_attempt_at": 0.0,
+            "last_error": None,
+        })
+        logger.info("Queued notification %s%s", msg_id, " with file" if attachment else "")
+        return msg_id
+
+    def pending(self) -> List[Tuple[Path, dict]]:
+        out = []
+        for path in sorted(self.pending_dir.glob("*.json")):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    out.append((path, json.load(f)))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning("Skipping unreadable outbox entry %s: %s", path, e)
+        return out
+
+    def update(self, path: Path, msg: dict):
+        self._write(path, msg)
+
+    def complete(self, path: Path, msg: dict):
+        path.unlink(missing_ok=True)
+        if msg.get("file_path"):
+            Path(msg["file_path"]).unlink(missing_ok=True)
+
+    def dead_letter(self, path: Path, msg: dict):
+        self._write(self.failed_dir / path.name, msg)
+        path.unlink(missing_ok=True)
+
+
+class NotificationDispatcher:
+    """Drains an Outbox with retry/backoff and Discord rate-limit handling."""
+
+    def __init__(self, outbox: Outbox, session=None, max_attempts: int = 8,
+                 base_delay: float = 2.0, max_delay: float = 600.0, sleep=time.sleep):
+        self.outbox = outbox
+        self.session = session or requests.Session()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._not_before = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _retry_after(resp) -> float:
+        value = resp.headers.get("Retry-After")
+        if value is None:
+            try:
+                value = resp.json().get("retry_after")
+            except ValueError:
+                value = None
+        try:
+            return max(float(value), 0.0)
+        except (TypeError, ValueError):
+            return 1.0
+
+    def send(self, msg: dict) -> Tuple[str, str]:
+        """Attempt one delivery. Returns (SENT | RETRY | FAILED, error text)."""
+        url = os.getenv(msg.get("webhook_env") or DEFAULT_WEBHOOK_ENV)
+        if not url:
+            return RETRY, f"{msg.get('webhook_env')} not set"
+        try:
+            resp = _post_webhook(self.session, url, msg["content"], msg.get("file_path"), msg.get("file_label"))
+        except (requests.RequestException, OSError) as e:
+            return RETRY, str(e)
+
+        if resp.headers.get("X-RateLimit-Remaining") == "0":
+            reset = float(resp.headers.get("X-RateLimit-Reset-After", 1.0))
+            self._not_before = max(self._not_before, time.time() + reset)
+        if resp.status_code == 429:
+            self._not_before = max(self._not_before, time.time() + self._retry_after(resp))
+            return RETRY, "rate limited"
+        if resp.status_code >= 500:
+            return RETRY, f"HTTP {resp.status_code}"
+        if resp.status_code >= 400:
+            return FAILED, f"HTTP {resp.status_code}: {resp.text[:200]}"
+        return SENT, ""
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * (0.5 + random.random() / 2)
+
+    def drain(self, timeout: float = None) -> Dict[str, int]:
+        """
+        Deliver due messages until the outbox is empty or `timeout` seconds pass.
+        Messages waiting on backoff are slept for while time remains.
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        counts = {SENT: 0, RETRY: 0, FAILED: 0}
+        while not self._stop.is_set():
+            entries = self.outbox.pending()
+            if not entries:
+                break
+            now = time.time()
+            due = [(p, m) for p, m in entries if m.get("next_attempt_at", 0) <= now]
+            if not due:
+                wake = min(m["next_attempt_at"] for _, m in entries)
+                if deadline is not None and wake > deadline:
+                    break
+                self._sleep(max(wake - now, 0.0))
+                continue
+            for path, msg in due:
+                wait = self._not_before - time.time()
+                if wait > 0:
+                    if deadline is not None and time.time() + wait > deadline:
+                        return counts
+                    self._sleep(wait)
+                status, error = self.send(msg)
+                counts[status] += 1
+                if status == SENT:
+                    self.outbox.complete(path, msg)
+                    logger.info("Delivered notification %s", msg["id"])
+                    continue
+                msg["last_error"] = error
+                if status == RETRY and error != "rate limited":
+                    msg["attempts"] += 1
+                if status == FAILED or msg["attempts"] >= self.max_attempts:
+                    self.outbox.dead_letter(path, msg)
+                    logger.error("Giving up on notification %s: %s", msg["id"], error)
+                    continue
+                msg["next_attempt_at"] = time.time() + (0.0 if error == "rate limited"
+                                                        else self._backoff(msg["attempts"]))
+                self.outbox.update(path, msg)
+                logger.warning("Notification %s not delivered (%s); will retry", msg["id"], error)
+            if deadline is not None and time.time() >= deadline:
+                break
+        return counts
+
+    def start(self, timeout: float = None) -> threading.Thread:
+        """Drain from a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.drain, kwargs={"timeout": timeout},
+                                        name="notify-dispatcher", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, wait: float = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(wait)
+
+
+@lru_cache(maxsize=1)
+def get_outbox(directory: str = None) -> Outbox:
+    """Process-wide outbox at notify.outbox_dir (relative to the project root)."""
+    cfg = load_config()
+    path = Path(directory or cfg.get("notify", {}).get("outbox_dir", DEFAULT_OUTBOX_DIR))
+    if not path.is_absolute():
+        path = Path(cfg["root_path"]) / path
+    return Outbox(path)
+
+
+def _acquire_lock(outbox: Outbox) -> Optional[Path]:
+    lock = outbox.dir / ".drain.lock"
+    if lock.exists() and time.time() - lock.stat().st_mtime > LOCK_STALE_SECONDS:
+        lock.unlink(missing_ok=True)
+    try:
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return None
+    return lock
+
+
+def spawn_dispatcher(timeout: float = 900):
+    """
+    Drain the outbox from a detached process so the caller can exit without
+    waiting on delivery. Only one drainer runs at a time (lock file).
+    """
+    cfg = load_config()
+    kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL,
+              "stderr": subprocess.DEVNULL, "cwd": cfg["root_path"]}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen([sys.executable, "-m", "src.utils.notify", "--drain", "--timeout", str(timeout)], **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deliver queued Discord notifications.")
+    parser.add_argument("--drain", action="store_true", help="Send pending notifications")
+    parser.add_argument("--timeout", type=float, default=None, help="Stop draining after N seconds")
+    parser.add_argument("--status", action="store_true", help="List pending and failed notifications")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    cfg = load_config()
+    notify_cfg = cfg.get("notify", {})
+    outbox = get_outbox()
+
+    if args.status or not args.drain:
+        for _, msg in outbox.pending():
+            print(f"pending  {msg['id']}  attempts={msg['attempts']}  {msg['content'][:60]!r}  {msg['last_error'] or ''}")
+        print(f"{len(list(outbox.failed_dir.glob('*.json')))} failed")
+        return
+
+    lock = _acquire_lock(outbox)
+    if lock is None:
+        logger.info("Another dispatcher is draining %s", outbox.dir)
+        return
+    try:
+        dispatcher = NotificationDispatcher(outbox, max_attempts=notify_cfg.get("max_attempts", 8))
+        counts = dispatcher.drain(timeout=args.timeout)
+        logger.info("Notification drain: %s", counts)
+    finally:
+        lock.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    logging.config.dictConfig(load_config()["logging"])
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Single-flight coalescing for concurrent identical fetches.
+
+When several workers ask for the same resource at the same time (both
+starters of one game, the same season table), only the first caller, the
+leader, runs the fetch. Callers that arrive while it is in flight block on
+the leader's result (or exception) instead of sending their own request.
+Keys are forgotten once the call completes, so this is not a cache: a later
+call fetches again unless a cache sits above it.
+
+Results are shared between callers, so anything a caller may mutate is
+copied: get_json hands every caller of a coalesced request its own deep copy
+(the schedule's game dicts are annotated downstream), and shared_frame
+copies DataFrames.
+
+    from utils.single_flight import get_json
+    payload = get_json("https://statsapi.mlb.com/api/v1/people", {"personIds": "1,2"})
+"""
+import copy
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Mapping, Tuple
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        return self.call(key, fn, *args, **kwargs)[0]
+
+    def call(self, key: Hashable, fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Like do(), but returns (result, shared). shared is True when the result
+        object is also handed to other callers, i.e. for every waiter and for a
+        leader that had waiters; such results must be copied before mutation.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                # No caller can join once the key is gone, so waiters is final
+                del self._calls[key]
+            if call.waiters:
+                logger.debug("Single-flight %s shared with %d waiting caller(s)", key, call.waiters)
+            call.done.set()
+        return call.result, call.waiters > 0
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+def request_key(url: str, params: Mapping = None) -> str:
+    """Normalized identity of a GET: lower-cased scheme/host, query and params merged and sorted."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(str(k), str(v)) for k, v in (params or {}).items()]
+    base = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/") or "/", "", ""))
+    return base + "?" + json.dumps(sorted(query), separators=(",", ":"))
+
+
+FLIGHT = SingleFlight()
+
+
+def get_json(url: str, params: Mapping = None, session=None, timeout: float = 30.0) -> dict:
+    """
+    GET -> JSON with concurrent identical requests coalesced into one. A payload
+    seen by more than one caller is deep-copied per caller, so callers may mutate it.
+    """
+    session = session or requests
+
+    def fetch():
+        resp = session.get(url, params=params, timeout=timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    payload, shared = FLIGHT.call(("GET", request_key(url, params)), fetch)
+    return copy.deepcopy(payload) if shared else payload
+
+
+def shared_frame(key: Hashable, fn: Callable, *args, **kwargs):
+    """Single-flight a DataFrame fetch; every caller gets its own copy (None passes through)."""
+    df = FLIGHT.do(key, fn, *args, **kwargs)
+    return df.copy() if df is not None else None
@@ -0,0 +1,85 @@
+from datetime import date
+
+import pytest
+
+from utils.artifact_catalog import (
+    AUGMENTED_GAME_SUMMARY, CALIBRATED_GAME_SUMMARY, FANGRAPHS_SPLITS_1ST_INNING, ArtifactCatalog)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    splits_dir = tmp_path / "fangraphs"
+    splits_dir.mkdir()
+    for day in ("20250629", "20250721", "20250724"):
+        (splits_dir / f"splits_1st_inning_2025_{day}.csv").write_text("Season,Tm,wRC+\n2025,SDP,118\n2025,MIA,88\n")
+    # Hand-made copies must not be picked up by the backfill glob
+    (splits_dir / "splits_1st_inning_2025_20250629_bkp.csv").write_text("Season,Tm,wRC+\n")
+    cat = ArtifactCatalog(tmp_path / "catalog.json", root_path=tmp_path)
+    cat.backfill(FANGRAPHS_SPLITS_1ST_INNING, splits_dir, "splits_1st_inning_2025_????????.csv", season=2025)
+    return cat
+
+
+def test_backfill_records_rows_and_checksum(catalog):
+    recs = catalog.between(FANGRAPHS_SPLITS_1ST_INNING)
+    assert [r.as_of for r in recs] == ["2025-06-29", "2025-07-21", "2025-07-24"]
+    assert all(r.rows == 2 and len(r.sha256) == 64 for r in recs)
+
+
+def test_resolve_as_of(catalog):
+    assert catalog.resolve(FANGRAPHS_SPLITS_1ST_INNING, date(2025, 7, 24)).as_of == "2025-07-24"
+    assert catalog.resolve(FANGRAPHS_SPLITS_1ST_INNING, "20250723", season=2025).as_of == "2025-07-21"
+    assert catalog.resolve(FANGRAPHS_SPLITS_1ST_INNING, "2025-06-28") is None
+
+
+def test_resolve_max_age(catalog):
+    assert catalog.resolve(FANGRAPHS_SPLITS_1ST_INNING, "2025-07-20", max_age_days=7) is None
+    assert catalog.resolve(FANGRAPHS_SPLITS_1ST_INNING, "2025-07-28", max_age_days=7).as_of == "2025-07-24"
+
+
+def test_manifest_round_trip(catalog, tmp_path):
+    reloaded = ArtifactCatalog(tmp_path / "catalog.json", root_path=tmp_path)
+    assert len(reloaded) == 3
+    rec = reloaded.resolve(FANGRAPHS_SPLITS_1ST_INNING, "2025-07-22")
+    assert reloaded.path_of(rec).exists()
+
+
+def test_ensure_backfilled_scans_each_directory_once(tmp_path):
+    out = tmp_path / "augmented"
+    out.mkdir()
+    cat = ArtifactCatalog(tmp_path / "catalog.json", root_path=tmp_path)
+    for day in ("20250629", "20250630"):
+        (out / f"mlb_daily_game_summary_{day}_augmented.json").write_text("[]")
+
+    pattern = "mlb_daily_game_summary_????????_augmented.json"
+    assert cat.ensure_backfilled(AUGMENTED_GAME_SUMMARY, out, pattern) == 2
+    # Once the directory is cataloged, new files come in through register(), not a rescan
+    (out / "mlb_daily_game_summary_20250701_augmented.json").write_text("[]")
+    assert cat.ensure_backfilled(AUGMENTED_GAME_SUMMARY, out, pattern) == 0
+    cat.register(AUGMENTED_GAME_SUMMARY, out / "mlb_daily_game_summary_20250701_augmented.json", "20250701")
+    assert [r.as_of for r in cat.between(AUGMENTED_GAME_SUMMARY)] == ["2025-06-29", "2025-06-30", "2025-07-01"]
+
+
+def test_dates_cataloged_in_another_directory_are_reported(tmp_path, caplog):
+    old, new = tmp_path / "old", tmp_path / "new"
+    for d in (old, new):
+        d.mkdir()
+        (d / "summary_20250701.json").write_text("[]")
+    cat = ArtifactCatalog(tmp_path / "catalog.json", root_path=tmp_path)
+    cat.register(AUGMENTED_GAME_SUMMARY, old / "summary_20250701.json", "20250701")
+
+    assert cat.ensure_backfilled(AUGMENTED_GAME_SUMMARY, new, "summary_????????.json") == 0
+    assert cat.in_directory(cat.between(AUGMENTED_GAME_SUMMARY), new) == []
+    assert sum("summary_20250701.json" in r.getMessage() for r in caplog.records) == 2
+
+
+def test_save_merges_registrations_from_other_processes(tmp_path):
+    for day in ("20250701", "20250702"):
+        (tmp_path / f"summary_{day}.json").write_text("[]")
+    first = ArtifactCatalog(tmp_path / "catalog.json", root_path=tmp_path)
+    second = ArtifactCatalog(tmp_path / "catalog.json", root_path=tmp_path)
+    first.register(AUGMENTED_GAME_SUMMARY, tmp_path / "summary_20250701.json", "20250701")
+    second.register(CALIBRATED_GAME_SUMMARY, tmp_path / "summary_20250702.json", "20250702")
+
+    reloaded = ArtifactCatalog(tmp_path / "catalog.json", root_path=tmp_path)
+    assert reloaded.has(AUGMENTED_GAME_SUMMARY) and reloaded.has(CALIBRATED_GAME_SUMMARY)
+    assert not (tmp_path / "catalog.lock").exists()
@@ -0,0 +1,18 @@
+import json
+from pathlib import Path
+
+from utils.mlb.calculate_nrfi_score import calculate_nrfi_score, nrfi_feature_values
+
+FEATURES_PATH = Path(__file__).resolve().parents[1] / "config" / "features" / "mlb_rfi_features.json"
+
+
+def test_store_first_inning_form_reaches_model_inputs():
+    # Pitcher stats as flattened by the pipeline from the pitcher game store
+    stats = {"recent_xfip": 3.8, "recent_barrel_pct": 7.5, "recent_f1_era": "2.25", "recent_f1_whip": "1.00"}
+    values = nrfi_feature_values(stats, 104, 0.321)
+    assert values["f1_era"] == "2.25" and values["WHIP"] == "1.00"
+
+    features_def = json.loads(FEATURES_PATH.read_text())
+    _, _, missing = calculate_nrfi_score(values, features_def)
+    assert not {"f1_era", "WHIP"} & set(missing)
+    assert nrfi_feature_values({}, "NA", "NA")["f1_era"] == "NA"
@@ -0,0 +1,39 @@
+from utils.artifact_catalog import file_checksum
+from utils.convert_html_to_pdf import plan_exports
+
+
+def test_plan_exports_skips_unchanged_html(tmp_path):
+    out_dir = tmp_path / "pdfs"
+    out_dir.mkdir()
+    a, b = tmp_path / "sheet_a.html", tmp_path / "sheet_b.html"
+    a.write_text("<p>a</p>")
+    b.write_text("<p>b</p>")
+    (out_dir / "sheet_a.pdf").write_bytes(b"%PDF")
+    (out_dir / "sheet_b.pdf").write_bytes(b"%PDF")
+    manifest = {str(a.resolve()): {"sha256": file_checksum(a)},
+                str(b.resolve()): {"sha256": "stale"}}
+
+    jobs, checksums = plan_exports([a, b, tmp_path / "missing.html"], out_dir, manifest)
+    assert jobs == [(str(b.resolve()), str(out_dir / "sheet_b.pdf"))]
+    assert set(checksums) == {str(a.resolve()), str(b.resolve())}
+
+    jobs, _ = plan_exports([a, b], out_dir, manifest, force=True)
+    assert len(jobs) == 2
+
+
+def test_plan_exports_disambiguates_duplicate_stems(tmp_path):
+    out_dir = tmp_path / "pdfs"
+    a, b = tmp_path / "2025" / "sheet.html", tmp_path / "2024" / "sheet.html"
+    for html in (a, b):
+        html.parent.mkdir()
+        html.write_text("<p>x</p>")
+
+    jobs, _ = plan_exports([a, b, a], out_dir, {})
+    pdfs = [pdf for _, pdf in jobs]
+    assert len(jobs) == 2
+    assert pdfs[0] == str(out_dir / "sheet.pdf")
+    assert pdfs[1] != pdfs[0] and pdfs[1].startswith(str(out_dir / "sheet-"))
+
+    # Names recorded in the manifest stay with their source on later runs
+    manifest = {html: {"sha256": "stale", "pdf": pdf} for html, pdf in jobs}
+    assert plan_exports([b, a], out_dir, manifest)[0] == [jobs[1], jobs[0]]
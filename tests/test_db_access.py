@@ -0,0 +1,71 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from utils.db_access import (create_tables, get_engine, get_games_between, get_scores_between,
+                             lake_table, upsert_games, upsert_scores)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    create_tables(engine)
+    return engine
+
+
+def _game(game_id, day, home_name="Atlanta Braves"):
+    return {"game_id": game_id, "game_date": day, "game_datetime": f"{day.isoformat()}T23:20:00Z",
+            "season": day.year, "away_team": "MIA", "home_team": "ATL",
+            "away_team_name": "Miami Marlins", "home_team_name": home_name}
+
+
+def test_upsert_games_updates_in_place(engine):
+    upsert_games([_game(1, date(2025, 8, 9)), _game(2, date(2025, 8, 10))], engine=engine)
+    upsert_games([_game(2, date(2025, 8, 10), home_name="Moved")], engine=engine)
+
+    df = get_games_between(date(2025, 8, 1), date(2025, 8, 31), engine=engine)
+    assert list(df["game_id"]) == [1, 2]
+    assert df.loc[df["game_id"] == 2, "home_team_name"].item() == "Moved"
+    assert get_games_between(date(2025, 8, 10), "2025-08-10", engine=engine).shape[0] == 1
+
+
+def test_upsert_scores_and_range(engine):
+    upsert_games([_game(778431, date(2025, 8, 9)), _game(778432, date(2025, 8, 10))], engine=engine)
+    rows = [{"game_id": 778431, "as_of": "2025-08-09", "game_nrfi_score": 34.7},
+            {"game_id": 778432, "as_of": "2025-08-10", "game_nrfi_score": 50.0}]
+    assert upsert_scores(rows, engine=engine) == 2
+    upsert_scores([{"game_id": 778431, "as_of": "2025-08-09", "game_nrfi_score": 40.0}], engine=engine)
+
+    df = get_scores_between("2025-08-09", date(2025, 8, 9), engine=engine)
+    assert df["game_nrfi_score"].tolist() == [40.0]
+
+
+def test_scores_use_data_lake_tables_with_foreign_keys(engine):
+    scores = lake_table(engine, "model_scores")
+    assert {fk.target_fullname for fk in scores.foreign_keys} == {"games.game_id"}
+    assert [c.name for c in scores.primary_key] == ["game_id", "as_of"]
+
+    # A score for a game that is not in the lake's games table is rejected
+    with pytest.raises(Exception, match="FOREIGN KEY"):
+        upsert_scores([{"game_id": 777, "as_of": "2025-08-09", "game_nrfi_score": 50.0}], engine=engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA foreign_key_check(model_scores)")).fetchall() == []
+
+
+def test_create_tables_dedupes_existing_game_ids(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE mlb_games (id INTEGER PRIMARY KEY, game_date DATE NOT NULL, "
+                          "game_time TIME, home_team VARCHAR NOT NULL, away_team VARCHAR NOT NULL, "
+                          "venue VARCHAR, game_id VARCHAR)"))
+        for venue in ("Old", "New"):
+            conn.execute(text("INSERT INTO mlb_games (game_date, home_team, away_team, venue, game_id) "
+                              "VALUES ('2025-08-09', 'ATL', 'MIA', :venue, '1')"), {"venue": venue})
+    create_tables(engine)
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT venue FROM mlb_games WHERE game_id = '1'")).fetchall()
+        indexes = {r[1] for r in conn.execute(text("PRAGMA index_list(mlb_games)"))}
+    assert [r[0] for r in rows] == ["New"]
+    assert "ux_mlb_games_game_id" in indexes
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.ev_calculator import (american_to_decimal, decimal_to_american, devig, expected_value,
+                                 kelly_fraction, price_slate, simulate_bankroll)
+
+
+def test_odds_conversions_round_trip():
+    odds = np.array([-150, 130, -110, 100])
+    np.testing.assert_allclose(american_to_decimal(odds), [1 + 100 / 150, 2.3, 1 + 100 / 110, 2.0])
+    np.testing.assert_allclose(decimal_to_american(american_to_decimal(odds)), odds)
+
+
+def test_devig_removes_overround():
+    fair_a, fair_b = devig(1 / american_to_decimal(-110), 1 / american_to_decimal(-110))
+    assert fair_a == pytest.approx(0.5) and fair_b == pytest.approx(0.5)
+    add_a, add_b = devig([0.55], [0.5], method="additive")
+    assert add_a[0] + add_b[0] == pytest.approx(1.0)
+
+
+def test_ev_and_kelly():
+    assert expected_value(0.5, 2.2) == pytest.approx(0.1)
+    np.testing.assert_allclose(kelly_fraction([0.5, 0.4], [2.2, 2.0]), [0.1 / 1.2, 0.0])
+    assert kelly_fraction(0.6, 2.0, fraction=0.5, cap=0.05) == pytest.approx(0.05)
+
+
+def test_price_slate_picks_positive_ev_side():
+    games = pd.DataFrame({"game_id": [1, 2, 3], "calibrated_p_nrfi": [0.65, 0.40, 0.52]})
+    odds = pd.DataFrame({"game_id": [1, 2, 3], "nrfi_odds": [-120, -120, -110], "yrfi_odds": [100, 100, -110]})
+    priced = price_slate(games, odds).set_index("game_id")
+    assert priced.loc[1, "pick"] == "NRFI"
+    assert priced.loc[2, "pick"] == "YRFI"
+    assert pd.isna(priced.loc[3, "pick"]) and priced.loc[3, "pick_stake"] == 0
+
+
+def test_bankroll_replay_and_simulation():
+    stakes = np.array([0.1, 0.1, 0.1])
+    dec = np.array([2.0, 2.0, 2.0])
+    path = simulate_bankroll(stakes, dec, outcomes=[1, 0, 1], days=[0, 0, 1], start=100)
+    # Day 0: +10 - 10 on 100; day 1: +10% of 100
+    np.testing.assert_allclose(path, [100.0, 110.0])
+
+    sims = simulate_bankroll(stakes, dec, win_prob=[0.6] * 3, days=[0, 1, 2], n_paths=5000, seed=1)
+    assert sims.shape == (5000, 3)
+    assert sims[:, -1].mean() > 100
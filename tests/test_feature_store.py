@@ -0,0 +1,25 @@
+import numpy as np
+
+from sql.mlb_data_lake import connect
+from utils.mlb.feature_store import FeatureStore
+
+FEATURES = ["xFIP", "BarrelPct", "f1_era", "WHIP", "wRCp1st", "wOBA3"]
+
+
+def test_as_of_read_returns_latest_vector(tmp_path):
+    store = FeatureStore(connect(tmp_path / "lake.db"), feature_names=FEATURES)
+    store.write([(1, "away", {"xFIP": 4.1, "f1_era": "NA", "wOBA3": 0.31}),
+                 (1, "home", {"xFIP": 3.2, "wOBA3": 0.29})], as_of="2025-08-09T10:00:00")
+    store.write([(1, "away", {"xFIP": 3.9, "f1_era": 2.0, "wOBA3": 0.30})], as_of="2025-08-09T16:00:00")
+
+    morning = store.read_as_of("2025-08-09T12:00:00")
+    assert list(morning.columns) == FEATURES
+    assert morning.loc[(1, "away"), "xFIP"] == 4.1
+    assert np.isnan(morning.loc[(1, "away"), "f1_era"])
+
+    X, index, columns = store.matrix("2025-08-09")
+    assert X.shape == (2, len(FEATURES))
+    assert X[list(index).index((1, "away")), columns.index("xFIP")] == 3.9
+
+    assert store.read_as_of("2025-08-08").empty
+    assert store.read_as_of("2025-08-09", game_ids=[2]).empty
@@ -0,0 +1,49 @@
+import json
+
+from sql.mlb_data_lake import connect, load_game_summaries, table_counts
+
+RECORD = {
+    "game_id": 778431, "game_datetime": "2025-08-09T23:15:00Z",
+    "away_team": "Miami Marlins", "home_team": "Atlanta Braves",
+    "away_team_abbrev": "MIA", "home_team_abbrev": "ATL",
+    "away_pitcher": "Ryan Gusto", "home_pitcher": "Hurston Waldrep",
+    "away_pitcher_recent_f1_era": "NA", "home_pitcher_recent_f1_era": "0.00",
+    "home_team_woba3": 0.35, "away_team_wrc_plus_1st_inn": 94.7,
+    "away_team_score": 47.11, "home_team_score": 22.37, "game_nrfi_score": 34.74,
+    "first_inning_away_runs": 0, "first_inning_home_runs": 1, "first_inning_run": True,
+    "calibrated_p_nrfi": 0.38,
+}
+
+
+def test_load_game_summaries_is_idempotent(tmp_path):
+    path = tmp_path / "mlb_daily_game_summary_20250809_augmented.json"
+    path.write_text(json.dumps([RECORD]))
+    conn = connect(tmp_path / "lake.db")
+
+    load_game_summaries(conn, [path])
+    load_game_summaries(conn, [path])
+
+    counts = table_counts(conn)
+    assert counts["games"] == 1
+    assert counts["probable_starters"] == 2
+    assert counts["team_splits"] == 2
+    assert counts["calibrated_probabilities"] == 1
+
+    game = conn.execute("SELECT game_date, away_team, home_team FROM games").fetchone()
+    assert tuple(game) == ("2025-08-09", "MIA", "ATL")
+    era = conn.execute(
+        "SELECT side, recent_f1_era FROM probable_starters ORDER BY side").fetchall()
+    assert [tuple(r) for r in era] == [("away", None), ("home", 0.0)]
+    assert conn.execute("SELECT run_scored FROM first_inning_outcomes").fetchone()[0] == 1
+
+
+def test_team_splits_are_stored_under_the_team_they_describe(tmp_path):
+    path = tmp_path / "mlb_daily_game_summary_20250809.json"
+    path.write_text(json.dumps([dict(RECORD, away_team_woba3=0.29, home_team_wrc_plus_1st_inn=121.0)]))
+    conn = connect(tmp_path / "lake.db")
+    load_game_summaries(conn, [path])
+
+    splits = {(r["team"], r["metric"]): r["value"] for r in conn.execute("SELECT * FROM team_splits")}
+    # home_team_woba3 is the away lineup's wOBA3 (the one the home starter faces), and vice versa
+    assert splits == {("MIA", "woba3"): 0.35, ("ATL", "woba3"): 0.29,
+                      ("MIA", "wrc_plus_1st"): 94.7, ("ATL", "wrc_plus_1st"): 121.0}
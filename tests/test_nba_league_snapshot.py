@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.sports.basketball.nba.sheets.nba_league_snapshot import derive_player_sheet, derive_team_sheet
+
+
+def _team_logs(pts_scale=1.0):
+    rows = []
+    for g in range(12):
+        day = pd.Timestamp("2025-01-01") + pd.Timedelta(days=2 * g)
+        for team, opp, pts in ((1, 2, 100 + g), (2, 1, 90)):
+            pts = pts * pts_scale
+            rows.append({"GAME_ID": g, "GAME_DATE": day.isoformat(), "TEAM_ID": team,
+                         "TEAM_ABBREVIATION": {1: "BOS", 2: "NYK"}[team],
+                         "FGM": 40, "FGA": 85, "FG3M": 12, "FG3A": 35, "FTM": 10, "FTA": 14,
+                         "REB": 44, "AST": 25, "TOV": 12, "PTS": pts, "PLUS_MINUS": 0})
+    return pd.DataFrame(rows)
+
+
+def test_team_sheet_derives_allowed_and_first_quarter_stats():
+    teams = derive_team_sheet(_team_logs(), _team_logs(0.25), last_n=5)
+    assert teams.loc[1, "TEAM_ABBREVIATION"] == "BOS"
+    assert teams.loc[1, "GP"] == 12
+    assert teams.loc[1, "PTS"] == pytest.approx(np.mean([100 + g for g in range(12)]))
+    assert teams.loc[1, "L5_PTS"] == pytest.approx(np.mean([107, 108, 109, 110, 111]))
+    assert teams.loc[1, "OPP_PTS"] == 90
+    assert teams.loc[2, "OPP_PTS"] == teams.loc[1, "PTS"]
+    assert teams.loc[1, "Q1_OPP_PTS"] == pytest.approx(22.5)
+    assert teams.loc[1, "EFG_PCT"] == pytest.approx((40 + 6) / 85)
+
+
+def test_player_sheet_flags_hot_streaks():
+    rows = []
+    for g in range(10):
+        hot = g >= 7
+        for pid, name in ((10, "Hot Hand"), (11, "Steady")):
+            pts = 36 if (hot and pid == 10) else 18
+            rows.append({"PLAYER_ID": pid, "PLAYER_NAME": name, "TEAM_ABBREVIATION": "BOS",
+                         "GAME_DATE": f"2025-01-{g + 1:02d}", "MIN": 32.0, "FGM": 7, "FGA": 15,
+                         "FG3M": 2, "FG3A": 6, "FTM": 2, "FTA": 3, "REB": 5, "AST": 4, "TOV": 2,
+                         "PTS": pts, "PLUS_MINUS": 1})
+    rows.append({**rows[0], "PLAYER_ID": 12, "PLAYER_NAME": "Cameo"})
+    players = derive_player_sheet(pd.DataFrame(rows), last_n=10)
+    assert set(players.index) == {10, 11}
+    assert bool(players.loc[10, "HOT"]) and not bool(players.loc[11, "HOT"])
+    assert players.loc[10, "L3_PTS"] == 36
@@ -0,0 +1,44 @@
+from models.sports.basketball.nba.sheets.nba_stats_client import (NbaStatsClient, league_dash_jobs,
+                                                                   result_sets_to_frames)
+
+PAYLOAD = {"resultSets": [{"name": "LeagueDashTeamStats", "headers": ["TEAM_ID", "PTS"],
+                           "rowSet": [[1, 110.5], [2, 99.0]]}]}
+
+
+class FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return PAYLOAD
+
+
+class CountingSession:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append((url, params["MeasureType"]))
+        return FakeResponse()
+
+
+def test_result_sets_to_frames():
+    frames = result_sets_to_frames(PAYLOAD)
+    assert list(frames) == ["LeagueDashTeamStats"]
+    assert frames["LeagueDashTeamStats"]["PTS"].tolist() == [110.5, 99.0]
+    single = result_sets_to_frames({"resultSet": PAYLOAD["resultSets"][0]})
+    assert len(single["LeagueDashTeamStats"]) == 2
+
+
+def test_fetch_many_fans_out_and_caches_per_day(tmp_path):
+    client = NbaStatsClient(cache_dir=tmp_path)
+    client.session = CountingSession()
+    jobs = league_dash_jobs("2024-25")
+    tables = client.fetch_many(jobs)
+    assert set(tables) == {"player_base", "player_advanced", "team_base", "team_advanced",
+                           "team_opponent", "team_defense"}
+    assert all(len(df) == 2 for df in tables.values())
+    assert len(client.session.calls) == 6
+
+    client.fetch_many(jobs)
+    assert len(client.session.calls) == 6
@@ -0,0 +1,70 @@
+import json
+
+from utils.notify import FAILED, NotificationDispatcher, Outbox, _MultipartFile
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = json.dumps(body or {})
+        self._body = body or {}
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.bodies = []
+
+    def post(self, url, json=None, data=None, headers=None, timeout=None):
+        self.bodies.append(data.read() if data is not None else json)
+        return self.responses.pop(0)
+
+
+def test_multipart_body_streams_file(tmp_path):
+    path = tmp_path / "index.html"
+    path.write_bytes(b"<html>" + b"x" * 10000 + b"</html>")
+    body = _MultipartFile({"content": "hi"}, path, "index.html")
+    chunks = []
+    while True:
+        chunk = body.read(4096)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    raw = b"".join(chunks)
+    assert len(raw) == len(body)
+    assert b'name="content"\r\n\r\nhi\r\n' in raw
+    assert b"<html>" + b"x" * 10000 + b"</html>" in raw
+
+
+def test_dispatcher_retries_and_honors_rate_limits(tmp_path, monkeypatch):
+    monkeypatch.setenv("DISCORD_WEBHOOK_URL", "https://example.invalid/hook")
+    attachment = tmp_path / "index.html"
+    attachment.write_text("<p>slate</p>")
+    outbox = Outbox(tmp_path / "outbox")
+    outbox.enqueue("done")
+    outbox.enqueue("sheet", file_path=attachment)
+    outbox.enqueue("bad")
+    attachment.write_text("<p>overwritten</p>")
+
+    sleeps = []
+    session = FakeSession([
+        FakeResponse(204, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "1.5"}),
+        FakeResponse(429, {"Retry-After": "2"}),
+        FakeResponse(400, body={"message": "Cannot send an empty message"}),
+        FakeResponse(503),
+        FakeResponse(204),
+    ])
+    dispatcher = NotificationDispatcher(outbox, session=session, base_delay=0.0, sleep=sleeps.append)
+    counts = dispatcher.drain(timeout=60)
+
+    assert counts == {"sent": 2, "retry": 2, FAILED: 1}
+    assert outbox.pending() == []
+    assert len(list(outbox.failed_dir.glob("*.json"))) == 1
+    assert list(outbox.files_dir.iterdir()) == []
+    # Attachment was snapshotted at enqueue time
+    assert b"<p>slate</p>" in session.bodies[1]
+    assert sleeps and sleeps[0] > 1.0
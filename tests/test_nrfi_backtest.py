@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.sports.baseball.mlb.nrfi_backtest import (breakeven_american, evaluate, run_backtest,
+                                                      walk_forward_probs)
+from utils.mlb.nrfi_grading import assign_grade, assign_grades
+
+
+def _season(days=30, per_day=12, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = np.repeat(np.datetime64("2025-06-01") + np.arange(days), per_day)
+    scores = rng.uniform(10, 90, size=len(dates))
+    p_nrfi = 1 / (1 + np.exp((scores - 50) / 15))  # higher score -> run more likely
+    nrfi = rng.binomial(1, p_nrfi)
+    return pd.DataFrame({"game_date": dates, "score": scores, "nrfi": nrfi})
+
+
+def test_walk_forward_has_no_lookahead():
+    df = _season()
+    dates, scores, y = df["game_date"].values, df["score"].values, df["nrfi"].values.astype(float)
+    p = walk_forward_probs(dates, scores, y, min_train_days=5)
+    assert np.isnan(p[: 5 * 12]).all() and not np.isnan(p[5 * 12:]).any()
+
+    # Flipping outcomes on the last day must not change that day's predictions
+    y2 = y.copy()
+    y2[-12:] = 1 - y2[-12:]
+    p2 = walk_forward_probs(dates, scores, y2, min_train_days=5)
+    np.testing.assert_allclose(p[-12:], p2[-12:])
+    # ...and a higher raw score means a lower P(NRFI)
+    assert np.corrcoef(scores[5 * 12:], p[5 * 12:])[0, 1] < -0.9
+
+
+def test_run_backtest_reports_metrics():
+    df = _season()
+    (expanding, windowed) = run_backtest(
+        df, [{"min_train_days": 5}, {"min_train_days": 5, "window_days": 7}])
+    assert expanding["games"] == 25 * 12
+    assert 0 < expanding["brier"] < 0.25
+    assert expanding["by_grade"]["games"].sum() == expanding["games"]
+    assert windowed["params"]["window_days"] == 7
+
+
+def test_grading_helpers_agree():
+    pcts = np.array([99.0, 94.0, 60.0, 59.9, np.nan])
+    letters, _ = assign_grades(pcts)
+    assert list(letters[:4]) == [assign_grade(p)[0] for p in pcts[:4]]
+    assert letters[-1] == "F"
+    assert breakeven_american([0.6, 0.4])[0] == pytest.approx(-150)
+    assert np.isnan(breakeven_american(1.0))
+    assert evaluate(np.array([np.nan]), np.array([1])) == {"games": 0}
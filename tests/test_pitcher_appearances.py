@@ -0,0 +1,108 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from utils.mlb.pitcher_appearances import PitcherAppearanceIndex, appearances_from_schedule
+from utils.single_flight import FLIGHT
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self._body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._body
+
+
+def _gamelog(pid, games):
+    return {"id": pid, "stats": [{"type": {"displayName": "gameLog"}, "splits": [
+        {"date": d.isoformat(), "game": {"gamePk": pk}, "stat": {"gamesStarted": 1, "inningsPitched": "6.0"}}
+        for pk, d in games]}]}
+
+
+class FakeSession:
+    def __init__(self, logs):
+        self.logs = logs
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append(params)
+        ids = map(int, params["personIds"].split(","))
+        return FakeResponse({"people": [_gamelog(pid, self.logs.get(pid, [])) for pid in ids]})
+
+
+def test_refresh_batches_pitchers_and_persists(tmp_path):
+    today = date.today()
+    logs = {1: [(101, today - timedelta(days=12)), (102, today - timedelta(days=6))],
+            2: [(201, today - timedelta(days=40)), (202, today - timedelta(days=2))]}
+    session = FakeSession(logs)
+    index = PitcherAppearanceIndex(tmp_path / "appearances.csv")
+    start = today - timedelta(days=30)
+    assert index.refresh([1, 2], start, today, session=session) == [1, 2]
+    assert len(session.calls) == (1 if start.year == today.year else 2)
+
+    # Covered for the rest of the day: no further requests
+    assert index.refresh([1, 2], start, today, session=session) == []
+    assert index.appearances(1, start, today) == [(101, today - timedelta(days=12)), (102, today - timedelta(days=6))]
+    assert index.appearances(2, start, today) == [(202, today - timedelta(days=2))]
+
+    reloaded = PitcherAppearanceIndex(tmp_path / "appearances.csv")
+    assert reloaded.stale([1, 2, 3], start, today) == [3]
+    assert reloaded.appearances(2, start, today) == [(202, today - timedelta(days=2))]
+
+
+def test_refresh_tracks_coverage_per_season(tmp_path):
+    end = date(2025, 1, 10)
+    logs = {1: [(101, date(2024, 12, 28)), (102, date(2025, 1, 5))]}
+    session = FakeSession(logs)
+    index = PitcherAppearanceIndex(tmp_path / "appearances.csv")
+
+    # Only the 2025 log was pulled: a window reaching into 2024 is still stale
+    index.refresh([1], date(2025, 1, 1), end, session=session)
+    assert [c["hydrate"][-5:-1] for c in session.calls] == ["2025"]
+    assert index.stale([1], date(2024, 12, 20), end) == [1]
+
+    index.refresh([1], date(2024, 12, 20), end, session=session)
+    assert [c["hydrate"][-5:-1] for c in session.calls] == ["2025", "2024"]
+    assert index.appearances(1, date(2024, 12, 20), end) == [(101, date(2024, 12, 28)), (102, date(2025, 1, 5))]
+
+    reloaded = PitcherAppearanceIndex(tmp_path / "appearances.csv")
+    assert reloaded.stale([1], date(2024, 12, 20), end) == []
+
+
+def test_concurrent_refreshes_of_one_pitcher_share_a_request(tmp_path):
+    """Two slate games' workers refreshing the same pitcher at once send one game-log request."""
+    today = date.today()
+    session = FakeSession({1: [(101, today)]})
+    started, release = threading.Event(), threading.Event()
+    get = session.get
+
+    def slow_get(url, params=None, timeout=None):
+        started.set()
+        release.wait(5)
+        return get(url, params, timeout)
+
+    session.get = slow_get
+    index = PitcherAppearanceIndex(tmp_path / "appearances.csv")
+    baseline = FLIGHT.coalesced
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(index.refresh, [1], today, today, session)
+        started.wait(5)
+        second = pool.submit(index.refresh, [1], today, today, session)
+        while FLIGHT.coalesced == baseline:
+            threading.Event().wait(0.001)
+        release.set()
+        assert first.result() == second.result() == [1]
+
+    assert len(session.calls) == 1
+    assert index.appearances(1, today, today) == [(101, today)]
+
+
+def test_appearances_from_hydrated_schedule():
+    d = date(2025, 6, 20)
+    games = [{"gamePk": 9, "teams": {"away": {"probablePitcher": _gamelog(5, [(77, d)])}, "home": {}}}]
+    df = appearances_from_schedule(games)
+    assert df[["pitcher_id", "game_pk", "game_date"]].values.tolist() == [[5, 77, d]]
@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from utils.mlb.pitcher_game_aggregates import PitcherGameAggregates, summarize_pitcher_game
+
+PITCHER = 657277
+
+
+def _game_rows():
+    """First inning: K, walk, single, 1 run scores on a fly out, ground-ball DP. Second: barrel HR."""
+    rows = [
+        dict(inning=1, events="strikeout", type="S", bb_type=None, launch_speed_angle=None, bat_score=0, post_bat_score=0),
+        dict(inning=1, events=None, type="B", bb_type=None, launch_speed_angle=None, bat_score=0, post_bat_score=0),
+        dict(inning=1, events="walk", type="B", bb_type=None, launch_speed_angle=None, bat_score=0, post_bat_score=0),
+        dict(inning=1, events="single", type="X", bb_type="line_drive", launch_speed_angle=4, bat_score=0, post_bat_score=0),
+        dict(inning=1, events="sac_fly", type="X", bb_type="fly_ball", launch_speed_angle=3, bat_score=0, post_bat_score=1),
+        dict(inning=2, events="home_run", type="X", bb_type="fly_ball", launch_speed_angle=6, bat_score=1, post_bat_score=2),
+        dict(inning=2, events="grounded_into_double_play", type="X", bb_type="ground_ball",
+             launch_speed_angle=1, bat_score=2, post_bat_score=2),
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_summarize_counts_outs_from_events():
+    counts = summarize_pitcher_game(_game_rows())
+    assert counts["outs"] == 4
+    assert counts["k"] == 1 and counts["bb"] == 1 and counts["hr"] == 1
+    assert counts["fb"] == 2 and counts["barrels"] == 1 and counts["batted"] == 4
+    assert (counts["f1_outs"], counts["f1_r"], counts["f1_h"], counts["f1_bb"]) == (2, 1, 1, 1)
+
+
+def test_rolling_windows(tmp_path):
+    store = PitcherGameAggregates(tmp_path / "pitchers.csv")
+    counts = summarize_pitcher_game(_game_rows())
+    start = date(2025, 4, 1)
+    for i in range(8):
+        store.add(PITCHER, 1000 + i, start + timedelta(days=5 * i), counts)
+    store.add(PITCHER, 1000, start, counts)  # duplicate is ignored
+    store.save()
+
+    reloaded = PitcherGameAggregates(tmp_path / "pitchers.csv")
+    as_of = start + timedelta(days=40)
+    form = reloaded.recent_form([PITCHER, 1], as_of)
+    assert list(form.index) == [PITCHER]
+    assert form.loc[PITCHER, "l5_games"] == 5
+    assert form.loc[PITCHER, "l30_games"] == 6
+    assert form.loc[PITCHER, "season_games"] == 8
+    assert form.loc[PITCHER, "season_f1_era"] == pytest.approx(13.5)
+    assert form.loc[PITCHER, "season_f1_whip"] == pytest.approx(3.0)
+    assert form.loc[PITCHER, "season_barrel_pct"] == pytest.approx(25.0)
@@ -0,0 +1,41 @@
+from datetime import date, timedelta
+
+import pandas as pd
+
+from utils.artifact_catalog import ArtifactCatalog
+from utils.mlb.pitcher_appearances import PitcherAppearanceIndex
+from utils.mlb.pitcher_game_aggregates import PitcherGameAggregates
+from utils.mlb.request_planner import LINEUPS, PITCHER_GAME_LOGS, STATCAST, build_slate_plan
+
+RUN = date.today()
+
+
+def _game(pk, away_pid, home_pid, batters):
+    preview = [{"person": {"id": b}, "battingOrder": str(i + 1)} for i, b in enumerate(batters)]
+    return {"gamePk": pk, "teams": {
+        "away": {"probablePitcher": {"id": away_pid}, "previewPlayers": preview},
+        "home": {"probablePitcher": {"id": home_pid}, "previewPlayers": preview}}}
+
+
+def test_plan_coalesces_and_subtracts_cached(tmp_path):
+    index = PitcherAppearanceIndex(tmp_path / "appearances.csv")
+    d1, d2 = RUN - timedelta(days=6), RUN - timedelta(days=5)
+    # Pitchers 1 and 2 faced each other in game 10; 3's only game is stored; 4 has no game log yet
+    index.add(pd.DataFrame({"pitcher_id": [1, 2, 1, 3], "game_pk": [10, 10, 11, 30],
+                            "game_date": [d1, d1, d2, d2], "games_started": 1, "innings_pitched": "6.0"}),
+              refreshed_ids=[1, 2, 3], seasons=range((RUN - timedelta(days=30)).year, RUN.year + 1))
+    store = PitcherGameAggregates(tmp_path / "games.csv")
+    store.add(3, 30, d2, {})
+    catalog = ArtifactCatalog(tmp_path / "catalog.json", root_path=tmp_path)
+
+    games = [_game(100, 1, 2, [7, 8, 9]), _game(101, 3, 4, [7, 5, 6])]
+    plan = build_slate_plan(games, RUN, index=index, store=store, catalog=catalog, lookback_days=30)
+
+    assert len(plan.pending(PITCHER_GAME_LOGS)) == (1 if (RUN - timedelta(days=30)).year == RUN.year else 2)
+    assert plan.unplanned_statcast == [4]
+    assert sorted(it.key for it in plan.pending(STATCAST)) == ["10", "11"]
+    assert plan.estimated_requests(STATCAST) == 2  # one game on each day: two single-game pulls
+    assert {it.key for it in plan.items(LINEUPS)} == {"5", "6", "7", "8", "9"}
+    assert plan.estimated_requests(LINEUPS) == 1
+    assert plan.duplicates > 0
+    assert "Estimated requests" in plan.describe()
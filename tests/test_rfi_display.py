@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from renderers.rfi_display import eastern_start_times, fair_american, prepare_display
+
+
+def test_fair_american_matches_sign_convention():
+    np.testing.assert_array_equal(fair_american([0.6, 0.4, 0.5, 1.0, np.nan]),
+                                  ['-150', '+150', '-100', 'N/A', 'N/A'])
+
+
+def test_prepare_display_grades_on_pct_scale_and_colors_by_letter():
+    games = [
+        {"game_id": 1, "away_team_abbrev": "NYY", "home_team_abbrev": "BOS",
+         "game_datetime": "2025-08-09T23:05:00Z", "calibrated_p_nrfi": 0.95,
+         "away_pitcher_recent_xfip": 3.456, "home_team_woba3": "bad"},
+        {"game_id": 2, "gameDate": "2025-08-09T17:10:00-04:00", "calibrated_p_nrfi": 0.62},
+        {"game_id": 3, "game_datetime": None},
+    ]
+    df = prepare_display(games).set_index("game_id")
+
+    assert df.loc[1, "start_time"] == "7:05 PM ET"
+    assert df.loc[2, "start_time"] == "5:10 PM ET"
+    assert df.loc[3, "start_time"] == "TBD"
+    assert list(df["grade"]) == ["A", "C-", "F"]
+    assert df.loc[1, "grade_color"] == "bg-green-600 text-white"
+    assert df.loc[1, "nrfi_pct"] == "95.00"
+    assert df.loc[1, "away_pitcher_recent_xfip"] == "3.46"
+    assert df.loc[1, "home_team_woba3"] == "N/A"
+    assert df.loc[2, "away_team_abbrev"] == "N/A"
+    assert df.loc[3, "american_odds"] == "N/A"
+
+
+def test_eastern_start_times_mixed_iso_forms():
+    times = pd.Series(["2025-08-09T23:05:00Z", "2025-08-09T23:05:00.000Z", "2025-08-09T19:10:00-04:00", None])
+    assert list(eastern_start_times(times)) == ["7:05 PM ET", "7:05 PM ET", "7:10 PM ET", "TBD"]
@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.single_flight import FLIGHT, SingleFlight, get_json, request_key
+
+
+def _run_concurrently(flight, key, fn, n=8):
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        leader = pool.submit(flight.do, key, slow)
+        started.wait(5)
+        followers = [pool.submit(flight.do, key, slow) for _ in range(n - 1)]
+        while flight.coalesced < n - 1:
+            threading.Event().wait(0.001)
+        release.set()
+        return [leader] + followers
+
+
+def test_concurrent_callers_share_one_execution():
+    flight, calls = SingleFlight(), []
+    futures = _run_concurrently(flight, "game-1", lambda: calls.append(1) or {"rows": 3})
+    assert [f.result() for f in futures] == [{"rows": 3}] * 8
+    assert len(calls) == 1 and flight.in_flight() == 0
+
+    # Not a cache: the next call runs again
+    assert flight.do("game-1", lambda: calls.append(1) or "again") == "again"
+    assert len(calls) == 2
+
+
+def test_errors_propagate_to_every_waiter():
+    flight = SingleFlight()
+
+    def boom():
+        raise ValueError("upstream 503")
+
+    futures = _run_concurrently(flight, "game-2", boom, n=4)
+    for f in futures:
+        with pytest.raises(ValueError, match="503"):
+            f.result()
+    assert flight.in_flight() == 0
+
+
+def test_request_key_normalizes_url_and_params():
+    a = request_key("https://STATSAPI.mlb.com/api/v1/people/?hydrate=stats", {"personIds": "1,2"})
+    b = request_key("https://statsapi.mlb.com/api/v1/people", {"personIds": "1,2", "hydrate": "stats"})
+    assert a == b
+    assert a != request_key("https://statsapi.mlb.com/api/v1/people", {"personIds": "1,3", "hydrate": "stats"})
+
+
+class _BlockingSession:
+    """Stands in for requests: every GET waits until released, then returns a fresh payload."""
+
+    def __init__(self):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        body = {"dates": [{"games": [{"gamePk": 1, "teams": {}}]}]}
+        return type("Resp", (), {"raise_for_status": lambda self: None, "json": lambda self: body})()
+
+
+def test_get_json_gives_waiters_their_own_copy():
+    session, url = _BlockingSession(), "https://statsapi.mlb.com/api/v1/schedule"
+    params = {"date": "2025-07-01"}
+    baseline = FLIGHT.coalesced
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(get_json, url, params, session)
+        session.started.wait(5)
+        waiters = [pool.submit(get_json, url, params, session) for _ in range(2)]
+        while FLIGHT.coalesced < baseline + 2:
+            threading.Event().wait(0.001)
+        session.release.set()
+        payloads = [f.result() for f in [leader] + waiters]
+
+    assert session.calls == 1
+    payloads[0]["dates"][0]["games"][0]["teams"]["away"] = "mutated downstream"
+    assert payloads[1] == payloads[2] == {"dates": [{"games": [{"gamePk": 1, "teams": {}}]}]}
+    assert len({id(p) for p in payloads}) == 3
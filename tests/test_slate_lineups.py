@@ -0,0 +1,61 @@
+from utils.mlb.slate_lineups import lineup_features, slate_lineups
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self._body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append(params)
+        people = []
+        for pid in map(int, params["personIds"].split(",")):
+            people.append({"id": pid, "stats": [
+                {"type": {"displayName": "season"}, "splits": [{"stat": {"ops": f"{pid / 1000:.3f}", "avg": ".250"}}]},
+                {"type": {"displayName": "lastXGames"}, "splits": [{"stat": {"ops": ".900"}}]},
+            ]})
+        return FakeResponse({"people": people})
+
+
+def _game(pk, first_id):
+    def preview(base):
+        # Out of order, with a bench player that has no batting order
+        players = [{"person": {"id": base + k, "fullName": f"P{base + k}"}, "battingOrder": str(k + 1),
+                    "position": {"abbreviation": "CF"}} for k in (3, 0, 2, 1)]
+        return players + [{"person": {"id": base + 9, "fullName": "Bench"}}]
+    return {"gamePk": pk, "teams": {"away": {"previewPlayers": preview(first_id)},
+                                    "home": {"previewPlayers": preview(first_id + 100)}}}
+
+
+def test_whole_slate_hydrated_in_batched_requests():
+    games = [_game(pk, 700 + 200 * i) for i, pk in enumerate(range(1, 16))]
+    session = FakeSession()
+    df = slate_lineups(games, 2025, session=session)
+    assert len(df) == 15 * 2 * 3
+    assert len(session.calls) == 1
+    assert "lastXGames" in session.calls[0]["hydrate"] and "season=2025" in session.calls[0]["hydrate"]
+    first = df[(df["game_id"] == 1) & (df["side"] == "away")]
+    assert first["id"].tolist() == [700, 701, 702]
+    assert first["order"].tolist() == [1, 2, 3]
+    assert first["season_ops"].tolist() == [0.7, 0.701, 0.702]
+
+    feats = lineup_features(df)
+    assert feats[(1, "away")]["top3_season_ops"] == 0.701
+    assert feats[(1, "home")]["top3_recent_ops"] == 0.9
+
+
+def test_games_without_preview_players_cost_no_requests():
+    session = FakeSession()
+    df = slate_lineups([{"gamePk": 1, "teams": {"away": {}, "home": {}}}], 2025, session=session)
+    assert df.empty and session.calls == []
+    assert lineup_features(df) == {}
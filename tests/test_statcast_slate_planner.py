@@ -0,0 +1,66 @@
+import threading
+from datetime import date
+
+import pandas as pd
+
+from utils.mlb.pitcher_game_aggregates import PitcherGameAggregates
+from utils.mlb.statcast_slate_planner import date_ranges, execute_plan, plan_statcast_dates
+
+D1, D2, D3, D5 = (date(2025, 6, d) for d in (1, 2, 3, 5))
+
+
+def _pitches(game_pk, pitchers):
+    return pd.DataFrame([{"game_pk": game_pk, "pitcher": p, "events": "strikeout", "type": "S",
+                          "inning": 1, "launch_speed": None} for p in pitchers for _ in range(3)])
+
+
+def test_plan_dedupes_shared_games_and_skips_stored(tmp_path):
+    store = PitcherGameAggregates(tmp_path / "games.csv")
+    store.add(3, 30, D2, {})
+    # Pitchers 1 and 2 started the same game; pitcher 3's game is already stored
+    plan = plan_statcast_dates([(1, 10, D1), (2, 10, D1), (3, 30, D2), (4, 40, D2)], store)
+    assert plan == {D1: {10: {1, 2}}, D2: {40: {4}}}
+
+
+def test_date_ranges_merge_consecutive_days():
+    assert date_ranges([D5, D1, D3, D2, D1]) == [(D1, D3), (D5, D5)]
+
+
+def test_execute_plan_fetches_each_date_once(tmp_path):
+    store = PitcherGameAggregates(tmp_path / "games.csv")
+    plan = {D1: {10: {1, 2}, 11: {5}}, D2: {20: {3}, 21: {4}}, D5: {50: {6}}}
+    ranges, singles = [], []
+
+    def fetch_range(lo, hi):
+        ranges.append((lo, hi))
+        return pd.concat([_pitches(10, [1, 2]), _pitches(11, [5, 9]), _pitches(20, [3]), _pitches(21, [4])])
+
+    def fetch_game(gp):
+        singles.append(gp)
+        return _pitches(gp, [6, 7])
+
+    stats = execute_plan(plan, store, fetch_range=fetch_range, fetch_game=fetch_game)
+    assert ranges == [(D1, D2)] and singles == [50]
+    assert stats["requests"] == 2 and stats["added"] == 6
+    assert store.has(1, 10) and store.has(2, 10) and store.has(6, 50)
+    assert not store.has(9, 11) and not store.has(7, 50)
+    assert store.get(1, 10)["k"] == 3
+    assert PitcherGameAggregates(tmp_path / "games.csv").has(4, 21)
+
+
+def test_execute_plan_downloads_concurrently(tmp_path):
+    store = PitcherGameAggregates(tmp_path / "games.csv")
+    plan = {D1: {10: {1}, 11: {2}}, D5: {50: {6}}}
+    # Each fetch waits for the other: only passes if the range and the single game overlap
+    both_started = threading.Barrier(2, timeout=5)
+
+    def fetch_range(lo, hi):
+        both_started.wait()
+        return pd.concat([_pitches(10, [1]), _pitches(11, [2])])
+
+    def fetch_game(gp):
+        both_started.wait()
+        return _pitches(gp, [6])
+
+    stats = execute_plan(plan, store, fetch_range=fetch_range, fetch_game=fetch_game, max_workers=2)
+    assert stats["added"] == 3
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from utils.mlb.team_first_inning_aggregates import TeamFirstInningAggregates, aggregate_first_inning
+from utils.mlb.team_registry import TeamRegistry
+
+REGISTRY_PATH = Path(__file__).resolve().parents[1] / "config" / "mlb_team_registry.json"
+START = date(2025, 6, 1)
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return TeamRegistry.from_json(REGISTRY_PATH)
+
+
+def _pitch(day, topbot, woba, denom=1, inning=1, p_throws="R"):
+    return {
+        "game_date": day.isoformat(), "inning": inning, "inning_topbot": topbot,
+        "home_team": "SD", "away_team": "AZ", "p_throws": p_throws,
+        "woba_value": woba, "woba_denom": denom,
+    }
+
+
+def fake_statcast(start, end):
+    """Each day: AZ bats .900 and .000 in the top, SD bats .300 in the bottom (one pitch outside the 1st)."""
+    rows = []
+    day = date.fromisoformat(start)
+    while day <= date.fromisoformat(end):
+        rows += [
+            _pitch(day, "Top", 0.9), _pitch(day, "Top", 0.0), _pitch(day, "Top", None, denom=None),
+            _pitch(day, "Bot", 0.3, p_throws="L"), _pitch(day, "Bot", 2.0, inning=2),
+        ]
+        day += timedelta(days=1)
+    return pd.DataFrame(rows)
+
+
+def test_aggregate_assigns_batting_team(registry):
+    agg = aggregate_first_inning(fake_statcast("2025-06-01", "2025-06-01"), registry)
+    by_team = agg.set_index("team")
+    assert by_team.loc["AZ", "side"] == "away"
+    assert by_team.loc["AZ", "pa"] == 2
+    assert by_team.loc["SD", "p_throws"] == "L"
+    assert by_team.loc["SD", "woba_sum"] == pytest.approx(0.3)
+
+
+def test_update_fetches_only_missing_dates(tmp_path, registry):
+    calls = []
+
+    def fetcher(start, end):
+        calls.append((start, end))
+        return fake_statcast(start, end)
+
+    store = TeamFirstInningAggregates(tmp_path / "agg.csv", fetcher=fetcher, registry=registry)
+    store.update(START, START + timedelta(days=9))
+    store.update(START + timedelta(days=5), START + timedelta(days=14))
+    assert calls == [("2025-06-01", "2025-06-10"), ("2025-06-11", "2025-06-15")]
+
+    reloaded = TeamFirstInningAggregates(tmp_path / "agg.csv", fetcher=fetcher, registry=registry)
+    assert reloaded.missing_dates(START, START + timedelta(days=14)) == []
+
+
+def test_window_queries(tmp_path, registry):
+    store = TeamFirstInningAggregates(tmp_path / "agg.csv", fetcher=fake_statcast, registry=registry)
+    store.update(START, START + timedelta(days=29))
+    as_of = START + timedelta(days=29)
+
+    woba = store.woba3(7, as_of)
+    assert woba == {"AZ": pytest.approx(0.45), "SD": pytest.approx(0.3)}
+    assert store.woba3(7, as_of, p_throws="L") == {"SD": pytest.approx(0.3)}
+    assert store.woba3(7, START - timedelta(days=1)) == {}
+
+
+def test_window_is_days_before_as_of(tmp_path, registry):
+    """[as_of - days, as_of): the oldest day counts, as_of itself does not."""
+    as_of = START + timedelta(days=10)
+
+    def fetcher(start, end):
+        df = fake_statcast(start, end)
+        df.loc[df["game_date"] == (as_of - timedelta(days=7)).isoformat(), "woba_value"] = 0.0
+        df.loc[df["game_date"] == as_of.isoformat(), "woba_value"] = 5.0
+        return df
+
+    store = TeamFirstInningAggregates(tmp_path / "agg.csv", fetcher=fetcher, registry=registry)
+    store.update(START, as_of)
+    # 7 days of SD at .300 except one at .000; the 5.0 day on as_of is excluded
+    assert store.woba3(7, as_of)["SD"] == pytest.approx(0.3 * 6 / 7, abs=1e-4)
+
+
+def test_update_skips_trailing_empty_dates(tmp_path, registry):
+    last_with_data = START + timedelta(days=3)
+
+    def fetcher(start, end):
+        df = fake_statcast(start, end)
+        off_day = (START + timedelta(days=1)).isoformat()
+        return df[(df["game_date"] != off_day) & (df["game_date"] <= last_with_data.isoformat())]
+
+    store = TeamFirstInningAggregates(tmp_path / "agg.csv", fetcher=fetcher, registry=registry)
+    store.update(START, START + timedelta(days=5))
+    assert store.missing_dates(START, START + timedelta(days=5)) == [
+        START + timedelta(days=4), START + timedelta(days=5)]
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+from utils.mlb.team_registry import TeamRegistry
+
+REGISTRY_PATH = Path(__file__).resolve().parents[1] / "config" / "mlb_team_registry.json"
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return TeamRegistry.from_json(REGISTRY_PATH)
+
+
+def test_registry_has_every_club(registry):
+    assert len(registry) == 30
+
+
+@pytest.mark.parametrize(
+    "key, expected",
+    [
+        (109, "AZ"),            # MLB id
+        ("109", "AZ"),          # MLB id from a JSON cache key
+        ("ARI", "AZ"),          # FanGraphs
+        ("Az", "AZ"),           # title-cased Statcast code from the wOBA3 cache
+        ("KCR", "KC"),
+        ("WSN", "WSH"),
+        ("CHW", "CWS"),
+        ("St. Louis Cardinals", "STL"),
+        ("Oakland Athletics", "ATH"),
+    ]
+)
+def test_canonical(registry, key, expected):
+    assert registry.canonical(key) == expected
+
+
+def test_source_codes(registry):
+    assert registry.fangraphs_code("SD") == "SDP"
+    assert registry.statcast_code("SDP") == "SD"
+    assert registry.name(137) == "San Francisco Giants"
+
+
+def test_unknown_key_returns_default(registry):
+    assert registry.canonical("XYZ", "") == ""
+
+
+def test_rekey_drops_unknown(registry):
+    assert registry.rekey({"Tbr": 1, "Sfg": 2, "???": 3}) == {"TB": 1, "SF": 2}
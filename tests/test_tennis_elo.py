@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from models.sports.tennis.data_sources.match_store import matches_from_player_rows
+from models.sports.tennis.features.elo import INITIAL_RATING, EloEngine, win_quality_last_n
+
+
+def _player_rows():
+    return pd.DataFrame([
+        ("A", "B", "Clay", "2025-04-01", "W"), ("B", "A", "Clay", "2025-04-01", "L"),
+        ("A", "C", "Hard", "2025-04-08", "W"),
+        ("C", "B", "Hard", "2025-04-15", "W"),
+        ("B", "A", "Clay", "2025-04-22", "W"),
+    ], columns=["player", "opponent", "surface", "date", "result"])
+
+
+def test_matches_dedupe_perspectives_and_ratings_move():
+    matches = matches_from_player_rows(_player_rows())
+    assert len(matches) == 4
+    engine = EloEngine()
+    rated = engine.update(matches)
+    assert rated.loc[0, ["winner_elo", "loser_elo"]].tolist() == [INITIAL_RATING, INITIAL_RATING]
+    assert engine.rating("A", as_of="2025-04-01") == INITIAL_RATING
+    assert engine.rating("A", as_of="2025-04-02") > INITIAL_RATING
+    assert engine.surface_rating("C", "Clay") == INITIAL_RATING
+    # B's clay win over A is recorded against A's pre-match clay rating
+    assert rated.loc[3, "loser_surface_elo"] == pytest.approx(engine.surface_rating("A", "Clay", as_of="2025-04-22"))
+    assert win_quality_last_n(rated, ["A", "Z"], "2025-05-01").loc["A"] == pytest.approx(
+        rated.loc[[0, 1], "loser_elo"].mean())
+
+
+def test_incremental_update_and_snapshot_round_trip(tmp_path):
+    matches = matches_from_player_rows(_player_rows())
+    full = EloEngine()
+    full.update(matches)
+
+    engine = EloEngine()
+    engine.update(matches.iloc[:2])
+    engine.save(tmp_path)
+    resumed = EloEngine.load(tmp_path)
+    resumed.update(matches.iloc[2:])
+    for player in "ABC":
+        assert resumed.rating(player) == pytest.approx(full.rating(player))
+        assert resumed.rating(player, as_of="2025-04-10") == pytest.approx(full.rating(player, as_of="2025-04-10"))
+    with pytest.raises(ValueError):
+        resumed.update(matches.iloc[:1])
+
+
+def test_rerunning_last_day_does_not_double_count(tmp_path):
+    matches = matches_from_player_rows(_player_rows())
+    engine = EloEngine()
+    engine.update(matches)
+    before = {p: engine.rating(p) for p in "ABC"}
+
+    last_day = matches[matches["date"] == matches["date"].max()]
+    assert engine.update(last_day).empty
+    engine.save(tmp_path)
+    resumed = EloEngine.load(tmp_path)
+    assert resumed.update(last_day).empty
+    assert {p: resumed.rating(p) for p in "ABC"} == before
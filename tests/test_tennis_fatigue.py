@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from models.sports.tennis.features.overusage import fatigue_as_of, fatigue_features
+from models.sports.tennis.features.recent_form import recent_form_features
+
+
+def _calendar():
+    return pd.DataFrame([
+        ("A", "2025-06-01", "W", 30, 3), ("B", "2025-06-01", "L", 30, 3),
+        ("A", "2025-06-03", "W", 40, 4), ("A", "2025-06-05", "L", 38, 5),
+        ("B", "2025-06-20", "W", 20, 2), ("A", "2025-06-09", "W", 25, 3),
+        ("A", "2025-06-12", "W", 24, 3),
+    ], columns=["player", "date", "result", "games_played", "sets_played"])
+
+
+def test_fatigue_uses_only_prior_matches_in_window():
+    df = fatigue_features(_calendar())
+    assert list(df.index) == list(range(7))
+    a_last = df.loc[6]  # A on 06-12: window [06-02, 06-12) holds 06-03, 06-05, 06-09
+    assert a_last["days_rest_since_last_match"] == 3
+    assert a_last["games_last_10d"] == 40 + 38 + 25
+    assert a_last["matches_last_10d"] == 3
+    assert bool(a_last["overusage_flag"])
+    assert np.isnan(df.loc[0, "days_rest_since_last_match"]) and df.loc[0, "games_last_10d"] == 0
+    assert df.loc[4, "games_last_10d"] == 0  # B idle for 19 days
+
+
+def test_fatigue_as_of_matches_row_features():
+    cal = _calendar()
+    upcoming = fatigue_as_of(cal, "2025-06-12", players=["A", "B", "C"])
+    assert upcoming.loc["A", "games_last_10d"] == 40 + 38 + 25
+    assert upcoming.loc["A", "days_rest_since_last_match"] == 3
+    assert upcoming.loc["B", "days_rest_since_last_match"] == 11
+    assert upcoming.loc["C", "matches_last_10d"] == 0 and not upcoming.loc["C", "overusage_flag"]
+
+
+def test_recent_form_rolls_over_previous_matches():
+    df = recent_form_features(_calendar())
+    assert np.isnan(df.loc[0, "average_games_played_last_5"])
+    assert df.loc[6, "average_games_played_last_5"] == np.mean([30, 40, 38, 25])
+    assert df.loc[6, "sets_last_5"] == 3 + 4 + 5 + 3
+    assert df.loc[6, "recent_win_pct"] == 0.75
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from models.sports.tennis.data_sources.match_store import TennisMatchStore
+from models.sports.tennis.features.head_to_head import HeadToHeadIndex
+
+
+def _store():
+    return TennisMatchStore(pd.DataFrame([
+        ("Sinner", "Alcaraz", "Clay", "2025-05-01", "L"),
+        ("Alcaraz", "Sinner", "Clay", "2025-05-01", "W"),
+        ("Sinner", "Alcaraz", "Hard", "2025-08-01", "W"),
+        ("Alcaraz", "Sinner", "Grass", "2025-07-10", "W"),
+        ("Zverev", "Sinner", "Hard", "2025-03-01", "L"),
+    ], columns=["player", "opponent", "surface", "date", "result"]))
+
+
+def test_record_is_oriented_to_the_requested_player():
+    index = HeadToHeadIndex.from_store(_store())
+    assert len(index) == 2
+    rec = index.record("Sinner", "Alcaraz")
+    assert (rec.wins, rec.losses) == (1, 2)
+    assert rec.surfaces == {"Clay": (0, 1), "Grass": (0, 1), "Hard": (1, 0)}
+    assert rec.last_meeting == pd.Timestamp("2025-08-01")
+    assert (index.record("Alcaraz", "Sinner").wins, index.record("Alcaraz", "Sinner").losses) == (2, 1)
+    assert index.record("Zverev", "Alcaraz") is None
+
+
+def test_lookup_draw_covers_every_pairing():
+    index = HeadToHeadIndex.from_store(_store())
+    df = index.lookup_draw(["Alcaraz", "Sinner", "Zverev"], surface="Hard").set_index(["player", "opponent"])
+    assert len(df) == 3
+    assert df.loc[("Alcaraz", "Sinner"), "h2h_win_pct"] == 2 / 3
+    assert df.loc[("Alcaraz", "Sinner"), "h2h_surface_losses"] == 1
+    assert df.loc[("Sinner", "Zverev"), "h2h_surface_wins"] == 1
+    assert np.isnan(df.loc[("Alcaraz", "Zverev"), "h2h_win_pct"])
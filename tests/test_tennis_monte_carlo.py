@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.sports.tennis.features.elo import EloEngine
+from models.sports.tennis.models.inference import tournament_outlook
+from models.sports.tennis.models.monte_carlo_sim import round_labels, simulate_draw
+
+
+def test_four_player_draw_matches_exact_probabilities():
+    P = np.array([[0.5, 0.7, 0.6, 0.8],
+                  [0.3, 0.5, 0.4, 0.5],
+                  [0.4, 0.6, 0.5, 0.9],
+                  [0.2, 0.5, 0.1, 0.5]])
+    out = simulate_draw(["A", "B", "C", "D"], P, n_sims=200_000, seed=7)
+    assert list(out.columns) == ["SF", "F", "W"]
+    exact_a = 0.7 * (0.6 * 0.9 + 0.8 * 0.1)
+    assert out.loc["A", "W"] == pytest.approx(exact_a, abs=0.005)
+    assert out["W"].sum() == pytest.approx(1.0)
+    assert out["F"].sum() == pytest.approx(2.0)
+
+
+def test_byes_and_pairwise_function_and_sharding():
+    bracket = ["A", None, "B", "C", "D", None, "E", "F"]
+    strength = {"A": 3, "B": 1, "C": 1, "D": 2, "E": 1, "F": 1}
+
+    def prob_fn(a, b):
+        sa = np.array([strength[x] for x in a], dtype=float)
+        sb = np.array([strength[x] for x in b], dtype=float)
+        return sa / (sa + sb)
+
+    out = simulate_draw(bracket, prob_fn, n_sims=20_000, seed=1, shards=4)
+    assert out.loc["A", "SF"] == 1.0 and out.loc["D", "SF"] == 1.0
+    assert out.loc["B", "SF"] == pytest.approx(0.5, abs=0.02)
+    same = simulate_draw(bracket, prob_fn, n_sims=20_000, seed=1, shards=4, workers=2)
+    pd.testing.assert_frame_equal(out, same)
+    assert round_labels(128) == ["R128", "R64", "R32", "R16", "QF", "SF", "F", "W"]
+
+
+def test_tournament_outlook_from_elo():
+    engine = EloEngine()
+    engine.update(pd.DataFrame({"date": pd.to_datetime(["2025-01-01"] * 3),
+                                "surface": "Hard", "winner": ["A", "A", "C"], "loser": ["B", "C", "D"]}))
+    out = tournament_outlook(["A", "B", "C", "D"], engine, surface="Hard", n_sims=10_000, seed=0)
+    assert out.index[0] == "A"
+    assert out["W"].sum() == pytest.approx(1.0)
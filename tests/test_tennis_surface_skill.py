@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from models.sports.tennis.data_sources.match_store import TennisMatchStore
+from models.sports.tennis.features.surface_skill import SurfaceSkillFeature, batch_surface_features
+
+
+def _matches(seed=0, n=600):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "player": rng.choice(["Alcaraz", "Sinner", "Zverev", "Rune"], n),
+        "opponent": rng.choice(["A", "B", "C"], n),
+        "surface": rng.choice(["Clay", "Hard", "Grass"], n),
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.permutation(n), unit="D"),
+        "result": rng.choice(["W", "L"], n),
+        "opponent_rank": rng.integers(1, 200, n),
+    })
+
+
+def _reference(df, player, surface):
+    sub = df[(df.surface == surface) & (df.player == player)].sort_values("date", ascending=False)
+    last = sub.head(20)
+    strength = last["opponent_rank"].apply(lambda x: 1 if x > 100 else 1.25)
+    adj = round((last["result"] == "W").sum() / len(last) * strength.mean(), 3)
+    form = round(sum(w * (r == "W") for w, r in zip([0.5, 0.3, 0.2], sub["result"].head(3))), 3)
+    return adj, form
+
+
+def test_store_slices_newest_first():
+    store = TennisMatchStore(_matches())
+    recent = store.recent("Sinner", "Clay", 5)
+    assert len(recent) == 5
+    assert recent["date"].is_monotonic_decreasing
+    assert (recent["player"] == "Sinner").all() and (recent["surface"] == "Clay").all()
+    assert store.recent("Nobody", "Clay").empty
+
+
+def test_batch_matches_per_player_features():
+    df = _matches()
+    store = TennisMatchStore(df)
+    batch = batch_surface_features(store, ["Alcaraz", "Sinner", "Zverev", "Rune", "Nobody"], "Clay")
+    for player in ["Alcaraz", "Sinner", "Zverev", "Rune"]:
+        adj, form = _reference(df, player, "Clay")
+        assert batch.loc[player, "adj_win_rate"] == adj
+        assert batch.loc[player, "form_score"] == form
+        feature = SurfaceSkillFeature(store, player, "Clay")
+        assert (feature.surface_win_rate(), feature.recent_surface_form()) == (adj, form)
+    assert np.isnan(batch.loc["Nobody", "adj_win_rate"]) and batch.loc["Nobody", "form_score"] == 0